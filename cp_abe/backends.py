@@ -0,0 +1,245 @@
+"""
+CP-ABE 스킴 백엔드
+
+IoTCPABE/DynamicCPABE/KeyAuthority는 스킴과 페어링 그룹을 직접 다루지 않고
+백엔드 인터페이스(설정, 키 난수, 키 생성, 속성별 컴포넌트, 암호화, 복호화)로 사용합니다.
+
+- bsw07: 대칭 SS512 그룹의 BSW07 - IoTCPABE 내장 최적화 경로
+  (고정 기저 테이블, 최소 페어링 계획, 곱 페어링, 온라인/오프라인, 외주 복호화, 전송 형식)
+- fame: 비대칭(Type-III) BN254 그룹의 FAME(AC17) - 페어링이 빠르고 정책 크기와 무관하게
+  복호화 페어링 수가 일정하며, 사용자별 키 난수에 묶인 속성 컴포넌트로 부분 키 갱신 지원
+"""
+
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.schemes.abenc.ac17 import AC17CPABE
+from charm.toolbox.msp import MSP
+
+from .cache import LRUCache
+
+
+class SchemeBackend:
+    """
+    스킴 백엔드 인터페이스
+
+    키는 항상 속성 목록 "S"를 포함하고, 암호문은 charm 정책 문자열 "policy"를 포함합니다
+    (만족 여부 사전 검사, 하이브리드 AAD, 브로드캐스트 헤더 선택이 이 필드를 사용).
+    """
+
+    name = None
+    curve = None
+    # 속성별 키 컴포넌트 필드 (부분 키 갱신 시 병합 대상)
+    attribute_fields = ()
+    # IoTCPABE 내장 BSW07 최적화 기능 사용 가능 여부
+    native = False
+
+    def __init__(self, curve=None):
+        if curve is not None:
+            self.curve = curve
+        self.group = PairingGroup(self.curve)
+        self.scheme = None
+
+    def setup(self, cpabe):
+        """(공개 파라미터, 마스터 키) 생성"""
+        raise NotImplementedError
+
+    def key_randomness(self, cpabe):
+        """사용자 키 난수 - 같은 난수로 만든 속성 컴포넌트는 기존 키와 결합 가능"""
+        raise NotImplementedError
+
+    def keygen(self, cpabe, attributes, randomness=None):
+        """속성 목록(정제됨)의 키 생성 - "S"를 포함한 키 딕셔너리 반환"""
+        raise NotImplementedError
+
+    def attribute_components(self, cpabe, attributes, randomness):
+        """부분 키 갱신용 속성별 컴포넌트 {필드: {속성: 값}}"""
+        raise NotImplementedError
+
+    def encrypt(self, cpabe, element, policy):
+        """GT 요소를 컴파일된 정책으로 암호화"""
+        raise NotImplementedError
+
+    def decrypt(self, cpabe, ciphertext, key):
+        """GT 요소 복원 - 정책 불만족 시 False"""
+        raise NotImplementedError
+
+    def merge_components(self, key, components, removed=None):
+        """속성별 컴포넌트를 키에 병합하고 이전 에포크 속성 컴포넌트 제거 (키는 새 딕셔너리로 교체)"""
+        for field in self.attribute_fields:
+            merged = dict(key[field])
+            merged.update(components[field])
+            if removed is not None:
+                merged.pop(removed, None)
+            key[field] = merged
+
+    def has_components(self, components, attr):
+        """갱신 컴포넌트에 attr 속성 컴포넌트가 있는지"""
+        return bool(components) and attr in components.get(self.attribute_fields[0], {})
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.curve})"
+
+
+class BSW07Backend(SchemeBackend):
+    """대칭 SS512 그룹의 BSW07 - 키 생성/암호화/복호화는 IoTCPABE 내장 경로에 위임"""
+
+    name = "bsw07"
+    curve = "SS512"
+    attribute_fields = ("Dj", "Djp")
+    native = True
+
+    def __init__(self, curve=None):
+        super().__init__(curve)
+        self.scheme = CPabe_BSW07(self.group)
+
+    def setup(self, cpabe):
+        return self.scheme.setup()
+
+    def key_randomness(self, cpabe):
+        return self.group.random(ZR)
+
+    def keygen(self, cpabe, attributes, randomness=None):
+        return cpabe._bsw07_keygen(attributes, randomness)
+
+    def attribute_components(self, cpabe, attributes, randomness):
+        D_j, D_j_pr = cpabe._bsw07_attribute_components(attributes, randomness)
+        return {"Dj": D_j, "Djp": D_j_pr}
+
+    def encrypt(self, cpabe, element, policy):
+        return cpabe._bsw07_encrypt(element, policy)
+
+    def decrypt(self, cpabe, ciphertext, key):
+        return cpabe._bsw07_decrypt(ciphertext, key)
+
+
+class FAMEBackend(SchemeBackend):
+    """
+    비대칭(Type-III) 그룹의 FAME (Agrawal-Chase CCS'17, charm ac17)
+
+    키 난수 r(벡터)를 사용자 레코드에 보관하여 새 에포크 속성의 K[attr]만 발급할 수 있게
+    키 생성을 charm 구현과 같은 수식으로 재구성했습니다. 복호화는 charm 구현을 사용합니다.
+    """
+
+    name = "fame"
+    curve = "BN254"
+    attribute_fields = ("K",)
+
+    def __init__(self, curve=None, assump_size=2):
+        super().__init__(curve)
+        self.assump_size = assump_size
+        self.scheme = AC17CPABE(self.group, assump_size)
+        self.msp = MSP(self.group, False)
+        # 정책 문자열 -> MSP 정책 트리 (복호화 시 재파싱 방지)
+        self._policy_trees = LRUCache(256)
+
+    def setup(self, cpabe):
+        return self.scheme.setup()
+
+    def key_randomness(self, cpabe):
+        return [self.group.random(ZR) for _ in range(self.assump_size)]
+
+    def _br(self, mk, randomness):
+        """[B r, sum(r)] - K_0, K, K'이 공유하는 키 난수 벡터"""
+        br = [mk["B"][i] * randomness[i] for i in range(self.assump_size)]
+        total = randomness[0]
+        for value in randomness[1:]:
+            total += value
+        br.append(total)
+        return br
+
+    def _hash(self, prefix, l, t):
+        return self.group.hash(prefix + str(l) + str(t), G1)
+
+    def _hashed_key_term(self, mk, prefix, br, sigma, t):
+        """prod_l H(prefix l t)^(Br_l / a_t) * g^(sigma / a_t)"""
+        a_t = mk["A"][t]
+        prod = mk["g"] ** (sigma / a_t)
+        for l in range(self.assump_size + 1):
+            prod *= self._hash(prefix, l, t) ** (br[l] / a_t)
+        return prod
+
+    def keygen(self, cpabe, attributes, randomness=None):
+        mk = cpabe.mk
+        if randomness is None:
+            randomness = self.key_randomness(cpabe)
+        br = self._br(mk, randomness)
+
+        K_0 = [mk["h"] ** value for value in br]
+
+        sigma = self.group.random(ZR)
+        Kp = [
+            mk["g_k"][t] * self._hashed_key_term(mk, "01", br, sigma, t)
+            for t in range(self.assump_size)
+        ]
+        Kp.append(mk["g_k"][self.assump_size] * (mk["g"] ** (-sigma)))
+
+        key = {"K_0": K_0, "Kp": Kp, "S": list(attributes)}
+        key.update(self.attribute_components(cpabe, attributes, randomness, br))
+        return key
+
+    def attribute_components(self, cpabe, attributes, randomness, br=None):
+        mk = cpabe.mk
+        if br is None:
+            br = self._br(mk, randomness)
+
+        K = {}
+        for attr in attributes:
+            sigma_attr = self.group.random(ZR)
+            K[attr] = [
+                self._hashed_key_term(mk, attr, br, sigma_attr, t)
+                for t in range(self.assump_size)
+            ]
+            K[attr].append(mk["g"] ** (-sigma_attr))
+        return {"K": K}
+
+    def encrypt(self, cpabe, element, policy):
+        ciphertext = self.scheme.encrypt(cpabe.pk, element, policy.policy_str)
+        # 정책 트리 대신 정책 문자열을 보관 (직렬화/사전 검사/AAD 공통 형식)
+        self._policy_trees.put(policy.policy_str, ciphertext["policy"])
+        ciphertext["policy"] = policy.policy_str
+        ciphertext["attributes"] = list(policy.attributes)
+        return ciphertext
+
+    def decrypt(self, cpabe, ciphertext, key):
+        # 불만족 키는 MSP 정리 전에 비트셋 사전 검사로 거부
+        if cpabe.satisfying_leaves(ciphertext, key) is None:
+            return False
+
+        policy_str = ciphertext["policy"]
+        tree = self._policy_trees.get(policy_str)
+        if tree is None:
+            tree = self.msp.createPolicy(policy_str)
+            self._policy_trees.put(policy_str, tree)
+
+        ctxt = {
+            "policy": tree,
+            "C_0": ciphertext["C_0"],
+            "C": ciphertext["C"],
+            "Cp": ciphertext["Cp"],
+        }
+        fame_key = {"attr_list": key["S"], "K_0": key["K_0"], "K": key["K"], "Kp": key["Kp"]}
+        result = self.scheme.decrypt(cpabe.pk, ctxt, fame_key)
+        return False if result is None else result
+
+
+# 이름 -> 백엔드 클래스
+BACKENDS = {
+    BSW07Backend.name: BSW07Backend,
+    FAMEBackend.name: FAMEBackend,
+}
+DEFAULT_BACKEND = BSW07Backend.name
+
+
+def get_backend(backend=None):
+    """
+    백엔드 인스턴스 반환
+
+    Args:
+        backend: 백엔드 이름("bsw07", "fame"), SchemeBackend 인스턴스, 또는 None(기본값)
+    """
+    if isinstance(backend, SchemeBackend):
+        return backend
+    name = DEFAULT_BACKEND if backend is None else str(backend).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"지원되지 않는 백엔드: {backend} (지원: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
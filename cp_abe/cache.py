@@ -0,0 +1,67 @@
+"""
+크기 제한 LRU 캐시
+
+정책 컴파일 결과, 해시된 속성 점 등 반복 계산 결과를 보관합니다.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    크기 제한 LRU 캐시 - 적중/실패/축출 횟수를 함께 기록
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize <= 0:
+            raise ValueError(f"캐시 크기는 1 이상이어야 합니다: {maxsize}")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """키 조회 - 적중 시 가장 최근 항목으로 이동"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """항목 저장 - 용량 초과 시 가장 오래된 항목 축출"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        """항목 제거 (카운터에는 반영하지 않음)"""
+        return self._data.pop(key, default)
+
+    def clear(self):
+        """모든 항목 제거 (카운터는 유지)"""
+        self._data.clear()
+
+    def stats(self):
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
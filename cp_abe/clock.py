@@ -0,0 +1,154 @@
+"""
+시계 추상화
+
+페이딩 함수, DynamicCPABE, KeyAuthority, 만료 스케줄러가 현재 시각을 얻는 방법을
+교체할 수 있게 합니다. 만료 테스트나 장기 수명 주기 시뮬레이션은
+수동/가속 시계로 실제 대기 없이 실행할 수 있습니다.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class Clock:
+    """시계 인터페이스 - time()만 구현하면 나머지는 기본 동작 사용"""
+
+    def time(self):
+        """현재 시각 (UNIX 타임스탬프)"""
+        raise NotImplementedError
+
+    def now(self):
+        """현재 시각 (datetime)"""
+        return datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds):
+        """시계 기준으로 seconds초 대기"""
+        raise NotImplementedError
+
+    def real_timeout(self, seconds):
+        """
+        시계 기준 seconds초에 해당하는 실제 대기 시간
+
+        None이면 시계가 스스로 흐르지 않으므로 advance() 알림까지 대기해야 합니다.
+        """
+        return seconds
+
+    def add_listener(self, callback):
+        """시각이 수동으로 바뀔 때 호출할 콜백 등록 (흐르는 시계에서는 무시)"""
+
+    def remove_listener(self, callback):
+        """콜백 등록 해제"""
+
+
+class SystemClock(Clock):
+    """시스템 시계 (기본값)"""
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class _SteppedClock(Clock):
+    """수동으로만 바뀌는 시계의 공통 부분 - 변경 시 리스너에 알림"""
+
+    def __init__(self, start):
+        self._time = float(time.time() if start is None else start)
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def time(self):
+        return self._time
+
+    def real_timeout(self, seconds):
+        return None
+
+    def add_listener(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def __getstate__(self):
+        # 복사본은 원본의 advance()/set()을 따라가지 못하므로 전달 금지
+        raise TypeError(
+            f"{type(self).__name__}는 다른 프로세스로 전달할 수 없습니다 "
+            "(시각을 명시적으로 전달하세요)"
+        )
+
+    def _set(self, timestamp):
+        with self._lock:
+            self._time = float(timestamp)
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback()
+
+
+class FixedClock(_SteppedClock):
+    """고정 시계 - set()으로만 바뀌며 sleep은 즉시 반환"""
+
+    def __init__(self, timestamp=None):
+        super().__init__(timestamp)
+
+    def set(self, timestamp):
+        self._set(timestamp)
+
+    def sleep(self, seconds):
+        pass
+
+
+class ManualClock(_SteppedClock):
+    """수동 시계 - advance()/sleep()으로 시각을 즉시 진행"""
+
+    def __init__(self, start=None):
+        super().__init__(start)
+
+    def advance(self, seconds):
+        """seconds초 진행"""
+        self._set(self._time + seconds)
+        return self._time
+
+    def set(self, timestamp):
+        self._set(timestamp)
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+
+class AcceleratedClock(Clock):
+    """가속 시계 - 실제 시간 1초가 factor초로 흐름"""
+
+    def __init__(self, factor, start=None):
+        if factor <= 0:
+            raise ValueError(f"가속 배율은 0보다 커야 합니다: {factor}")
+        self.factor = factor
+        self._real_start = time.monotonic()
+        self._start = float(time.time() if start is None else start)
+
+    def time(self):
+        return self._start + (time.monotonic() - self._real_start) * self.factor
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self.factor)
+
+    def real_timeout(self, seconds):
+        return seconds / self.factor
+
+
+class DetachedClock(Clock):
+    """작업자 프로세스용 시계 - 조회하면 예외 (시각은 요청마다 명시적으로 전달)"""
+
+    def time(self):
+        raise RuntimeError("작업자에서는 시계를 읽을 수 없습니다 - 시각을 명시적으로 전달하세요")
+
+    def sleep(self, seconds):
+        self.time()
+
+
+SYSTEM_CLOCK = SystemClock()
+DETACHED_CLOCK = DetachedClock()
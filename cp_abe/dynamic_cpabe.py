@@ -1,7 +1,9 @@
 from .iot_cpabe import IoTCPABE
-from charm.toolbox.pairinggroup import ZR
+from .clock import SYSTEM_CLOCK
+from .hybrid import BROADCAST_MODE
+from .session import DEFAULT_SESSION_LIFETIME
+from .precompute import PreparedKey
 from datetime import datetime
-import time
 import uuid
 import json
 
@@ -13,13 +15,31 @@ class DynamicCPABE(IoTCPABE):
     - 동적 속성: 구독, 보증 (시간에 따라 자동 변경됨)
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, precompute=True, clock=None, multi_pairing=True, backend=None):
+        """
+        Args:
+            precompute: 고정 기저 사전 계산 사용 여부
+            clock: 시각 조회용 시계 (기본값: 시스템 시계)
+            multi_pairing: 복호화를 곱 페어링 1회로 평가할지 여부
+            backend: 스킴 백엔드 이름("bsw07", "fame") 또는 SchemeBackend (기본값: bsw07)
+        """
+        super().__init__(
+            precompute=precompute, multi_pairing=multi_pairing, backend=backend
+        )
         self.user_records = {}  # 사용자 레코드
         self.fading_functions = {}  # 페이딩 함수
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
 
     def register_fading_function(self, attribute_name, fading_function):
-        """시스템에 새 페이딩 함수 등록"""
+        """
+        시스템에 새 페이딩 함수 등록
+
+        시계를 따로 지정하지 않은 페이딩 함수는 시스템의 시계를 사용하며,
+        기준 시각도 그 시계의 현재 시각으로 맞춥니다.
+        """
+        if fading_function.clock is SYSTEM_CLOCK and self.clock is not SYSTEM_CLOCK:
+            fading_function.clock = self.clock
+            fading_function.base_time = self.clock.time()
         self.fading_functions[attribute_name] = fading_function
 
     def create_user_record(self, user_id=None):
@@ -29,21 +49,58 @@ class DynamicCPABE(IoTCPABE):
 
         record = {
             "user_id": user_id,
-            "random_value": self.group.random(ZR),
-            "creation_time": time.time(),
+            "random_value": self.backend.key_randomness(self),
+            "creation_time": self.clock.time(),
             "attributes": {},
         }
 
         self.user_records[user_id] = record
         return user_id
 
-    def compute_attribute_value(self, attribute_name, current_time=None):
-        """페이딩 함수로 현재 속성 값 계산"""
+    def compute_attribute_value(self, attribute_name, current_time=None, user_id=None):
+        """
+        페이딩 함수로 현재 속성 값 계산
+
+        user_id를 주면 해당 사용자 코호트의 위상 오프셋을 적용합니다.
+        """
         # 페이딩 함수가 등록되지 않은 속성은 정적 속성으로 처리
         if attribute_name not in self.fading_functions:
             return attribute_name  # 수정: 원래 속성 이름 그대로 반환 (suffix 없음)
 
-        return self.fading_functions[attribute_name].compute_current_value(current_time)
+        fading_func = self.fading_functions[attribute_name]
+        if current_time is None:
+            current_time = self.clock.time()
+        if user_id is not None:
+            return fading_func.compute_cohort_value(
+                fading_func.cohort_of(user_id), current_time
+            )
+        return fading_func.compute_current_value(current_time)
+
+    def _dynamic_attribute_name(self, attr):
+        """페이딩 함수가 등록된 동적 속성이면 등록 이름 반환 (대소문자 무시), 아니면 None"""
+        if attr in self.fading_functions:
+            return attr
+        attr_lower = str(attr).lower()
+        if attr_lower in self.fading_functions:
+            return attr_lower
+        return None
+
+    def _key_valid_until(self, key):
+        """
+        키 전체의 유효 기한 - 동적 속성 valid_until 중 최솟값
+
+        valid_until이 없는 동적 속성이 하나라도 있으면 None (항상 전체 검사)
+        """
+        deadlines = []
+        expiry_info = key.get("expiry_info", {})
+        for attr_name in key.get("dynamic_attributes", {}):
+            if attr_name not in self.fading_functions:
+                continue
+            info = expiry_info.get(attr_name)
+            if not isinstance(info, dict) or info.get("valid_until") is None:
+                return None
+            deadlines.append(info["valid_until"])
+        return min(deadlines, default=float("inf"))
 
     def keygen_with_attributes(self, attributes, expiry_attributes=None):
         """
@@ -87,7 +144,7 @@ class DynamicCPABE(IoTCPABE):
                 expiry_info[attr] = expiry_timestamp
 
         # 키 생성
-        key = self.cpabe.keygen(self.pk, self.mk, all_attributes)
+        key = self.backend.keygen(self, all_attributes)
 
         # 키에 메타데이터 추가
         if isinstance(key, dict):
@@ -102,58 +159,75 @@ class DynamicCPABE(IoTCPABE):
 
         return key
 
-    def keygen_with_dynamic_attributes(self, user_id, attributes):
+    def keygen_with_dynamic_attributes(self, user_id, attributes, current_time=None):
         """
         동적 속성이 포함된 키 생성 (정적 + 동적)
+
+        current_time을 주면 시계 대신 그 시각 기준으로 에포크 값과 만료 정보를 계산합니다.
         """
+        if current_time is None:
+            current_time = self.clock.time()
+
         if not self.pk or not self.mk:
             self.setup()
 
+        # 사용자 레코드의 키 난수 r에 묶어 발급 (이후 부분 갱신 컴포넌트와 결합 가능)
+        if user_id not in self.user_records:
+            self.create_user_record(user_id)
+        r = self.user_records[user_id]["random_value"]
+
         # 정적 속성만 포함된 기본 집합
         base_attributes = []
 
         # 동적 속성과 정적 속성 분리
         dynamic_attrs = []
 
-        # 모든 속성을 검사하여 동적 속성 분리 (subscription, warranty)
+        # 모든 속성을 검사하여 동적 속성 분리 (페이딩 함수가 등록된 속성)
         for attr in attributes:
-            attr_lower = str(attr).lower()  # 소문자로 변환하여 비교
-
-            if attr_lower == "subscription" or attr_lower == "warranty":
-                dynamic_attrs.append(attr_lower)
+            attr_name = self._dynamic_attribute_name(attr)
+            if attr_name is not None:
+                dynamic_attrs.append(attr_name)
             else:
                 base_attributes.append(attr)
 
         # 기본 키 생성 (정적 속성만 포함)
-        key = self.keygen(base_attributes)
+        key = self.keygen(base_attributes, r=r, issue_time=current_time)
 
         # 키 확장 - 메타데이터 추가
         if isinstance(key, dict):
             key["user_id"] = user_id
-            key["issue_time"] = time.time()
+            key["issue_time"] = current_time
             key["dynamic_attributes"] = {}
             key["expiry_info"] = {}
 
             # 동적 속성 추가
             for attr_name in dynamic_attrs:
                 # 현재 값 계산
-                attr_value = self.compute_attribute_value(attr_name)
+                fading_func = self.fading_functions[attr_name]
+                cohort = fading_func.cohort_of(user_id)
+                attr_value = fading_func.compute_cohort_value(cohort, current_time)
 
                 # 값을 키에 저장
                 key["dynamic_attributes"][attr_name] = attr_value
 
                 # 만료 정보 저장
-                expiry_time = self.get_attribute_expiry_time(attr_name)
+                expiry_time = self.get_attribute_expiry_time(attr_name, current_time)
                 key["expiry_info"][attr_name] = {
                     "expiry_time": expiry_time,
                     "max_renewals": self.get_max_renewals(attr_name),
                     "current_renewals": 0,
+                    "valid_until": fading_func.cohort_valid_until(cohort, current_time),
                 }
+                if cohort is not None:
+                    key["expiry_info"][attr_name]["cohort"] = cohort
 
-                # 동적 속성을 S에 추가하여 복호화에 사용 가능하게 만들기
+                # 동적 속성을 S에 추가하고 같은 r로 키 컴포넌트 발급
                 attr_sanitized = self._sanitize_attribute(attr_value)
                 if "S" in key and attr_sanitized not in key["S"]:
                     key["S"].append(attr_sanitized)
+                    self.backend.merge_components(
+                        key, self.backend.attribute_components(self, [attr_sanitized], r)
+                    )
 
                 # attr_mapping에도 추가
                 if "attr_mapping" not in key:
@@ -167,11 +241,14 @@ class DynamicCPABE(IoTCPABE):
             for attr_name in base_attributes:
                 key["dynamic_attributes"][attr_name] = attr_name
 
+            # 키 전체 유효 기한 (검사 빠른 경로용)
+            key["valid_until"] = self._key_valid_until(key)
+
         return key
 
-    def keygen(self, attributes):
+    def keygen(self, attributes, r=None, issue_time=None):
         """기본 키 생성 메서드 오버라이드 - 추가 메타데이터 포함"""
-        key = super().keygen(attributes)
+        key = super().keygen(attributes, r=r)
 
         # 기본 키에 필요한 메타데이터 추가
         if isinstance(key, dict):
@@ -180,10 +257,42 @@ class DynamicCPABE(IoTCPABE):
             # 빈 만료 정보 추가
             key["expiry_info"] = {}
             # 발급 시간 추가
-            key["issue_time"] = time.time()
+            key["issue_time"] = issue_time if issue_time is not None else self.clock.time()
+            # 키 전체 유효 기한
+            key["valid_until"] = self._key_valid_until(key)
 
         return key
 
+    def issue_transform_key(self, key):
+        """
+        기기 키와 함께 외주 복호화용 변환 키 발급
+
+        변환 키는 블라인딩된 키 컴포넌트와 동적 속성 메타데이터를 함께 담아
+        게이트웨이에서도 만료 검사를 할 수 있게 합니다.
+        블라인딩 값 z는 사용자 레코드에 보관하여 이후 속성 갱신 컴포넌트에도 적용합니다.
+
+        Returns:
+            (변환 키, 복원 키 z) 튜플
+        """
+        tkey, z = self.keygen_transform(key)
+
+        for field in ("user_id", "issue_time", "valid_until"):
+            if field in key:
+                tkey[field] = key[field]
+        tkey["dynamic_attributes"] = dict(key.get("dynamic_attributes", {}))
+        tkey["expiry_info"] = {
+            attr: dict(info) if isinstance(info, dict) else info
+            for attr, info in key.get("expiry_info", {}).items()
+        }
+        tkey["update_history"] = list(key.get("update_history", []))
+        tkey["attr_mapping"] = dict(key.get("attr_mapping", {}))
+
+        user_id = key.get("user_id")
+        if user_id in self.user_records:
+            self.user_records[user_id]["transform_blind"] = z
+
+        return tkey, z
+
     def check_key_validity(self, key):
         """
         키의 유효성 검사 (동적 속성의 만료 여부 확인)
@@ -191,25 +300,41 @@ class DynamicCPABE(IoTCPABE):
         if not isinstance(key, dict) or "dynamic_attributes" not in key:
             return {"valid": False, "reason": "유효하지 않은 키 형식"}
 
-        current_time = time.time()
+        current_time = self.clock.time()
+
+        # 빠른 경로: 키 전체 유효 기한 이전이면 모든 속성이 유효
+        valid_until = key.get("valid_until")
+        if valid_until is not None and current_time < valid_until:
+            return {
+                "valid": True,
+                "valid_attrs": list(key["dynamic_attributes"]),
+                "expired_attrs": [],
+            }
+
         valid_attrs = []
         expired_attrs = []
+        expiry_info = key.get("expiry_info", {})
 
         # 동적 속성 유효성 검사
         for attr_name, attr_value in key["dynamic_attributes"].items():
-            # subscription 또는 warranty인 경우만 만료 여부 검사
-            if attr_name in ["subscription", "warranty"]:
-                # 현재 예상 값 계산
-                expected_value = self.compute_attribute_value(attr_name)
-
-                # 값이 일치하면 유효
-                if attr_value == expected_value:
-                    valid_attrs.append(attr_name)
-                else:
-                    expired_attrs.append(attr_name)
-            else:
+            fading_func = self.fading_functions.get(attr_name)
+            if fading_func is None:
                 # 동적 속성이 아닌 경우는 항상 유효
                 valid_attrs.append(attr_name)
+                continue
+
+            # 속성별 유효 기한 이전이면 값 계산 없이 유효
+            info = expiry_info.get(attr_name)
+            deadline = info.get("valid_until") if isinstance(info, dict) else None
+            if deadline is not None and current_time < deadline:
+                valid_attrs.append(attr_name)
+            elif fading_func.is_valid_cohort(
+                attr_value, info.get("cohort") if isinstance(info, dict) else None,
+                current_time,
+            ):
+                valid_attrs.append(attr_name)
+            else:
+                expired_attrs.append(attr_name)
 
         # 모든 필수 속성이 유효해야 키도 유효
         is_valid = len(expired_attrs) == 0
@@ -221,23 +346,89 @@ class DynamicCPABE(IoTCPABE):
         }
 
     def update_attribute(self, user_id, attribute_name):
-        """특정 속성 갱신"""
+        """
+        특정 속성 갱신 - 새 에포크 속성의 (Dj, Djp)만 발급
+
+        사용자 레코드의 키 난수 r에 묶어 생성하므로 기존 키의 D를 그대로 사용하며,
+        기기로 전송되는 크기는 정적 속성 수와 무관합니다.
+        """
+        return self.issue_attribute_updates(attribute_name, [user_id])[0]
+
+    def issue_attribute_updates(
+        self, attribute_name, user_ids, attribute_value=None, current_time=None
+    ):
+        """
+        같은 속성을 여러 사용자에게 한 번에 갱신 발급
+
+        새 에포크 값은 코호트당 한 번만 계산하고 사용자별로 컴포넌트만 생성합니다.
+
+        Args:
+            attribute_name: 동적 속성 이름
+            user_ids: 사용자 ID 리스트
+            attribute_value: 모든 사용자에게 발급할 에포크 값 (생략 시 사용자 코호트의 현재 값)
+            current_time: 값 계산 기준 시각 (기본값: 현재)
+
+        Returns:
+            user_ids 순서의 갱신 정보 리스트
+        """
         if attribute_name not in self.fading_functions:
             raise ValueError(f"동적 속성이 아닙니다: {attribute_name}")
 
-        # 속성의 새 값 계산
-        new_value = self.compute_attribute_value(attribute_name)
+        records = []
+        for user_id in user_ids:
+            record = self.user_records.get(user_id)
+            if record is None:
+                raise ValueError(f"사용자 레코드가 없습니다: {user_id}")
+            records.append(record)
+
+        fading_func = self.fading_functions[attribute_name]
+        if current_time is None:
+            current_time = self.clock.time()
+
+        # 코호트별 새 값과 유효 기한 (코호트당 한 번 계산)
+        epochs = {}
+
+        def epoch_of(cohort):
+            if cohort not in epochs:
+                current_value = fading_func.compute_cohort_value(cohort, current_time)
+                new_value = current_value if attribute_value is None else attribute_value
+                valid_until = None
+                if new_value == current_value:
+                    valid_until = fading_func.cohort_valid_until(cohort, current_time)
+                epochs[cohort] = (new_value, self._sanitize_attribute(new_value), valid_until)
+            return epochs[cohort]
+
+        updates = []
+        for record in records:
+            new_value, sanitized_value, valid_until = epoch_of(
+                fading_func.cohort_of(record["user_id"])
+            )
 
-        # 새 키 컴포넌트 생성
-        new_attr_key = self.cpabe.keygen(self.pk, self.mk, [attribute_name])
+            # 새 에포크 속성의 키 컴포넌트만 생성
+            new_attr_key = self.backend.attribute_components(
+                self, [sanitized_value], record["random_value"]
+            )
 
-        # 갱신 정보 반환
-        return {
-            "attribute_name": attribute_name,
-            "attribute_value": new_value,
-            "attribute_key": new_attr_key,
-            "issue_time": time.time(),
-        }
+            # 갱신 정보
+            update = {
+                "attribute_name": attribute_name,
+                "attribute_value": new_value,
+                "attribute_key": new_attr_key,
+                "issue_time": current_time,
+                "valid_until": valid_until,
+            }
+
+            # 변환 키가 발급된 사용자는 블라인딩된 컴포넌트도 함께 발급
+            if "transform_blind" in record:
+                z_inv = 1 / record["transform_blind"]
+                update["transform_attribute_key"] = {
+                    field: {a: v ** z_inv for a, v in components.items()}
+                    for field, components in new_attr_key.items()
+                }
+
+            updates.append(update)
+
+        return updates
 
     def merge_attribute_to_key(self, key, new_attr):
         """
@@ -299,38 +490,139 @@ class DynamicCPABE(IoTCPABE):
             if sanitized_attr not in updated_key["S"]:
                 updated_key["S"].append(sanitized_attr)
 
-        # 처음 키 생성 시에도 동적 속성이 S에 포함되도록 설정
-        if hasattr(self.cpabe, "unpack_attributes"):
-            # 키에 동적 속성들도 추가
-            if "Dj" in updated_key:
-                updated_key["Dj"][sanitized_attr] = self.group.init(G1, 1)
-            if "Djp" in updated_key:
-                updated_key["Djp"][sanitized_attr] = self.group.init(G1, 1)
+        # 갱신 컴포넌트 병합 - 변환 키에는 블라인딩된 컴포넌트 사용
+        if key.get("transform_key"):
+            components = new_attr.get("transform_attribute_key")
+        else:
+            components = new_attr.get("attribute_key")
+        if self.backend.has_components(components, sanitized_attr):
+            # 이전 에포크 속성 컴포넌트 제거 (동적 속성으로 발급된 경우만)
+            removed = None
+            previous_value = key["dynamic_attributes"].get(attr_name)
+            if attr_name in key.get("expiry_info", {}) and previous_value is not None:
+                previous_attr = self._sanitize_attribute(previous_value)
+                if previous_attr != sanitized_attr:
+                    removed = previous_attr
+                    if "S" in updated_key and previous_attr in updated_key["S"]:
+                        updated_key["S"].remove(previous_attr)
+
+            self.backend.merge_components(
+                updated_key,
+                {
+                    field: {sanitized_attr: components[field][sanitized_attr]}
+                    for field in self.backend.attribute_fields
+                },
+                removed=removed,
+            )
 
         # 만료 정보 업데이트
         if "expiry_info" in new_attr and attr_name in new_attr["expiry_info"]:
             updated_key["expiry_info"][attr_name] = new_attr["expiry_info"][attr_name]
 
-        # 갱신 횟수 증가
-        if attr_name in updated_key["expiry_info"]:
-            current_renewals = updated_key["expiry_info"][attr_name].get(
-                "current_renewals", 0
-            )
-            updated_key["expiry_info"][attr_name]["current_renewals"] = (
-                current_renewals + 1
-            )
+        # 갱신 횟수 증가 및 유효 기한 갱신 (원본 키의 만료 정보는 수정하지 않음)
+        if isinstance(updated_key["expiry_info"].get(attr_name), dict):
+            info = dict(updated_key["expiry_info"][attr_name])
+            info["current_renewals"] = info.get("current_renewals", 0) + 1
+            info["valid_until"] = new_attr.get("valid_until")
+            updated_key["expiry_info"][attr_name] = info
+        updated_key["valid_until"] = self._key_valid_until(updated_key)
 
         # 업데이트 이력에 기록
         updated_key["update_history"].append(
             {
                 "attribute": attr_name,
                 "value": attr_value,
-                "update_time": time.time(),
+                "update_time": self.clock.time(),
             }
         )
 
+        # 사전 처리 키는 접힌 컴포넌트를 무효화하고 갱신된 키로 다시 준비
+        if isinstance(key, PreparedKey):
+            key.invalidate()
+            updated_key = PreparedKey(updated_key)
+
         return updated_key
 
+    def _dynamic_policy(self, policy_attributes):
+        """
+        속성 목록 정책의 동적 속성을 현재 값으로 바꾼 정책
+
+        코호트가 여럿이면 각 코호트 현재 값의 OR를 담은 정책 문자열을 반환합니다.
+        """
+        current_time = self.clock.time()
+        transformed_policy = []
+        has_cohorts = False
+        for attr_name in policy_attributes:
+            if attr_name in self.fading_functions:
+                # 동적 속성인 경우 현재 값 계산 (코호트가 여럿이면 각 코호트 현재 값의 OR)
+                values = self.fading_functions[attr_name].current_values(current_time)
+                if len(values) == 1:
+                    transformed_policy.append(values[0])
+                else:
+                    transformed_policy.append(f"({' or '.join(values)})")
+                    has_cohorts = True
+            else:
+                # 정적 속성은 그대로 사용
+                transformed_policy.append(attr_name)
+
+        if has_cohorts:
+            return " and ".join(transformed_policy)
+        return transformed_policy
+
+    def encrypt_broadcast_with_dynamic_attributes(self, payload, policies):
+        """
+        동적 속성을 고려한 다중 정책 브로드캐스트 암호화
+
+        Args:
+            policies: 정책 목록 - 속성 리스트 항목은 동적 속성을 현재 값으로 바꿔 사용
+        """
+        return self.encrypt_broadcast(
+            payload,
+            [
+                self._dynamic_policy(policy) if isinstance(policy, list) else policy
+                for policy in policies
+            ],
+        )
+
+    def open_session_with_dynamic_attributes(
+        self, policy_attributes, lifetime=DEFAULT_SESSION_LIFETIME
+    ):
+        """
+        동적 속성을 고려한 정책 세션 시작
+
+        세션은 정책에 포함된 동적 속성 값의 현재 에포크가 끝나면 함께 만료됩니다.
+        """
+        if isinstance(policy_attributes, list):
+            policy_attributes = self._dynamic_policy(policy_attributes)
+        return self.open_session(policy_attributes, lifetime)
+
+    def _session_deadline(self, leaf_attributes, now):
+        """정책에 포함된 동적 속성 값(코호트별) 중 가장 먼저 바뀌는 시각"""
+        deadline = None
+        for fading_function in self.fading_functions.values():
+            cohorts = (
+                [None]
+                if fading_function.phase_offsets is None
+                else range(fading_function.cohorts)
+            )
+            for cohort in cohorts:
+                value = fading_function.compute_cohort_value(cohort, now)
+                if self._sanitize_attribute(value) not in leaf_attributes:
+                    continue
+                transition = fading_function.next_transition(now, cohort)
+                if transition is not None and (deadline is None or transition < deadline):
+                    deadline = transition
+        return deadline
+
+    def _usable_attributes(self, key):
+        """헤더 선택용 키 속성 집합 - 만료된 동적 속성 값은 제외"""
+        attributes = super()._usable_attributes(key)
+        if isinstance(key, dict) and "dynamic_attributes" in key:
+            attr_mapping = key.get("attr_mapping", {})
+            for attr_name in self.check_key_validity(key)["expired_attrs"]:
+                attributes.discard(attr_mapping.get(attr_name))
+        return attributes
+
     def encrypt_with_dynamic_attributes(self, msg, policy_attributes):
         """
         동적 속성을 고려하여 메시지 암호화
@@ -347,23 +639,15 @@ class DynamicCPABE(IoTCPABE):
         # 정책 속성 목록 처리
         if isinstance(policy_attributes, list):
             # 속성 목록 직접 처리 - 동적 속성 현재값 계산
-            transformed_policy = []
-            for attr_name in policy_attributes:
-                if attr_name in ["subscription", "warranty"]:
-                    # 동적 속성인 경우 현재 값 계산
-                    attr_value = self.compute_attribute_value(attr_name)
-                    transformed_policy.append(attr_value)
-                else:
-                    # 정적 속성은 그대로 사용
-                    transformed_policy.append(attr_name)
+            policy = self._dynamic_policy(policy_attributes)
 
             # 조건부 로깅
             if debug_mode:
-                print(f"실제 사용 정책: {transformed_policy}")
+                print(f"실제 사용 정책: {policy}")
 
             # 암호화 수행 - IoTCPABE의 encrypt 메서드 사용
             try:
-                result = self.encrypt(msg, transformed_policy)
+                result = self.encrypt(msg, policy)
                 return result
             except Exception as e:
                 if debug_mode:
@@ -383,6 +667,10 @@ class DynamicCPABE(IoTCPABE):
         """
         암호문 복호화 - 동적 속성 관리 개선
         """
+        # 브로드캐스트 암호문은 만료되지 않은 속성으로 만족하는 헤더만 사용
+        if isinstance(ciphertext, dict) and ciphertext.get("mode") == BROADCAST_MODE:
+            return self.decrypt_broadcast(ciphertext, key)
+
         # dynamic_attributes에서 실제 속성값 적용
         if isinstance(key, dict) and "dynamic_attributes" in key and "S" in key:
             # 동적 속성을 속성 목록에 추가 (아직 추가되지 않은 경우)
@@ -400,17 +688,39 @@ class DynamicCPABE(IoTCPABE):
         # 부모 클래스의 복호화 메서드 호출
         return super().decrypt(ciphertext, key)
 
-    def get_attribute_expiry_time(self, attr_name):
+    def decrypt_stream(self, reader, writer, key):
+        """스트리밍 복호화 - 동적 속성이 만료된 키는 헤더 처리 전에 거부"""
+        if isinstance(key, dict) and "dynamic_attributes" in key:
+            validity = self.check_key_validity(key)
+            if not validity["valid"]:
+                raise ValueError(
+                    f"복호화 실패: 만료된 속성 {validity['expired_attrs']}"
+                )
+
+        return super().decrypt_stream(reader, writer, key)
+
+    def transform(self, ciphertext, tkey):
+        """외주 복호화 변환 - 동적 속성이 만료된 변환 키는 페어링 전에 거부"""
+        if isinstance(tkey, dict) and "dynamic_attributes" in tkey:
+            validity = self.check_key_validity(tkey)
+            if not validity["valid"]:
+                raise ValueError(
+                    f"복호화 실패: 만료된 속성 {validity['expired_attrs']}"
+                )
+
+        return super().transform(ciphertext, tkey)
+
+    def get_attribute_expiry_time(self, attr_name, current_time=None):
         """
         속성의 만료 시간을 계산하여 반환
         """
+        if current_time is None:
+            current_time = self.clock.time()
+
         # 속성에 대한 페이딩 함수가 있는지 확인
         if attr_name in self.fading_functions:
             fading_func = self.fading_functions[attr_name]
 
-            # 현재 시간 기준으로 다음 값 변경 시간 계산
-            current_time = time.time()
-
             # 페이딩 함수에 따라 적절한 수명 속성 사용
             if hasattr(fading_func, "lifetime"):
                 lifetime = fading_func.lifetime
@@ -424,7 +734,7 @@ class DynamicCPABE(IoTCPABE):
             return current_time + lifetime
 
         # 페이딩 함수가 없는 경우 매우 먼 미래 시간 반환 (실질적으로 만료되지 않음)
-        return time.time() + (365 * 24 * 60 * 60)  # 1년 후
+        return current_time + (365 * 24 * 60 * 60)  # 1년 후
 
     def get_max_renewals(self, attr_name):
         """
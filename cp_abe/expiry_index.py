@@ -0,0 +1,150 @@
+"""
+만료 시각 우선순위 인덱스
+
+기기별 구독 만료 시각을 최소 힙으로 관리하여
+"다음 한 시간 안에 만료되는 기기"와 같은 질의를 전체 스캔 없이 처리합니다.
+갱신/삭제는 지연 삭제(lazy deletion)로 처리하고, 무효 항목이 많아지면 힙을 재구성합니다.
+"""
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+
+from .clock import SYSTEM_CLOCK
+
+
+def _to_timestamp(value):
+    """datetime/timestamp/"%Y-%m-%d" 문자열을 UNIX 타임스탬프로 변환"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").timestamp()
+    return float(value)
+
+
+def _to_seconds(window):
+    if isinstance(window, timedelta):
+        return window.total_seconds()
+    return float(window)
+
+
+class ExpiryIndex:
+    """
+    만료 시각 최소 힙 인덱스
+
+    - set(key, expiry): O(log n) 추가/갱신
+    - remove(key): O(1) (지연 삭제)
+    - pop_expiring(until): 만료 시각이 until 이하인 항목을 만료 순서로 꺼냄
+    - iter_expiring(window): 현재부터 window 이내 만료 항목을 제거 없이 만료 순서로 순회
+    """
+
+    def __init__(self, compact_ratio=2.0, clock=None):
+        """
+        Args:
+            compact_ratio: 힙 크기가 유효 항목 수의 이 배수를 넘으면 재구성
+            clock: 기본 기준 시각용 시계 (기본값: 시스템 시계)
+        """
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self._heap = []  # (expiry, seq, key)
+        self._entries = {}  # key -> (expiry, seq)
+        self._counter = itertools.count()
+        self.compact_ratio = compact_ratio
+
+    def set(self, key, expiry):
+        """항목 추가 또는 만료 시각 갱신"""
+        expiry = _to_timestamp(expiry)
+        seq = next(self._counter)
+        self._entries[key] = (expiry, seq)
+        heapq.heappush(self._heap, (expiry, seq, key))
+        self._maybe_compact()
+
+    def remove(self, key):
+        """항목 제거 - 힙에는 무효 항목으로 남음"""
+        if self._entries.pop(key, None) is None:
+            return False
+        self._maybe_compact()
+        return True
+
+    def get(self, key):
+        """항목의 만료 타임스탬프 (없으면 None)"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def _is_live(self, item):
+        expiry, seq, key = item
+        return self._entries.get(key) == (expiry, seq)
+
+    def _maybe_compact(self):
+        if len(self._heap) > 64 and len(self._heap) > self.compact_ratio * len(
+            self._entries
+        ):
+            self._heap = [
+                (expiry, seq, key) for key, (expiry, seq) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def peek(self):
+        """가장 먼저 만료되는 (key, expiry) (비어 있으면 None)"""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        expiry, _, key = heap[0]
+        return key, expiry
+
+    def pop_expiring(self, until=None):
+        """
+        만료 시각이 until 이하인 항목을 인덱스에서 꺼냄
+
+        Args:
+            until: 기준 시각 (datetime/타임스탬프, 기본값: 현재)
+
+        Returns:
+            (key, expiry) 리스트 - 만료 순서
+        """
+        until = self.clock.time() if until is None else _to_timestamp(until)
+        heap = self._heap
+        expired = []
+        while heap and heap[0][0] <= until:
+            item = heapq.heappop(heap)
+            if self._is_live(item):
+                expiry, _, key = item
+                del self._entries[key]
+                expired.append((key, expiry))
+        return expired
+
+    def iter_expiring(self, window, now=None):
+        """
+        현재부터 window 이내에 만료되는 항목을 제거 없이 만료 순서로 순회
+
+        힙 배열을 최선 우선 탐색하므로 결과 k개에 대해 O(k log k)입니다.
+        이미 만료 시각이 지난 항목도 포함됩니다.
+
+        Args:
+            window: 기간 (timedelta 또는 초)
+            now: 기준 시각 (기본값: 현재)
+
+        Yields:
+            (key, expiry) 튜플
+        """
+        now = self.clock.time() if now is None else _to_timestamp(now)
+        until = now + _to_seconds(window)
+        heap = self._heap
+        if not heap or heap[0][0] > until:
+            return
+
+        frontier = [(heap[0], 0)]
+        while frontier:
+            item, index = heapq.heappop(frontier)
+            if self._is_live(item):
+                yield item[2], item[0]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap) and heap[child][0] <= until:
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
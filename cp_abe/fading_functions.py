@@ -1,7 +1,19 @@
-import time
 import math
+import hashlib
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from .clock import SYSTEM_CLOCK
+
+
+# 구간 인덱스로 해석할 수 없는 값 (expired 값, 다른 속성 값 등)
+INVALID_INTERVAL = np.iinfo(np.int64).min
+
+# 최대 코호트 수 - 암호화 정책은 동적 속성마다 코호트별 현재 값의 OR이므로
+# 코호트 하나당 암호문에 (Cy, Cy') 한 쌍이 늘고, 정책 값도 주기당 코호트 수만큼 바뀜
+MAX_COHORTS = 8
+
 
 class FadingFunction(ABC):
     """
@@ -11,9 +23,11 @@ class FadingFunction(ABC):
     페이딩 함수는 시간이 지남에 따라 속성 값을 변화시킵니다.
     """
 
-    def __init__(self, attribute_name):
+    def __init__(self, attribute_name, clock=None):
         self.attribute_name = attribute_name
-        self.base_time = time.time()  # 기준 시간
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.base_time = self.clock.time()  # 기준 시간
+        self.phase_offsets = None  # 코호트별 위상 오프셋 배열 (None이면 단일 코호트)
 
     @abstractmethod
     def compute_current_value(self, current_time=None):
@@ -25,19 +39,243 @@ class FadingFunction(ABC):
         """주어진 속성 값이 현재 시간에 유효한지 확인"""
         pass
 
+    def valid_until(self, current_time=None):
+        """
+        현재 속성 값이 유효한 마지막 시각 (이 시각부터 값이 바뀜)
+
+        계산할 수 없는 함수는 None을 반환하며, 이 경우 매번 값을 다시 계산해 검사합니다.
+        """
+        return None
+
+    def next_transition(self, current_time=None, cohort=None):
+        """
+        current_time 이후 속성 값이 다음으로 바뀌는 정확한 시각
+
+        더 이상 바뀌지 않는 종료 상태(예: HardExpiry의 expired)이거나
+        계산할 수 없으면 None을 반환합니다.
+
+        Args:
+            cohort: 코호트 번호 (위상 오프셋 적용)
+        """
+        if current_time is None:
+            current_time = self.clock.time()
+        offset = self._phase_offset(cohort)
+        shifted = current_time + offset
+        deadline = self.valid_until(shifted)
+        if deadline is None or deadline <= shifted:
+            return None
+        return deadline - offset
+
+    def _interval_end(self, period, current_time):
+        """current_time이 속한 주기의 끝 시각"""
+        if current_time is None:
+            current_time = self.clock.time()
+        interval = math.floor((current_time - self.base_time) / period)
+        return self.base_time + (interval + 1) * period
+
+    # ------------------------------------------------------------------
+    # 코호트 위상 오프셋 - 기기들이 같은 순간에 에포크를 넘지 않도록 분산
+    # ------------------------------------------------------------------
+
+    def set_cohorts(self, cohorts):
+        """
+        코호트 수 설정 - 코호트 k는 k * 주기 / cohorts 만큼 일찍 값이 바뀜
+
+        코호트가 여럿이면 속성 값에 코호트 접미사가 붙습니다 (예: subscription_12c3).
+        암호문 크기가 코호트 수에 비례하므로 MAX_COHORTS개까지만 허용합니다.
+        """
+        if cohorts > MAX_COHORTS:
+            raise ValueError(f"코호트 수 {cohorts}가 최대 {MAX_COHORTS}개를 초과합니다")
+        if cohorts <= 1:
+            self.phase_offsets = None
+        else:
+            self.phase_offsets = np.arange(cohorts, dtype=np.float64) * (
+                self._period() / cohorts
+            )
+
+    @property
+    def cohorts(self):
+        return 1 if self.phase_offsets is None else len(self.phase_offsets)
+
+    def cohort_of(self, device_id):
+        """기기 ID의 해시로 정한 코호트 번호 (단일 코호트면 None)"""
+        if self.phase_offsets is None or device_id is None:
+            return None
+        digest = hashlib.sha256(str(device_id).encode()).digest()
+        return int.from_bytes(digest[:8], "big") % len(self.phase_offsets)
+
+    def _phase_offset(self, cohort):
+        if cohort is None or self.phase_offsets is None:
+            return 0.0
+        return float(self.phase_offsets[cohort])
+
+    def compute_cohort_value(self, cohort, current_time=None):
+        """코호트 기준 현재 속성 값"""
+        if current_time is None:
+            current_time = self.clock.time()
+        offset = self._phase_offset(cohort)
+        value = self.compute_current_value(current_time + offset)
+        if cohort is None or self.phase_offsets is None or value.endswith("_expired"):
+            return value
+        return f"{value}c{cohort}"
+
+    def is_valid_cohort(self, attribute_value, cohort, current_time=None):
+        """코호트 기준 속성 값 유효성 검사"""
+        if current_time is None:
+            current_time = self.clock.time()
+        if cohort is None or self.phase_offsets is None:
+            return self.is_valid(attribute_value, current_time)
+        suffix = f"c{cohort}"
+        if not attribute_value.endswith(suffix):
+            return False
+        return self.is_valid(
+            attribute_value[: -len(suffix)], current_time + self._phase_offset(cohort)
+        )
+
+    def cohort_valid_until(self, cohort, current_time=None):
+        """코호트 기준 현재 값이 유효한 마지막 시각"""
+        if current_time is None:
+            current_time = self.clock.time()
+        offset = self._phase_offset(cohort)
+        deadline = self.valid_until(current_time + offset)
+        return None if deadline is None else deadline - offset
+
+    def current_values(self, current_time=None):
+        """모든 코호트의 현재 값 (암호화 정책의 OR 대상, 중복 제거)"""
+        if current_time is None:
+            current_time = self.clock.time()
+        if self.phase_offsets is None:
+            return [self.compute_current_value(current_time)]
+        values = []
+        for cohort in range(len(self.phase_offsets)):
+            value = self.compute_cohort_value(cohort, current_time)
+            if value not in values:
+                values.append(value)
+        return values
+
+    def cohort_base_times(self, cohort_ids):
+        """코호트 번호 배열을 일괄 평가용 기준 시각 배열로 변환"""
+        cohort_ids = np.asarray(cohort_ids, dtype=np.int64)
+        if self.phase_offsets is None:
+            return np.full(cohort_ids.shape, self.base_time, dtype=np.float64)
+        return self.base_time - self.phase_offsets[cohort_ids]
+
+    # ------------------------------------------------------------------
+    # 일괄 평가 (NumPy) - 다수의 (기기, 속성) 쌍을 구간 인덱스 배열로 처리
+    # ------------------------------------------------------------------
+
+    def _period(self):
+        """값이 바뀌는 주기 (초)"""
+        raise NotImplementedError
+
+    def _value_prefix(self):
+        """속성 값 문자열에서 구간 인덱스 앞에 붙는 접두사"""
+        raise NotImplementedError
+
+    def _base_times(self, base_times):
+        if base_times is None:
+            return self.base_time
+        return np.asarray(base_times, dtype=np.float64)
+
+    def compute_intervals(self, current_times, base_times=None):
+        """
+        시각 배열에 대한 구간 인덱스 일괄 계산
+
+        Args:
+            current_times: 시각 배열 (또는 스칼라)
+            base_times: 기기별 기준 시각 배열 (기본값: 함수의 base_time)
+
+        Returns:
+            int64 구간 인덱스 배열 (브로드캐스트 결과 형태)
+        """
+        current_times = np.asarray(current_times, dtype=np.float64)
+        elapsed = current_times - self._base_times(base_times)
+        return np.floor(elapsed / self._period()).astype(np.int64)
+
+    def is_valid_batch(self, held_intervals, current_times, base_times=None):
+        """
+        보유 구간 인덱스가 현재 구간과 같은지 일괄 검사
+
+        Args:
+            held_intervals: 키가 보유한 값의 구간 인덱스 배열 (parse_intervals 결과)
+
+        Returns:
+            bool 유효성 마스크 배열
+        """
+        held_intervals = np.asarray(held_intervals, dtype=np.int64)
+        current = self.compute_intervals(current_times, base_times)
+        return (held_intervals == current) & (held_intervals != INVALID_INTERVAL)
+
+    def valid_until_batch(self, current_times, base_times=None):
+        """시각 배열 각각에서 현재 값이 유효한 마지막 시각 (float64 배열)"""
+        intervals = self.compute_intervals(current_times, base_times)
+        return self._base_times(base_times) + (intervals + 1) * self._period()
+
+    def _cohort_list(self, cohort_ids, count):
+        """코호트 번호 배열을 길이 count의 리스트로 (코호트 미사용이면 None)"""
+        if cohort_ids is None or self.phase_offsets is None:
+            return None
+        return np.broadcast_to(np.asarray(cohort_ids, dtype=np.int64), (count,)).tolist()
+
+    def _format_intervals(self, intervals):
+        prefix = self._value_prefix()
+        return [f"{prefix}{interval}" for interval in intervals.tolist()]
+
+    def format_values(self, intervals, cohort_ids=None):
+        """
+        구간 인덱스 배열을 속성 값 문자열 리스트로 변환 (필요할 때만 호출)
+
+        Args:
+            cohort_ids: 기기별 코호트 번호 배열 - 코호트 사용 시 접미사(c{k}) 추가
+        """
+        intervals = np.ravel(intervals)
+        values = self._format_intervals(intervals)
+        cohorts = self._cohort_list(cohort_ids, len(values))
+        if cohorts is None:
+            return values
+        return [
+            value if value.endswith("_expired") else f"{value}c{cohort}"
+            for value, cohort in zip(values, cohorts)
+        ]
+
+    def parse_intervals(self, values, cohort_ids=None):
+        """
+        속성 값 문자열 리스트를 구간 인덱스 배열로 변환 (해석 불가 값은 INVALID_INTERVAL)
+
+        코호트 사용 시 값의 코호트 접미사를 떼어내며, cohort_ids를 주면
+        접미사가 기기 코호트와 다른 값도 INVALID_INTERVAL로 처리합니다.
+        base_times에는 cohort_base_times(cohort_ids)를 함께 사용합니다.
+        """
+        prefix = self._value_prefix()
+        intervals = np.full(len(values), INVALID_INTERVAL, dtype=np.int64)
+        cohorts = self._cohort_list(cohort_ids, len(values))
+        for index, value in enumerate(values):
+            if not (isinstance(value, str) and value.startswith(prefix)):
+                continue
+            body = value[len(prefix) :]
+            if self.phase_offsets is not None:
+                body, separator, cohort = body.rpartition("c")
+                if not separator or not cohort.isdigit():
+                    continue
+                if cohorts is not None and int(cohort) != cohorts[index]:
+                    continue
+            if body.lstrip("-").isdigit():
+                intervals[index] = int(body)
+        return intervals
+
 
 class LinearFadingFunction(FadingFunction):
     """
     선형 페이딩 함수 - 일정 시간마다 값이 증가
     """
 
-    def __init__(self, attribute_name, lifetime_seconds):
-        super().__init__(attribute_name)
+    def __init__(self, attribute_name, lifetime_seconds, clock=None):
+        super().__init__(attribute_name, clock)
         self.lifetime_seconds = lifetime_seconds
 
     def compute_current_value(self, current_time=None):
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock.time()
 
         time_diff = current_time - self.base_time
         interval = math.floor(time_diff / self.lifetime_seconds)
@@ -50,20 +288,29 @@ class LinearFadingFunction(FadingFunction):
         current_value = self.compute_current_value(current_time)
         return attribute_value == current_value
 
+    def valid_until(self, current_time=None):
+        return self._interval_end(self._period(), current_time)
+
+    def _period(self):
+        return self.lifetime_seconds
+
+    def _value_prefix(self):
+        return f"{self.attribute_name}_"
+
 
 class StepFadingFunction(FadingFunction):
     """
     계단식 페이딩 함수 - 특정 임계값에 도달할 때마다 값이 변화
     """
 
-    def __init__(self, attribute_name, lifetime_seconds, steps=5):
-        super().__init__(attribute_name)
+    def __init__(self, attribute_name, lifetime_seconds, steps=5, clock=None):
+        super().__init__(attribute_name, clock)
         self.lifetime_seconds = lifetime_seconds
         self.steps = steps
 
     def compute_current_value(self, current_time=None):
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock.time()
 
         time_diff = current_time - self.base_time
         step_size = self.lifetime_seconds / self.steps
@@ -77,21 +324,30 @@ class StepFadingFunction(FadingFunction):
         current_value = self.compute_current_value(current_time)
         return attribute_value == current_value
 
+    def valid_until(self, current_time=None):
+        return self._interval_end(self._period(), current_time)
+
+    def _period(self):
+        return self.lifetime_seconds / self.steps
+
+    def _value_prefix(self):
+        return f"{self.attribute_name}_step"
+
 
 class LocationFadingFunction(FadingFunction):
     """
     위치 속성을 위한 특수 페이딩 함수
     """
 
-    def __init__(self, location_id, granularity, lifetime_seconds):
-        super().__init__(f"loc_{location_id}_{granularity}")
+    def __init__(self, location_id, granularity, lifetime_seconds, clock=None):
+        super().__init__(f"loc_{location_id}_{granularity}", clock)
         self.location_id = location_id
         self.granularity = granularity  # 1=coarse, 2=medium, 3=fine
         self.lifetime_seconds = lifetime_seconds
 
     def compute_current_value(self, current_time=None):
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock.time()
 
         time_diff = current_time - self.base_time
         # 세분화 수준에 따라 다른 lifetime 사용
@@ -106,20 +362,29 @@ class LocationFadingFunction(FadingFunction):
         current_value = self.compute_current_value(current_time)
         return attribute_value == current_value
 
+    def valid_until(self, current_time=None):
+        return self._interval_end(self._period(), current_time)
+
+    def _period(self):
+        return self.lifetime_seconds / self.granularity
+
+    def _value_prefix(self):
+        return f"loc_{self.location_id}_{self.granularity}_"
+
 
 class HardExpiryFadingFunction(FadingFunction):
     """
     Hard Expiry 페이딩 함수 - 특정 시간이 지나면 무조건 만료됨
     """
 
-    def __init__(self, attribute_name, lifetime_seconds, max_renewals=None):
-        super().__init__(attribute_name)
+    def __init__(self, attribute_name, lifetime_seconds, max_renewals=None, clock=None):
+        super().__init__(attribute_name, clock)
         self.lifetime_seconds = lifetime_seconds
         self.max_renewals = max_renewals  # 최대 갱신 횟수
 
     def compute_current_value(self, current_time=None):
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock.time()
 
         # 경과 시간 계산
         time_diff = current_time - self.base_time
@@ -142,3 +407,46 @@ class HardExpiryFadingFunction(FadingFunction):
         if current_value.endswith("_expired") or attribute_value.endswith("_expired"):
             return False
         return attribute_value == current_value
+
+    def valid_until(self, current_time=None):
+        """최대 갱신 횟수를 넘은 expired 값은 유효 기간이 없음 (현재 시각 반환)"""
+        if current_time is None:
+            current_time = self.clock.time()
+        if self.compute_current_value(current_time).endswith("_expired"):
+            return current_time
+        return self._interval_end(self._period(), current_time)
+
+    def _period(self):
+        return self.lifetime_seconds
+
+    def _value_prefix(self):
+        return f"{self.attribute_name}_"
+
+    def _expired_mask(self, intervals):
+        if self.max_renewals is None:
+            return np.zeros(np.shape(intervals), dtype=bool)
+        return intervals > self.max_renewals
+
+    def is_valid_batch(self, held_intervals, current_times, base_times=None):
+        """최대 갱신 횟수를 넘은 구간은 값이 같아도 유효하지 않음"""
+        valid = super().is_valid_batch(held_intervals, current_times, base_times)
+        current = self.compute_intervals(current_times, base_times)
+        return valid & ~self._expired_mask(current)
+
+    def valid_until_batch(self, current_times, base_times=None):
+        """expired 구간은 현재 시각 반환 (valid_until과 동일)"""
+        deadlines = super().valid_until_batch(current_times, base_times)
+        current = self.compute_intervals(current_times, base_times)
+        return np.where(
+            self._expired_mask(current),
+            np.asarray(current_times, dtype=np.float64),
+            deadlines,
+        )
+
+    def _format_intervals(self, intervals):
+        expired = self._expired_mask(intervals).tolist()
+        values = super()._format_intervals(intervals)
+        return [
+            f"{self.attribute_name}_expired" if is_expired else value
+            for value, is_expired in zip(values, expired)
+        ]
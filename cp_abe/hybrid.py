@@ -0,0 +1,272 @@
+"""
+하이브리드 KEM/DEM 암호화 보조 모듈
+
+CP-ABE로 캡슐화한 무작위 GT 요소에서 대칭키를 유도(KDF)하고,
+실제 페이로드는 AES-GCM으로 암호화합니다.
+대용량 페이로드는 고정 크기 인증 청크 단위로 스트리밍합니다.
+"""
+
+import os
+import mmap
+import json
+import struct
+import hashlib
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# 하이브리드 암호문 식별자
+HYBRID_MODE = "hybrid"
+# 다중 정책 브로드캐스트 암호문 식별자 (페이로드 1개 + 정책별 헤더)
+BROADCAST_MODE = "broadcast"
+
+# AES-256-GCM 파라미터
+KEY_SIZE = 32
+NONCE_SIZE = 12
+
+# KDF 도메인 분리용 정보 문자열
+KDF_INFO = b"cp-abe hybrid dem v1"
+
+
+def derive_symmetric_key(group, element, info=KDF_INFO, length=KEY_SIZE):
+    """GT 요소를 직렬화한 뒤 HKDF-SHA256으로 대칭키 유도"""
+    ikm = group.serialize(element)
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=length, salt=None, info=info)
+    return hkdf.derive(ikm)
+
+
+def seal(key, plaintext, associated_data=None, nonce=None):
+    """AES-GCM 암호화 - (nonce, 암호문+태그) 반환"""
+    if nonce is None:
+        nonce = os.urandom(NONCE_SIZE)
+    ciphertext = AESGCM(key).encrypt(nonce, plaintext, associated_data)
+    return nonce, ciphertext
+
+
+def open_sealed(key, nonce, ciphertext, associated_data=None):
+    """AES-GCM 복호화 - 인증 실패 시 ValueError"""
+    try:
+        return AESGCM(key).decrypt(nonce, ciphertext, associated_data)
+    except InvalidTag:
+        raise ValueError("복호화 실패: 페이로드 인증에 실패했습니다")
+
+
+# ---------------------------------------------------------------------------
+# 청크 단위 스트리밍 암호화
+# ---------------------------------------------------------------------------
+
+# 스트림 형식: 프리앰블 | CP-ABE 헤더 | (final 플래그, 길이, 청크 암호문)*
+STREAM_MAGIC = b"CPABESTR"
+STREAM_VERSION = 1
+DEFAULT_CHUNK_SIZE = 64 * 1024
+TAG_SIZE = 16
+NONCE_PREFIX_SIZE = 8
+
+_PREAMBLE = struct.Struct(">8sBI8sI")  # magic, version, chunk_size, nonce_prefix, header_len
+_FRAME = struct.Struct(">BI")  # final 플래그, 청크 암호문 길이
+_CHUNK_AAD = struct.Struct(">IB")  # 청크 번호, final 플래그
+_MAX_HEADER_SIZE = 1024 * 1024
+
+
+class StreamSource:
+    """
+    스트림 입력 어댑터 - bytes/bytearray/memoryview, mmap, 파일 객체를 동일하게 처리
+
+    버퍼 프로토콜을 지원하는 입력은 memoryview 슬라이스로 복사 없이 읽습니다.
+    """
+
+    def __init__(self, reader):
+        if isinstance(reader, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._view = memoryview(reader)
+            self._file = None
+        else:
+            if not hasattr(reader, "read"):
+                raise TypeError(f"지원되지 않는 입력 형식: {type(reader)}")
+            self._view = None
+            self._file = reader
+        self._offset = 0
+
+    def read(self, size):
+        """최대 size 바이트 읽기 - 입력 끝에서만 size보다 짧게 반환"""
+        if self._view is not None:
+            chunk = self._view[self._offset : self._offset + size]
+            self._offset += len(chunk)
+            return chunk
+
+        parts = []
+        remaining = size
+        while remaining > 0:
+            data = self._file.read(remaining)
+            if not data:
+                break
+            parts.append(data)
+            remaining -= len(data)
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def read_exact(self, size):
+        """정확히 size 바이트 읽기 - 부족하면 ValueError"""
+        data = self.read(size)
+        if len(data) != size:
+            raise ValueError("복호화 실패: 스트림이 예기치 않게 끝났습니다")
+        return data
+
+
+def _chunk_nonce(nonce_prefix, index):
+    """스트림별 prefix와 청크 번호로 96비트 nonce 구성"""
+    return nonce_prefix + index.to_bytes(NONCE_SIZE - NONCE_PREFIX_SIZE, "big")
+
+
+def write_stream(source, writer, key, header_bytes, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    스트림 암호화 - 고정 크기 청크마다 AES-GCM 인증 암호화
+
+    다음 청크를 한 개만 미리 읽어 마지막 청크를 표시하므로
+    메모리 사용량은 페이로드 크기와 무관하게 청크 2개 수준입니다.
+
+    Returns:
+        기록한 총 바이트 수
+    """
+    if not 0 < chunk_size < 2**31:
+        raise ValueError(f"유효하지 않은 청크 크기: {chunk_size}")
+
+    nonce_prefix = os.urandom(NONCE_PREFIX_SIZE)
+    preamble = _PREAMBLE.pack(
+        STREAM_MAGIC, STREAM_VERSION, chunk_size, nonce_prefix, len(header_bytes)
+    )
+    aad_base = hashlib.sha256(preamble + header_bytes).digest()
+
+    writer.write(preamble)
+    writer.write(header_bytes)
+    written = len(preamble) + len(header_bytes)
+
+    aead = AESGCM(key)
+    index = 0
+    current = source.read(chunk_size)
+    while True:
+        following = source.read(chunk_size) if len(current) == chunk_size else b""
+        final = 1 if len(following) == 0 else 0
+
+        aad = aad_base + _CHUNK_AAD.pack(index, final)
+        sealed = aead.encrypt(_chunk_nonce(nonce_prefix, index), current, aad)
+
+        writer.write(_FRAME.pack(final, len(sealed)))
+        writer.write(sealed)
+        written += _FRAME.size + len(sealed)
+
+        if final:
+            return written
+        index += 1
+        if index >= 2**32:
+            raise ValueError("스트림 청크 수 한도를 초과했습니다")
+        current = following
+
+
+def read_stream_preamble(source):
+    """
+    스트림 프리앰블과 CP-ABE 헤더 읽기
+
+    Returns:
+        (헤더 바이트, 스트림 파라미터) 튜플
+    """
+    magic, version, chunk_size, nonce_prefix, header_len = _PREAMBLE.unpack(
+        bytes(source.read_exact(_PREAMBLE.size))
+    )
+    if magic != STREAM_MAGIC:
+        raise ValueError("복호화 실패: CP-ABE 스트림 형식이 아닙니다")
+    if version != STREAM_VERSION:
+        raise ValueError(f"지원되지 않는 스트림 버전: {version}")
+    if header_len > _MAX_HEADER_SIZE:
+        raise ValueError("복호화 실패: 헤더 크기가 비정상적입니다")
+
+    header_bytes = bytes(source.read_exact(header_len))
+    preamble = _PREAMBLE.pack(magic, version, chunk_size, nonce_prefix, header_len)
+    params = {
+        "chunk_size": chunk_size,
+        "nonce_prefix": nonce_prefix,
+        "aad_base": hashlib.sha256(preamble + header_bytes).digest(),
+    }
+    return header_bytes, params
+
+
+def read_stream_chunks(source, writer, key, params):
+    """
+    스트림 복호화 - 청크별 인증 후 즉시 기록
+
+    청크 순서/마지막 여부가 AAD에 묶여 있어 재배열과 절단을 검출합니다.
+
+    Returns:
+        복원한 평문 바이트 수
+    """
+    aead = AESGCM(key)
+    max_frame = params["chunk_size"] + TAG_SIZE
+    index = 0
+    total = 0
+
+    while True:
+        frame = source.read(_FRAME.size)
+        if len(frame) == 0:
+            raise ValueError("복호화 실패: 스트림이 잘렸습니다 (마지막 청크 없음)")
+        if len(frame) != _FRAME.size:
+            raise ValueError("복호화 실패: 스트림이 예기치 않게 끝났습니다")
+
+        final, length = _FRAME.unpack(bytes(frame))
+        if length > max_frame or length < TAG_SIZE:
+            raise ValueError("복호화 실패: 청크 길이가 비정상적입니다")
+
+        sealed = source.read_exact(length)
+        aad = params["aad_base"] + _CHUNK_AAD.pack(index, final)
+        try:
+            plain = aead.decrypt(
+                _chunk_nonce(params["nonce_prefix"], index), sealed, aad
+            )
+        except InvalidTag:
+            raise ValueError(f"복호화 실패: {index}번 청크 인증에 실패했습니다")
+
+        writer.write(plain)
+        total += len(plain)
+
+        if final:
+            if len(source.read(1)) != 0:
+                raise ValueError("복호화 실패: 마지막 청크 뒤에 데이터가 있습니다")
+            return total
+        index += 1
+
+
+# ---------------------------------------------------------------------------
+# CP-ABE 헤더 직렬화
+# ---------------------------------------------------------------------------
+
+
+def serialize_header(group, obj):
+    """CP-ABE 헤더(그룹 요소를 포함한 dict/list)를 JSON 바이트로 직렬화"""
+    return json.dumps(_encode_value(group, obj), separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def deserialize_header(group, data):
+    """serialize_header의 역변환"""
+    return _decode_value(group, json.loads(bytes(data).decode("utf-8")))
+
+
+def _encode_value(group, value):
+    if isinstance(value, dict):
+        return {k: _encode_value(group, v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(group, v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # 나머지는 pairing 그룹 요소로 간주
+    return {"__element__": group.serialize(value).decode("ascii")}
+
+
+def _decode_value(group, value):
+    if isinstance(value, dict):
+        if "__element__" in value:
+            return group.deserialize(value["__element__"].encode("ascii"))
+        return {k: _decode_value(group, v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(group, v) for v in value]
+    return value
@@ -1,7 +1,29 @@
-from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+from charm.toolbox.pairinggroup import ZR, G1, G2, GT, pair
 from charm.toolbox.secretutil import SecretUtil
-from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
-import re
+from .backends import get_backend
+from .precompute import PrecomputedTables, PreparedKey
+from .policy import PolicyCompiler, CompiledPolicy, AttributeInterner, SatisfiabilityFilter
+from .cache import LRUCache
+from .online_offline import OfflinePool
+from .clock import SYSTEM_CLOCK
+from .session import DEFAULT_SESSION_LIFETIME, PolicySession
+from . import wire
+from .hybrid import (
+    HYBRID_MODE,
+    BROADCAST_MODE,
+    KEY_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    StreamSource,
+    derive_symmetric_key,
+    seal,
+    open_sealed,
+    write_stream,
+    read_stream_preamble,
+    read_stream_chunks,
+    serialize_header,
+    deserialize_header,
+)
+import os
 import base64
 import hashlib
 import json
@@ -17,25 +39,244 @@ class IoTCPABE:
     - 키 생성 (keygen)
     - 정책 기반 암호화 (encrypt)
     - 키 기반 복호화 (decrypt)
+    - 대용량 페이로드용 하이브리드 KEM/DEM 암호화 (encrypt_hybrid)
+    - 다중 정책 브로드캐스트: 페이로드 1개 + 정책별 헤더 (encrypt_broadcast)
+    - 최소 페어링 복호화 계획: OR/임계값 정책에서 가장 싼 만족 부분 트리 선택 (plan_decryption)
+    - 곱 페어링 복호화: 만족 리프의 페어링을 최종 지수 연산 1회로 평가 (multi_pairing)
+    - 스킴 백엔드 교체: BSW07(SS512, 기본값) 또는 FAME(Type-III BN254) (backend)
+    - 정책 세션 키: 세션당 캡슐화 1회, 이후 메시지는 AES-GCM만 (open_session)
+    - 파일/mmap 대상 청크 단위 스트리밍 암호화 (encrypt_stream)
+    - 외주 복호화: 변환 키 발급/게이트웨이 변환/기기 마무리 (transform)
+    - 온라인/오프라인 암호화: 중간 암호문 풀 사전 계산 (enable_online_offline)
     """
 
-    def __init__(self):
-        # 페어링 그룹 설정
-        self.group = PairingGroup("SS512")
-        # CP-ABE 알고리즘 초기화
-        self.cpabe = CPabe_BSW07(self.group)
-        self.util = SecretUtil(self.group)
+    # 세션 만료 등 시각 조회용 시계 (DynamicCPABE는 생성자에서 교체)
+    clock = SYSTEM_CLOCK
+
+    def __init__(self, precompute=True, multi_pairing=True, backend=None):
+        """
+        Args:
+            precompute: 고정 기저 사전 계산 사용 여부
+            multi_pairing: 복호화를 곱 페어링 1회로 평가할지 여부
+            backend: 스킴 백엔드 이름("bsw07", "fame") 또는 SchemeBackend (기본값: bsw07)
+        """
+        # 스킴 백엔드와 페어링 그룹
+        self.backend = get_backend(backend)
+        self.group = self.backend.group
+        # CP-ABE 알고리즘 (charm 스킴 객체)
+        self.cpabe = self.backend.scheme
+        self.util = SecretUtil(self.group, verbose=False)
         # 마스터 키와 공개 파라미터
         self.pk = None
         self.mk = None
+        # 고정 기저 사전 계산 테이블 (pk가 바뀌면 다시 구축)
+        self.precompute = precompute
+        self._tables = None
+        # 복호화 엔진: 모든 페어링을 곱 페어링 1회로 평가 (최종 지수 연산 공유)
+        self.multi_pairing = multi_pairing
+        # 정책 컴파일 결과 캐시 (정책 원문 -> 컴파일된 트리/share 배치)
+        self.policy_compiler = PolicyCompiler(sanitizer=self._sanitize_attribute)
+        # 복호화 전 만족 여부 사전 검사 (암호문 정책 문자열 -> 비트셋 필터)
+        self.attribute_ids = AttributeInterner()
+        self.prefilters = LRUCache(256)
+        # 최소 페어링 복호화 계획 캐시 ((정책 지문, 키 속성 비트셋) -> 계획 + 계수 경로)
+        self.decryption_plans = LRUCache(1024)
+        self.pairings_saved = 0
+        # 정책별 라그랑주 계수 캐시 (정책 지문 -> {라벨: ZR 계수})
+        self.coefficient_cache = LRUCache(256)
+        self.path_hits = 0
+        self.path_misses = 0
+        # 온라인/오프라인 암호화용 중간 암호문 풀 (enable_online_offline로 활성화)
+        self.offline_pool = None
+
+    def _require_native(self, feature):
+        """BSW07 내장 경로 전용 기능 - 다른 백엔드에서는 ValueError"""
+        if not self.backend.native:
+            raise ValueError(
+                f"{self.backend.name} 백엔드에서는 {feature} 기능을 사용할 수 없습니다"
+            )
+
+    @property
+    def tables(self):
+        """현재 공개 파라미터에 대한 고정 기저 사전 계산 테이블"""
+        if self._tables is None or self._tables.pk is not self.pk:
+            self._tables = PrecomputedTables(
+                self.group, self.pk, enabled=self.precompute
+            )
+        return self._tables
 
     def setup(self):
         """
         CP-ABE 시스템 초기화 - 공개 키와 마스터 키 생성
         """
-        (self.pk, self.mk) = self.cpabe.setup()
+        (self.pk, self.mk) = self.backend.setup(self)
+        # 반복 사용되는 기저의 테이블을 미리 구축
+        self._tables = PrecomputedTables(
+            self.group, self.pk, enabled=self.precompute
+        )
+        # 이전 공개 파라미터로 만든 중간 암호문은 폐기하고 같은 설정으로 다시 시작
+        if self.offline_pool is not None:
+            self.enable_online_offline(
+                session_capacity=self.offline_pool.session_capacity,
+                leaf_capacity=self.offline_pool.leaf_capacity,
+                background=self.offline_pool.metrics()["worker_running"],
+            )
         return (self.pk, self.mk)
 
+    def enable_online_offline(
+        self, session_capacity=32, leaf_capacity=64, attributes=None, background=True
+    ):
+        """
+        온라인/오프라인 암호화 활성화
+
+        Args:
+            session_capacity: 세션 항목(s, e(g,g)^(alpha*s), h^s) 최대 개수
+            leaf_capacity: 속성별 리프 항목 최대 개수
+            attributes: 미리 채울 속성 목록 (이후 사용된 속성은 자동 추적)
+            background: 백그라운드 작업자로 채울지 여부 (False면 fill_offline_pool 호출)
+        """
+        self._require_native("온라인/오프라인 암호화")
+        if not self.pk:
+            raise ValueError(
+                "시스템이 초기화되지 않았습니다. setup()을 먼저 호출하세요."
+            )
+
+        self.disable_online_offline()
+        self.offline_pool = OfflinePool(
+            self.group,
+            self.pk,
+            session_capacity=session_capacity,
+            leaf_capacity=leaf_capacity,
+            attributes=[self._sanitize_attribute(a) for a in attributes or []],
+        )
+        if background:
+            self.offline_pool.start()
+        return self.offline_pool
+
+    def disable_online_offline(self):
+        """온라인/오프라인 암호화 비활성화 (작업자 중지)"""
+        if self.offline_pool is not None:
+            self.offline_pool.stop()
+            self.offline_pool = None
+
+    def fill_offline_pool(self, max_items=None):
+        """유휴 시간에 중간 암호문 풀을 동기적으로 채움 - 생성 항목 수 반환"""
+        if self.offline_pool is None:
+            raise ValueError("온라인/오프라인 암호화가 활성화되지 않았습니다")
+        return self.offline_pool.fill(max_items)
+
+    def offline_metrics(self):
+        """중간 암호문 풀 메트릭 (깊이, 채움 속도, 적중/실패)"""
+        if self.offline_pool is None:
+            return None
+        return self.offline_pool.metrics()
+
+    def _bsw07_keygen(self, attributes, r=None):
+        """
+        BSW07 키 생성 - 고정 기저 테이블 사용
+
+        charm CPabe_BSW07.keygen과 동일한 키 구조 {D, Dj, Djp, S}를 반환합니다.
+        """
+        if r is None:
+            r = self.group.random(ZR)
+
+        g_r = self.tables.pow("g2", r)
+        D = (self.mk["g2_alpha"] * g_r) ** (1 / self.mk["beta"])
+        D_j, D_j_pr = self._bsw07_attribute_components(attributes, r, g_r)
+
+        return {"D": D, "Dj": D_j, "Djp": D_j_pr, "S": attributes}
+
+    def _bsw07_attribute_components(self, attributes, r, g_r=None):
+        """
+        속성별 키 컴포넌트 (Dj, Djp) 생성 - 키 난수 r에 묶임
+
+        같은 r로 만든 컴포넌트는 기존 키의 D와 그대로 결합되므로
+        부분 키 갱신 시 D를 다시 만들 필요가 없습니다.
+        """
+        tables = self.tables
+        if g_r is None:
+            g_r = tables.pow("g2", r)
+
+        D_j, D_j_pr = {}, {}
+        for attr in attributes:
+            r_j = self.group.random(ZR)
+            D_j[attr] = g_r * tables.pow_hashed(attr, r_j)
+            D_j_pr[attr] = tables.pow("g", r_j)
+        return D_j, D_j_pr
+
+    def _bsw07_encrypt(self, message, policy):
+        """
+        BSW07 암호화 - 고정 기저 테이블과 컴파일된 정책 사용
+
+        charm CPabe_BSW07.encrypt와 동일한 암호문 구조를 반환하므로
+        기존 복호화 경로와 그대로 호환됩니다.
+        """
+        if not isinstance(policy, CompiledPolicy):
+            policy = self.compile_policy(policy)
+
+        pool = self.offline_pool
+        if pool is not None and pool.pk is self.pk:
+            return self._bsw07_encrypt_online(message, policy, pool)
+
+        tables = self.tables
+        s = self.group.random(ZR)
+        shares = self.util.calculateSharesDict(s, policy.tree)
+
+        C_y, C_y_pr = {}, {}
+        for leaf, attr in policy.leaves:
+            share = shares[leaf]
+            C_y[leaf] = tables.pow("g", share)
+            C_y_pr[leaf] = tables.pow_hashed(attr, share)
+
+        return {
+            "C_tilde": tables.pow("e_gg_alpha", s) * message,
+            "C": tables.pow("h", s),
+            "Cy": C_y,
+            "Cyp": C_y_pr,
+            "policy": policy.policy_str,
+            "attributes": list(policy.attributes),
+        }
+
+    def _bsw07_encrypt_online(self, message, policy, pool):
+        """
+        온라인 단계 암호화 - 풀의 중간 암호문에 정책을 결합
+
+        share 계산과 delta = lambda - lambda' 계산(필드 연산)만 수행하고,
+        풀이 비어 있는 항목만 직접 거듭제곱으로 계산합니다.
+        """
+        tables = self.tables
+        session = pool.take_session()
+        if session is None:
+            s = self.group.random(ZR)
+            e_gg_alpha_s, h_s = tables.pow("e_gg_alpha", s), tables.pow("h", s)
+        else:
+            s, e_gg_alpha_s, h_s = session
+
+        shares = self.util.calculateSharesDict(s, policy.tree)
+
+        C_y, C_y_pr, deltas = {}, {}, {}
+        for leaf, attr in policy.leaves:
+            share = shares[leaf]
+            item = pool.take_leaf(attr)
+            if item is None:
+                C_y[leaf] = tables.pow("g", share)
+                C_y_pr[leaf] = tables.pow_hashed(attr, share)
+            else:
+                lam, C_y[leaf], C_y_pr[leaf] = item
+                deltas[leaf] = share - lam
+
+        ciphertext = {
+            "C_tilde": e_gg_alpha_s * message,
+            "C": h_s,
+            "Cy": C_y,
+            "Cyp": C_y_pr,
+            "policy": policy.policy_str,
+            "attributes": list(policy.attributes),
+        }
+        if deltas:
+            ciphertext["Cy_delta"] = deltas
+        return ciphertext
+
     def _sanitize_attribute(self, attr):
         """
         속성명 안전하게 처리 - 원래 속성과 변환된 속성 간의 일관성 보장
@@ -70,8 +311,14 @@ class IoTCPABE:
 
         return sanitized
 
-    def keygen(self, attributes):
-        """기본 키 생성 (속성 집합 기반)"""
+    def keygen(self, attributes, r=None):
+        """
+        기본 키 생성 (속성 집합 기반)
+
+        Args:
+            attributes: 속성 리스트
+            r: 키 난수 (생략 시 새로 생성, 사용자 레코드의 난수를 넘기면 부분 갱신과 호환)
+        """
         if not self.pk or not self.mk:
             raise ValueError(
                 "시스템이 초기화되지 않았습니다. setup()을 먼저 호출하세요."
@@ -94,7 +341,7 @@ class IoTCPABE:
             print(f"처리된 속성 목록: {safe_attrs}")
 
         # 키 생성
-        key = self.cpabe.keygen(self.pk, self.mk, safe_attrs)
+        key = self.backend.keygen(self, safe_attrs, r)
 
         # 원본 속성명 매핑 정보 추가
         if isinstance(key, dict) and "dynamic_attributes" not in key:
@@ -143,7 +390,8 @@ class IoTCPABE:
 
         # 정책 처리 - 속성명에 특수 처리 적용
         print(f"실제 사용 정책: {policy}")
-        processed_policy = self._process_policy(policy)
+        compiled = self.compile_policy(policy)
+        processed_policy = compiled.policy_str
 
         try:
             # 메시지 타입에 따른 처리
@@ -160,7 +408,7 @@ class IoTCPABE:
 
                 # 암호화 실행
                 print(f'처리된 정책 문자열: "{processed_policy}"')
-                ciphertext = self.cpabe.encrypt(self.pk, gt_element, processed_policy)
+                ciphertext = self.backend.encrypt(self, gt_element, compiled)
 
                 # 직렬화된 데이터를 암호문에 추가
                 if isinstance(ciphertext, dict):
@@ -169,9 +417,13 @@ class IoTCPABE:
 
                 return ciphertext
 
+            elif isinstance(message, (bytes, bytearray, memoryview)):
+                # 바이너리 페이로드는 하이브리드 모드로 암호화
+                return self.encrypt_hybrid(message, policy)
+
             else:
                 # 이미 그룹 요소인 경우 바로 암호화
-                ciphertext = self.cpabe.encrypt(self.pk, message, processed_policy)
+                ciphertext = self.backend.encrypt(self, message, compiled)
                 return ciphertext
 
         except Exception as e:
@@ -180,36 +432,500 @@ class IoTCPABE:
             print(f"정책 처리 디버깅: 원본={policy}, 처리됨={processed_policy}")
             raise ValueError(f"암호화 실패: {str(e)}")
 
-    def _process_policy(self, policy):
-        """정책 문자열 일관되게 처리"""
-        if isinstance(policy, list):
-            # 리스트로 주어진 경우 각 속성을 안전하게 처리하고 AND로 연결
-            safe_attrs = [self._sanitize_attribute(attr) for attr in policy]
-            policy_str = " and ".join(safe_attrs)
-        elif isinstance(policy, str):
-            # 문자열로 주어진 경우
-            if " and " in policy.lower() or " or " in policy.lower():
-                # 복합 정책 처리
-                parts = []
-                # 대소문자 구분 없이 연산자 찾기
-                for part in re.split(
-                    r"(\s+and\s+|\s+or\s+)", policy, flags=re.IGNORECASE
-                ):
-                    if re.match(r"\s+and\s+|\s+or\s+", part, re.IGNORECASE):
-                        # 연산자는 소문자로 통일
-                        parts.append(part.lower())
-                    else:
-                        # 속성은 처리 함수 적용
-                        parts.append(self._sanitize_attribute(part.strip()))
-                policy_str = "".join(parts)
-            else:
-                # 단일 속성 처리
-                policy_str = self._sanitize_attribute(policy)
-        else:
-            # 다른 타입은 문자열로 변환 후 처리
-            policy_str = self._sanitize_attribute(str(policy))
+    def encapsulate(self, policy):
+        """
+        KEM 단계 - 무작위 GT 요소를 정책으로 캡슐화
+
+        Returns:
+            (대칭키, CP-ABE 헤더) 튜플
+        """
+        if not self.pk:
+            raise ValueError(
+                "시스템이 초기화되지 않았습니다. setup()을 먼저 호출하세요."
+            )
+
+        compiled = self.compile_policy(policy)
+        element = self.group.random(GT)
+        header = self.backend.encrypt(self, element, compiled)
+
+        return derive_symmetric_key(self.group, element), header
+
+    def decapsulate(self, header, key):
+        """KEM 역단계 - 헤더에서 GT 요소를 복원하고 대칭키 유도"""
+        element = self.backend.decrypt(self, header, key)
+        if element is False or element is None:
+            raise ValueError("복호화 실패: 키가 정책을 만족하지 않습니다")
+
+        return derive_symmetric_key(self.group, element)
+
+    def encrypt_hybrid(self, payload, policy):
+        """
+        하이브리드 암호화 - CP-ABE 캡슐화 1회 + AES-GCM 페이로드 암호화
+
+        페이로드 크기와 무관하게 CP-ABE 비용은 일정하며,
+        정책 문자열을 AAD로 묶어 헤더와 페이로드의 결합을 보장합니다.
+        """
+        is_string = isinstance(payload, str)
+        data = payload.encode("utf-8") if is_string else payload
+
+        sym_key, header = self.encapsulate(policy)
+        nonce, body = seal(sym_key, data, header["policy"].encode("utf-8"))
+
+        if os.environ.get("CP_ABE_DEBUG") == "1":
+            print(f"하이브리드 암호화 완료: 정책={header['policy']}, {len(body)}바이트")
+
+        return {
+            "mode": HYBRID_MODE,
+            "header": header,
+            "nonce": nonce,
+            "payload": body,
+            "is_string": is_string,
+        }
+
+    def decrypt_hybrid(self, ciphertext, key):
+        """하이브리드 복호화 - 캡슐 해제 후 AES-GCM 복호화"""
+        header = ciphertext["header"]
+        sym_key = self.decapsulate(header, key)
+        data = open_sealed(
+            sym_key,
+            ciphertext["nonce"],
+            ciphertext["payload"],
+            header["policy"].encode("utf-8"),
+        )
+
+        if ciphertext.get("is_string", False):
+            return data.decode("utf-8")
+        return data
+
+    def encrypt_broadcast(self, payload, policies):
+        """
+        다중 정책 브로드캐스트 암호화 - 페이로드는 한 번만 암호화하고 DEM 키를 정책마다 감쌈
+
+        정책마다 CP-ABE 캡슐화로 얻은 키로 DEM 키를 AES-GCM 래핑하므로
+        저장/CDN 전송량은 페이로드 사본 수가 아니라 작은 헤더 수에 비례합니다.
+        페이로드 AAD에 정책 목록 전체를 묶어 헤더 추가/제거를 검출합니다.
+
+        Args:
+            payload: bytes 또는 문자열
+            policies: 정책 목록 (각 항목은 정책 문자열 또는 AND로 연결할 속성 리스트)
+        """
+        if not policies:
+            raise ValueError("브로드캐스트 정책 목록이 비어 있습니다")
+
+        is_string = isinstance(payload, str)
+        data = payload.encode("utf-8") if is_string else payload
+        dem_key = os.urandom(KEY_SIZE)
+
+        headers = []
+        for policy in policies:
+            wrap_key, header = self.encapsulate(policy)
+            wrap_nonce, wrapped = seal(
+                wrap_key, dem_key, header["policy"].encode("utf-8")
+            )
+            headers.append({"header": header, "nonce": wrap_nonce, "wrapped_key": wrapped})
+
+        nonce, body = seal(dem_key, data, self._broadcast_aad(headers))
+        return {
+            "mode": BROADCAST_MODE,
+            "headers": headers,
+            "nonce": nonce,
+            "payload": body,
+            "is_string": is_string,
+        }
+
+    @staticmethod
+    def _broadcast_aad(headers):
+        return "\n".join(entry["header"]["policy"] for entry in headers).encode("utf-8")
+
+    def _usable_attributes(self, key):
+        """헤더 선택에 쓸 키 속성 집합"""
+        return set(key.get("S", []))
+
+    def select_broadcast_header(self, ciphertext, key):
+        """
+        키가 만족하는 브로드캐스트 헤더 색인 (없으면 None)
+
+        페어링 없이 비트셋 사전 검사(prefilter)로 만족 여부만 검사하며,
+        여럿이면 복호화 계획의 페어링 수가 가장 적은 헤더를 고릅니다.
+        """
+        prefilters = [
+            self.prefilter(entry["header"]["policy"]) for entry in ciphertext["headers"]
+        ]
+        mask = self.attribute_ids.mask(self._usable_attributes(key))
+        best = None
+        for index, prefilter in enumerate(prefilters):
+            plan = self._decryption_plan(prefilter, mask)
+            if plan is None:
+                continue
+            if best is None or plan.pairings < best[0]:
+                best = (plan.pairings, index)
+        return None if best is None else best[1]
+
+    def decrypt_broadcast(self, ciphertext, key):
+        """브로드캐스트 복호화 - 만족하는 헤더 하나만 캡슐 해제 후 페이로드 복호화"""
+        index = self.select_broadcast_header(ciphertext, key)
+        if index is None:
+            raise ValueError("복호화 실패: 키가 만족하는 브로드캐스트 정책이 없습니다")
+
+        entry = ciphertext["headers"][index]
+        wrap_key = self.decapsulate(entry["header"], key)
+        dem_key = open_sealed(
+            wrap_key,
+            entry["nonce"],
+            entry["wrapped_key"],
+            entry["header"]["policy"].encode("utf-8"),
+        )
+        data = open_sealed(
+            dem_key,
+            ciphertext["nonce"],
+            ciphertext["payload"],
+            self._broadcast_aad(ciphertext["headers"]),
+        )
+
+        if ciphertext.get("is_string", False):
+            return data.decode("utf-8")
+        return data
+
+    def open_session(self, policy, lifetime=DEFAULT_SESSION_LIFETIME):
+        """
+        정책 세션 시작 - 같은 정책의 작은 메시지를 CP-ABE 캡슐화 1회로 암호화
+
+        Args:
+            policy: 세션 정책 (encrypt와 동일한 형식)
+            lifetime: 세션 수명 (초) - 정책 속성의 현재 에포크 종료 시각을 넘지 않음
+
+        Returns:
+            PolicySession (announcement()를 기기에 먼저 전송)
+        """
+        now = self.clock.time()
+        expires_at = now + lifetime
+        leaf_attributes = {attr for _, attr in self.compile_policy(policy).leaves}
+        deadline = self._session_deadline(leaf_attributes, now)
+        if deadline is not None:
+            expires_at = min(expires_at, deadline)
+        return PolicySession(self, policy, expires_at)
+
+    def _session_deadline(self, leaf_attributes, now):
+        """정책 속성 값이 바뀌는 가장 이른 시각 (정적 속성만 있으면 None)"""
+        return None
+
+    def encrypt_stream(self, reader, writer, policy, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        스트리밍 암호화 - 고정 크기 인증 청크 단위로 reader에서 writer로 암호화
+
+        Args:
+            reader: bytes/bytearray/memoryview, mmap 또는 read()를 가진 파일 객체
+            writer: write()를 가진 파일 객체
+            policy: 접근 정책
+            chunk_size: 청크 크기 (바이트)
+
+        Returns:
+            기록한 총 바이트 수
+        """
+        sym_key, header = self.encapsulate(policy)
+        header_bytes = serialize_header(self.group, header)
+        return write_stream(
+            StreamSource(reader), writer, sym_key, header_bytes, chunk_size
+        )
+
+    def decrypt_stream(self, reader, writer, key):
+        """
+        스트리밍 복호화 - 헤더 캡슐 해제 후 청크별로 인증/복호화하여 writer에 기록
+
+        Returns:
+            복원한 평문 바이트 수
+        """
+        if not self.pk:
+            raise ValueError(
+                "시스템이 초기화되지 않았습니다. setup()을 먼저 호출하세요."
+            )
+
+        source = StreamSource(reader)
+        header_bytes, params = read_stream_preamble(source)
+        header = deserialize_header(self.group, header_bytes)
+        sym_key = self.decapsulate(header, key)
+        return read_stream_chunks(source, writer, sym_key, params)
+
+    def keygen_transform(self, key, z=None):
+        """
+        외주 복호화용 변환 키 생성 (Green-Hohenberger-Waters 방식)
 
-        return policy_str
+        키 컴포넌트 D, Dj, Djp를 1/z로 블라인딩한 변환 키는 게이트웨이/서버에 맡기고,
+        z(복원 키)는 기기만 보관합니다.
+
+        Returns:
+            (변환 키, 복원 키 z) 튜플
+        """
+        self._require_native("외주 복호화")
+        if z is None:
+            z = self.group.random(ZR)
+        z_inv = 1 / z
+
+        tkey = {
+            "D": key["D"] ** z_inv,
+            "Dj": {attr: value ** z_inv for attr, value in key["Dj"].items()},
+            "Djp": {attr: value ** z_inv for attr, value in key["Djp"].items()},
+            "S": list(key["S"]),
+            "transform_key": True,
+        }
+        return tkey, z
+
+    def prepare_key(self, key):
+        """
+        반복 복호화용 사전 처리 키 (선택 사항)
+
+        키 에포크 동안 많은 패키지를 복호화하는 기기/게이트웨이용입니다.
+        반환된 키는 원래 키 대신 decrypt/transform 등에 그대로 사용합니다.
+        """
+        self._require_native("사전 처리 키")
+        if isinstance(key, PreparedKey):
+            return key
+        return PreparedKey(key)
+
+    def prefilter(self, policy_str):
+        """암호문 정책 문자열의 만족 여부 사전 검사 필터 (정책당 한 번 컴파일)"""
+        prefilter = self.prefilters.get(policy_str)
+        if prefilter is None:
+            prefilter = SatisfiabilityFilter(policy_str, self.attribute_ids)
+            self.prefilters.put(policy_str, prefilter)
+        return prefilter
+
+    def _decryption_plan(self, prefilter, mask):
+        """(정책 지문, 키 속성 비트셋)별로 캐시한 복호화 계획 (불만족이면 None)"""
+        cache_key = (prefilter.fingerprint, mask)
+        plan = self.decryption_plans.get(cache_key)
+        if plan is None:
+            plan = prefilter.plan(mask) or False
+            self.decryption_plans.put(cache_key, plan)
+        return plan or None
+
+    def plan_decryption(self, header, key):
+        """
+        최소 페어링 복호화 계획 - 키가 정책을 여러 방법으로 만족할 때 리프가 가장 적은 부분 트리 선택
+
+        그룹 연산 없이 비트셋으로만 평가하며, 정책 불만족이면 None을 반환합니다.
+        """
+        # 필터를 먼저 컴파일해야 정책 속성의 비트가 색인에 등록됨
+        prefilter = self.prefilter(header["policy"])
+        mask = self.attribute_ids.mask(self._usable_attributes(key))
+        return self._decryption_plan(prefilter, mask)
+
+    def satisfying_leaves(self, header, key):
+        """키가 헤더 정책을 만족하면 복호화에 쓸 리프 [(라벨, 속성), ...], 아니면 None"""
+        plan = self.plan_decryption(header, key)
+        return None if plan is None else plan.leaves
+
+    def decryption_plan_stats(self):
+        """복호화 계획 캐시 통계, 계수 경로 적중/실패, 누적 절약 페어링 수"""
+        stats = self.decryption_plans.stats()
+        stats["pairings_saved"] = self.pairings_saved
+        stats["path_hits"] = self.path_hits
+        stats["path_misses"] = self.path_misses
+        stats["coefficients"] = self.coefficient_cache.stats()
+        return stats
+
+    def _decryption_path(self, header, plan):
+        """
+        계획 리프별 (라벨, 속성, 라그랑주 계수) - 계획에 한 번 채운 뒤 재사용
+
+        같은 정책/키 속성 집합의 반복 복호화는 페어링과 지수 연산만 수행합니다.
+        """
+        if plan.path is not None:
+            self.path_hits += 1
+            return plan.path
+
+        self.path_misses += 1
+        coefficients = self.coefficient_cache.get(plan.fingerprint)
+        if coefficients is None:
+            policy = self.util.createPolicy(header["policy"])
+            coefficients = self.util.getCoefficients(policy)
+            self.coefficient_cache.put(plan.fingerprint, coefficients)
+        plan.path = [(j, k, coefficients[j]) for j, k in plan.leaves]
+        return plan.path
+
+    def can_decrypt(self, ciphertext, key):
+        """
+        페어링 없이 키가 암호문 정책을 만족하는지 검사
+
+        기기가 접근할 수 없는 패키지를 복호화 시도 없이 건너뛸 때 사용합니다.
+        """
+        mode = ciphertext.get("mode")
+        if mode == BROADCAST_MODE:
+            return self.select_broadcast_header(ciphertext, key) is not None
+        header = ciphertext["header"] if mode == HYBRID_MODE else ciphertext
+        return self.satisfying_leaves(header, key) is not None
+
+    def _bsw07_blinded_secret(self, header, key):
+        """
+        BSW07 복호화 트리 계산 - e(C, D) / A = e(g,g)^(alpha*s) 반환
+
+        온라인 암호문의 delta는 실제로 사용되는 리프에서만 보정합니다.
+        변환 키를 넣으면 e(g,g)^(alpha*s/z)가 됩니다. 정책 불만족 시 False.
+        """
+        plan = self.plan_decryption(header, key)
+        if plan is None:
+            return False
+        self.pairings_saved += plan.pairings_saved
+
+        path = self._decryption_path(header, plan)
+        if self.multi_pairing:
+            return self._bsw07_pairing_product(header, key, plan.fingerprint, path)
+
+        A = self.group.init(GT, 1)
+        for j, k, coefficient in path:
+            c_y, c_y_pr = self._leaf_components(header, j, k)
+            A *= (
+                pair(c_y, key["Dj"][k]) / pair(key["Djp"][k], c_y_pr)
+            ) ** coefficient
+
+        return pair(header["C"], key["D"]) / A
+
+    def _leaf_components(self, header, label, attr):
+        """리프의 (Cy, Cy') - 온라인 암호문이면 delta 보정"""
+        c_y, c_y_pr = header["Cy"][label], header["Cyp"][label]
+        delta = header.get("Cy_delta", {}).get(label)
+        if delta is not None:
+            tables = self.tables
+            c_y = c_y * tables.pow("g", delta)
+            c_y_pr = c_y_pr * tables.pow_hashed(attr, delta)
+        return c_y, c_y_pr
+
+    def _bsw07_pairing_product(self, header, key, fingerprint, path):
+        """
+        복호화 트리를 곱 페어링 1회로 평가
+
+        e(C, D) * prod e(Cy^-λ, Dj) * e(Dj', Cy'^λ) - 라그랑주 계수 λ를 G1 쪽에 접어 넣어
+        리프별 GT 지수 연산과 페어링마다의 최종 지수 연산을 없앱니다.
+        """
+        lhs = [header["C"]]
+        rhs = [key["D"]]
+        if isinstance(key, PreparedKey):
+            # 사전 처리된 키: λ를 키 쪽에 접은 컴포넌트 재사용 (지수 연산 없음)
+            for j, k, d_j, d_jp in key.folded_path(fingerprint, path):
+                c_y, c_y_pr = self._leaf_components(header, j, k)
+                lhs.append(c_y)
+                rhs.append(d_j)
+                lhs.append(d_jp)
+                rhs.append(c_y_pr)
+            return self.group.pair_prod(lhs, rhs)
+
+        for j, k, coefficient in path:
+            c_y, c_y_pr = self._leaf_components(header, j, k)
+            lhs.append(c_y ** -coefficient)
+            rhs.append(key["Dj"][k])
+            lhs.append(key["Djp"][k])
+            rhs.append(c_y_pr ** coefficient)
+        return self.group.pair_prod(lhs, rhs)
+
+    def _bsw07_decrypt(self, ciphertext, key):
+        """BSW07 복호화 - charm CPabe_BSW07.decrypt와 동일, 정책 불만족 시 False"""
+        secret = self._bsw07_blinded_secret(ciphertext, key)
+        if secret is False:
+            return False
+        return ciphertext["C_tilde"] / secret
+
+    def _bsw07_transform(self, header, tkey):
+        """
+        변환 단계 - 페어링 전부 수행
+
+        블라인딩된 키로 BSW07 복호화 트리를 계산해 T = e(g,g)^(alpha*s/z)를 반환합니다.
+        """
+        T = self._bsw07_blinded_secret(header, tkey)
+        if T is False:
+            raise ValueError("복호화 실패: 키가 정책을 만족하지 않습니다")
+        return T
+
+    def transform(self, ciphertext, tkey):
+        """
+        외주 복호화 변환 - 게이트웨이/서버에서 실행
+
+        Returns:
+            기기가 지수 연산 1회로 복호화를 마칠 수 있는 부분 복호문
+        """
+        if not self.pk:
+            raise ValueError(
+                "시스템이 초기화되지 않았습니다. setup()을 먼저 호출하세요."
+            )
+        if ciphertext is None:
+            raise ValueError("복호화 실패: 암호문이 None입니다.")
+
+        if ciphertext.get("mode") == HYBRID_MODE:
+            header = ciphertext["header"]
+            transformed = dict(ciphertext)
+            transformed["header"] = {
+                "C_tilde": header["C_tilde"],
+                "T": self._bsw07_transform(header, tkey),
+                "policy": header["policy"],
+            }
+            return transformed
+
+        transformed = {
+            "C_tilde": ciphertext["C_tilde"],
+            "T": self._bsw07_transform(ciphertext, tkey),
+            "policy": ciphertext["policy"],
+        }
+        for field in ("serialized_data", "is_string"):
+            if field in ciphertext:
+                transformed[field] = ciphertext[field]
+        return transformed
+
+    def decrypt_transformed(self, transformed, retrieval_key):
+        """
+        외주 복호화 마무리 - 기기에서 실행 (페어링 없이 GT 지수 연산 1회)
+
+        M = C_tilde / T^z
+        """
+        if transformed.get("mode") == HYBRID_MODE:
+            header = transformed["header"]
+            element = header["C_tilde"] / (header["T"] ** retrieval_key)
+            data = open_sealed(
+                derive_symmetric_key(self.group, element),
+                transformed["nonce"],
+                transformed["payload"],
+                header["policy"].encode("utf-8"),
+            )
+            if transformed.get("is_string", False):
+                return data.decode("utf-8")
+            return data
+
+        element = transformed["C_tilde"] / (transformed["T"] ** retrieval_key)
+        if transformed.get("is_string", False) and transformed.get("serialized_data"):
+            original_message = self._recover_original_message(
+                transformed["serialized_data"]
+            )
+            if original_message is None:
+                raise ValueError("복호화 실패: 원본 메시지를 복원할 수 없습니다")
+            return original_message
+        return element
+
+    def compile_policy(self, policy):
+        """
+        정책 컴파일 - AND/OR/괄호/k-of-n 지원, 결과는 LRU 캐시에 보관
+
+        Args:
+            policy: 정책 문자열 (예: "model and (region or 2 of (a, b, c))")
+                    또는 AND로 연결할 속성 리스트
+        """
+        return self.policy_compiler.compile(policy)
+
+    def to_wire(self, obj):
+        """암호문/키/갱신 컴포넌트를 바이너리 전송 형식으로 인코딩"""
+        self._require_native("바이너리 전송 형식")
+        return wire.encode(self.group, obj)
+
+    def from_wire(self, data):
+        """바이너리 전송 형식에서 암호문/키/갱신 컴포넌트 복원"""
+        self._require_native("바이너리 전송 형식")
+        return wire.decode(self.group, data)
+
+    def wire_size(self, obj):
+        """실제 전송 바이트 수 (바이너리 전송 형식 기준)"""
+        self._require_native("바이너리 전송 형식")
+        return wire.wire_size(self.group, obj)
+
+    def _process_policy(self, policy):
+        """정책 문자열 일관되게 처리 (charm 정책 문자열 반환)"""
+        return self.compile_policy(policy).policy_str
 
     def _recover_original_message(self, serialized_data):
         """직렬화된 데이터에서 원본 메시지 복원"""
@@ -245,6 +961,12 @@ class IoTCPABE:
         if ciphertext is None:
             raise ValueError("복호화 실패: 암호문이 None입니다.")
 
+        # 하이브리드 암호문은 캡슐 해제 후 대칭 복호화
+        if isinstance(ciphertext, dict) and ciphertext.get("mode") == HYBRID_MODE:
+            return self.decrypt_hybrid(ciphertext, key)
+        if isinstance(ciphertext, dict) and ciphertext.get("mode") == BROADCAST_MODE:
+            return self.decrypt_broadcast(ciphertext, key)
+
         # 디버깅 정보 출력
         if isinstance(key, dict) and "S" in key:
             print(f"복호화 키 속성: {key['S']}")
@@ -267,9 +989,15 @@ class IoTCPABE:
 
         try:
             # 순수 CP-ABE 복호화 시도
-            pt = self.cpabe.decrypt(self.pk, key, ciphertext)
+            pt = self.backend.decrypt(self, ciphertext, key)
             print(f"복호화 결과 타입: {type(pt)}")
 
+            # 정책 불만족(False)은 문자열 메시지라도 복원하지 않음
+            if pt is False:
+                raise ValueError(
+                    "복호화 실패: 키가 정책을 만족하지 않거나 만료되었습니다"
+                )
+
             # CPabe_BSW07은 복잡한 정책에서 키가 정책을 만족해도 None을 반환할 수 있음
             # 이는 복호화 실패가 아닌 복호화 성공이지만 반환값이 없는 상태임
             if is_string_message and serialized_data:
@@ -1,11 +1,129 @@
 from .dynamic_cpabe import DynamicCPABE
-from datetime import datetime, timedelta
-import time
+from .hybrid import serialize_header, deserialize_header
+from .storage import InMemoryDeviceStore
+from .clock import DETACHED_CLOCK
+from .expiry_index import ExpiryIndex
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import copy
+from datetime import timedelta
+import os
 import uuid
 import logging
 import hashlib
 
 
+# 조회 결과에서 제외하는 기기 레코드 필드
+_PRIVATE_FIELDS = ("user_id", "random_value", "transform_blind")
+
+
+# ---------------------------------------------------------------------------
+# 일괄 등록용 키 생성 작업자 (프로세스 풀)
+# ---------------------------------------------------------------------------
+
+_worker_cpabe = None
+
+
+def _detach_fading_functions(fading_functions):
+    """
+    작업자로 보낼 페이딩 함수 사본 - 시계를 DETACHED_CLOCK으로 교체
+
+    작업자는 시계를 읽지 않고 배치마다 전달받은 시각만 사용합니다.
+    """
+    detached = {}
+    for attribute_name, fading_func in fading_functions.items():
+        fading_copy = copy.copy(fading_func)
+        fading_copy.clock = DETACHED_CLOCK
+        detached[attribute_name] = fading_copy
+    return detached
+
+
+def _fading_fingerprint(fading_functions):
+    """
+    작업자 풀 재사용 판단용 페이딩 설정 요약
+
+    함수 종류와 시계를 뺀 모든 설정(수명, 기준 시각, 코호트 위상, 최대 갱신 횟수 등)을
+    포함하므로 set_cohorts()나 같은 이름으로 다른 함수를 등록해도 풀이 다시 생성됩니다.
+    """
+    return tuple(
+        (
+            attribute_name,
+            type(fading_func).__name__,
+            tuple(
+                (field, repr(value.tolist() if hasattr(value, "tolist") else value))
+                for field, value in sorted(vars(fading_func).items())
+                if field != "clock"
+            ),
+        )
+        for attribute_name, fading_func in sorted(fading_functions.items())
+    )
+
+
+def _init_keygen_worker(pk_bytes, mk_bytes, fading_functions, precompute, backend):
+    """작업자 프로세스 초기화 - 공개 파라미터/마스터 키를 한 번만 복원"""
+    global _worker_cpabe
+    cpabe = DynamicCPABE(precompute=precompute, clock=DETACHED_CLOCK, backend=backend)
+    cpabe.pk = deserialize_header(cpabe.group, pk_bytes)
+    cpabe.mk = deserialize_header(cpabe.group, mk_bytes)
+    cpabe.fading_functions = fading_functions
+    _worker_cpabe = cpabe
+
+
+def _keygen_worker_batch(current_time, batch):
+    """
+    작업자에서 배치 단위 키 생성
+
+    Args:
+        current_time: 발급 기준 시각 (요청 프로세스의 시계 값)
+        batch: [(user_id, 속성 리스트, 직렬화된 키 난수 r), ...]
+
+    Returns:
+        직렬화된 키 리스트 (배치 순서 유지)
+    """
+    cpabe = _worker_cpabe
+    keys = []
+    for user_id, attributes, r_bytes in batch:
+        cpabe.user_records[user_id] = {
+            "user_id": user_id,
+            "random_value": deserialize_header(cpabe.group, r_bytes),
+        }
+        key = cpabe.keygen_with_dynamic_attributes(
+            user_id, attributes, current_time=current_time
+        )
+        del cpabe.user_records[user_id]
+        keys.append(serialize_header(cpabe.group, key))
+    return keys
+
+
+def _renewal_worker_batch(attribute_name, current_time, entries):
+    """
+    작업자에서 같은 속성의 갱신 컴포넌트 일괄 생성
+
+    Args:
+        entries: [(user_id, 직렬화된 키 난수 r, 직렬화된 블라인딩 값 z 또는 None), ...]
+
+    Returns:
+        직렬화된 갱신 정보 리스트 (entries 순서 유지)
+    """
+    cpabe = _worker_cpabe
+    user_ids = []
+    for user_id, r_bytes, z_bytes in entries:
+        record = {"user_id": user_id, "random_value": deserialize_header(cpabe.group, r_bytes)}
+        if z_bytes is not None:
+            record["transform_blind"] = cpabe.group.deserialize(z_bytes)
+        cpabe.user_records[user_id] = record
+        user_ids.append(user_id)
+
+    try:
+        updates = cpabe.issue_attribute_updates(
+            attribute_name, user_ids, current_time=current_time
+        )
+    finally:
+        for user_id in user_ids:
+            cpabe.user_records.pop(user_id, None)
+    return [serialize_header(cpabe.group, update) for update in updates]
+
+
 class KeyAuthority:
     """
     키 관리 기관(Key Authority) 클래스 - 시간 제한 속성만으로 접근 제한
@@ -16,24 +134,42 @@ class KeyAuthority:
     - 갱신 거부를 통한 간접적 접근 관리
     """
 
-    def __init__(self, cpabe_system=None):
+    def __init__(self, cpabe_system=None, store=None, clock=None, backend=None):
+        """
+        Args:
+            cpabe_system: 사용할 CP-ABE 시스템 (기본값: 새 DynamicCPABE)
+            store: 기기 정보 저장소 (기본값: InMemoryDeviceStore)
+            clock: 시각 조회용 시계 (기본값: CP-ABE 시스템의 시계)
+            backend: cpabe_system이 없을 때 사용할 스킴 백엔드 이름 (기본값: bsw07)
+        """
         if cpabe_system is None:
-            self.cpabe = DynamicCPABE()
+            self.cpabe = DynamicCPABE(clock=clock, backend=backend)
             self.cpabe.setup()
         else:
             self.cpabe = cpabe_system
+        self.clock = clock if clock is not None else self.cpabe.clock
 
         # 갱신 정책 관리
         self.renewal_policies = {}
 
-        # 기기 관리 (취소 없이 상태만 관리)
-        self.device_status = {}  # 기기 상태 정보 (활성/비활성)
-        self._secure_storage = {}  # 기기 최소 정보 저장
+        # 기기 최소 정보 저장소 (기기 상태/구독 만료일/키 난수의 단일 원본)
+        self._secure_storage = store if store is not None else InMemoryDeviceStore()
+
+        # 활성 기기의 구독 만료 시각 인덱스 (device_hash 기준, 저장소에서 재구성)
+        self.expiry_index = ExpiryIndex(clock=self.clock)
+        for device_hash, subscription_end in self._secure_storage.subscription_ends(
+            "active"
+        ):
+            self.expiry_index.set(device_hash, subscription_end)
 
         # 로깅 설정
         self.logger = logging.getLogger("KeyAuthority")
         self.logger.setLevel(logging.INFO)
 
+        # 일괄 등록/갱신 공용 작업자 프로세스 풀 (처음 사용할 때 생성)
+        self._worker_pool = None
+        self._worker_pool_key = None
+
     def _create_device_hash(self, device_id):
         """기기 ID에 대한 해시 생성 (식별용)"""
         return hashlib.sha256(device_id.encode()).hexdigest()[:16]
@@ -43,10 +179,38 @@ class KeyAuthority:
         device_hash = self._create_device_hash(device_id)
 
         # 안전한 스토리지에서 최소 정보만 조회
-        if device_hash in self._secure_storage:
-            return self._secure_storage[device_hash]
+        return self._secure_storage.get(device_hash)
 
-        return None
+    def _serialize_secret(self, value):
+        return serialize_header(self.cpabe.group, value).decode("utf-8")
+
+    def _restore_user_record(self, device_info):
+        """
+        사용자 키 난수를 CP-ABE 시스템에 복원 (재시작 후 첫 갱신)
+
+        Returns:
+            갱신 컴포넌트를 발급할 수 있으면 True
+        """
+        user_id = device_info["user_id"]
+        if user_id in self.cpabe.user_records:
+            return True
+        if "random_value" not in device_info:
+            return False
+
+        group = self.cpabe.group
+        record = {
+            "user_id": user_id,
+            "random_value": deserialize_header(
+                group, device_info["random_value"].encode("utf-8")
+            ),
+            "attributes": {},
+        }
+        if "transform_blind" in device_info:
+            record["transform_blind"] = deserialize_header(
+                group, device_info["transform_blind"].encode("utf-8")
+            )
+        self.cpabe.user_records[user_id] = record
+        return True
 
     def register_device(
         self, device_id, initial_attributes, subscription_period_days=30
@@ -63,29 +227,151 @@ class KeyAuthority:
         # 키 생성
         key = self.cpabe.keygen_with_dynamic_attributes(user_id, complete_attributes)
 
-        # 기기 해시 생성
-        device_hash = self._create_device_hash(device_id)
-
         # 최소 정보만 저장
-        now = datetime.now()
+        expiry_date = self._commit_device_records(
+            [(device_id, user_id)], subscription_period_days
+        )
+
+        self.logger.info(f"기기 {device_id} 등록 완료. 구독 만료일: {expiry_date}")
+        return key
+
+    def _commit_device_records(self, devices, subscription_period_days):
+        """
+        기기 레코드 일괄 저장 - 날짜 계산은 배치당 한 번
+
+        Args:
+            devices: [(device_id, user_id), ...]
+
+        Returns:
+            구독 만료일 문자열
+        """
+        now = self.clock.now()
         expiry_date = (now + timedelta(days=subscription_period_days)).strftime(
             "%Y-%m-%d"
         )
+        registration_date = now.isoformat()
+        status = "active" if subscription_period_days > 0 else "inactive"
 
-        self._secure_storage[device_hash] = {
-            "user_id": user_id,
-            "subscription_end": expiry_date,
-            "registration_date": now.isoformat(),
-            "status": "active" if subscription_period_days > 0 else "inactive",
-        }
+        records = {}
+        for device_id, user_id in devices:
+            device_hash = self._create_device_hash(device_id)
+            records[device_hash] = {
+                "user_id": user_id,
+                "subscription_end": expiry_date,
+                "registration_date": registration_date,
+                "status": status,
+                # 부분 키 갱신에 필요한 키 난수 (재시작 후 복원용)
+                "random_value": self._serialize_secret(
+                    self.cpabe.user_records[user_id]["random_value"]
+                ),
+            }
+            if status == "active":
+                self.expiry_index.set(device_hash, expiry_date)
+            else:
+                self.expiry_index.remove(device_hash)
+        self._secure_storage.put_many(records)
+
+        return expiry_date
+
+    def register_devices(
+        self, devices, workers=None, batch_size=256, subscription_period_days=30
+    ):
+        """
+        기기 일괄 등록 - 프로세스 풀로 키 생성을 분산하고 키를 스트리밍으로 반환
+
+        작업자 풀은 일괄 갱신과 공유되어 호출 간 재사용되므로(shutdown()으로 종료)
+        마스터 키는 풀 생성 시 한 번만 전달되고, 기기 레코드는 배치 단위로 저장됩니다. 처리 중인 배치 수가 제한되므로
+        호출자는 전체 키를 메모리에 보관하지 않고 순서대로 받아 처리할 수 있습니다.
+
+        Args:
+            devices: (device_id, initial_attributes) 쌍의 반복 가능 객체
+            workers: 작업자 프로세스 수 (기본값: CPU 수, 1 이하면 현재 프로세스에서 처리)
+            batch_size: 작업자에 한 번에 넘길 기기 수
+            subscription_period_days: 구독 기간 (일)
+
+        Yields:
+            (device_id, key) 튜플 - 입력 순서 유지
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        batches = self._iter_registration_batches(devices, batch_size)
+
+        if workers <= 1:
+            for batch in batches:
+                keys = [
+                    self.cpabe.keygen_with_dynamic_attributes(user_id, attributes)
+                    for _, user_id, attributes in batch
+                ]
+                yield from self._finish_registration_batch(
+                    batch, keys, subscription_period_days
+                )
+            return
+
+        group = self.cpabe.group
+        pool = self._get_worker_pool(workers)
+        # 작업자당 최대 2개 배치만 처리 중으로 유지 (메모리 상한)
+        pending = deque()
+        for batch in batches:
+            payload = [
+                (
+                    user_id,
+                    attributes,
+                    serialize_header(
+                        group, self.cpabe.user_records[user_id]["random_value"]
+                    ),
+                )
+                for _, user_id, attributes in batch
+            ]
+            pending.append(
+                (batch, pool.submit(_keygen_worker_batch, self.clock.time(), payload))
+            )
+            if len(pending) >= workers * 2:
+                yield from self._collect_registration_batch(
+                    pending.popleft(), subscription_period_days
+                )
+        while pending:
+            yield from self._collect_registration_batch(
+                pending.popleft(), subscription_period_days
+            )
 
-        # 상태 정보 업데이트
-        self.device_status[device_id] = (
-            "active" if subscription_period_days > 0 else "inactive"
+    def _iter_registration_batches(self, devices, batch_size):
+        """입력을 배치로 나누고 사용자 레코드 생성"""
+        batch = []
+        for device_id, initial_attributes in devices:
+            user_id = self.cpabe.create_user_record(device_id)
+
+            # 구독 속성 자동 추가
+            complete_attributes = list(initial_attributes)
+            if "subscription" not in complete_attributes:
+                complete_attributes.append("subscription")
+
+            batch.append((device_id, user_id, complete_attributes))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _collect_registration_batch(self, entry, subscription_period_days):
+        """작업자 결과를 복원하고 배치 마무리"""
+        batch, future = entry
+        keys = [
+            deserialize_header(self.cpabe.group, key_bytes)
+            for key_bytes in future.result()
+        ]
+        return self._finish_registration_batch(batch, keys, subscription_period_days)
+
+    def _finish_registration_batch(self, batch, keys, subscription_period_days):
+        """배치 레코드 저장 후 (device_id, key) 목록 반환"""
+        expiry_date = self._commit_device_records(
+            [(device_id, user_id) for device_id, user_id, _ in batch],
+            subscription_period_days,
         )
-
-        self.logger.info(f"기기 {device_id} 등록 완료. 구독 만료일: {expiry_date}")
-        return key
+        self.logger.info(
+            f"기기 {len(batch)}대 일괄 등록 완료. 구독 만료일: {expiry_date}"
+        )
+        return [(device_id, key) for (device_id, _, _), key in zip(batch, keys)]
 
     def set_renewal_policy(self, attribute_name, **policy_params):
         """속성별 갱신 정책 설정"""
@@ -96,110 +382,279 @@ class KeyAuthority:
         for param, value in policy_params.items():
             self.logger.debug(f"- {param}: {value}")
 
-    def request_attribute_renewal(self, device_id, attribute_name):
-        """속성 갱신 요청 처리 - 갱신 조건 충족 여부에 따라 허용/거부"""
-        self.logger.info(
-            f"기기 {device_id}로부터 '{attribute_name}' 속성 갱신 요청 수신"
-        )
+    def _check_renewal(self, device_id, attribute_name, device_info, pending=0):
+        """
+        갱신 정책 검사
 
-        # 1. 기기 정보 최소한으로 조회
-        device_info = self._get_minimal_device_info(device_id)
-        if not device_info:
-            return {"success": False, "reason": "unregistered_device"}
+        Args:
+            pending: 같은 배치에서 이미 승인된 같은 기기/속성 갱신 수
 
-        user_id = device_info["user_id"]
+        Returns:
+            거부 사유 문자열 (승인 시 None)
+        """
+        if not device_info:
+            return "unregistered_device"
 
-        # 2. 갱신 정책 확인
         policy = self.renewal_policies.get(attribute_name, {})
 
-        # 2.1. 기기 상태 확인 - 비활성 기기는 갱신 불가
+        # 기기 상태 확인 - 비활성 기기는 갱신 불가
         if device_info.get("status") == "inactive":
             self.logger.info(f"기기 {device_id}는 비활성 상태로 갱신 거부")
-            return {"success": False, "reason": "inactive_device"}
+            return "inactive_device"
 
-        # 2.2. 허용 기기 리스트 확인 (명시적으로 허용된 기기만)
+        # 허용 기기 리스트 확인 (명시적으로 허용된 기기만)
         allowed_devices = policy.get("allowed_devices")
         if allowed_devices is not None and device_id not in allowed_devices:
-            return {"success": False, "reason": "device_not_allowed"}
+            return "device_not_allowed"
 
-        # 2.3. 갱신 횟수 제한 확인
+        # 갱신 횟수 제한 확인
         max_renewals = policy.get("max_renewals")
         current_renewals = device_info.get("renewal_count", {}).get(attribute_name, 0)
 
-        if max_renewals is not None and current_renewals >= max_renewals:
+        if max_renewals is not None and current_renewals + pending >= max_renewals:
             self.logger.info(
                 f"기기 {device_id}의 {attribute_name} 속성 최대 갱신 횟수 초과"
             )
-            return {"success": False, "reason": "max_renewals_reached"}
+            return "max_renewals_reached"
 
-        # 3. 갱신 승인 및 새 속성 발급
-        self.logger.info(f"갱신 승인: 기기 {device_id}의 {attribute_name} 속성")
+        return None
 
-        # 3.1. 갱신 기간 결정
+    def _renewal_expiry(self, attribute_name):
+        """구독 갱신 시 새 만료일 (다른 속성은 None)"""
+        if attribute_name != "subscription":
+            return None
+        policy = self.renewal_policies.get(attribute_name, {})
         renewal_days = policy.get("renewal_period_days", 30)  # 기본값 30일
+        return (self.clock.now() + timedelta(days=renewal_days)).strftime("%Y-%m-%d")
 
-        # 3.2. 새 만료일 계산
-        if attribute_name == "subscription":
-            now = datetime.now()
-            new_expiry = (now + timedelta(days=renewal_days)).strftime("%Y-%m-%d")
+    def _record_renewals(self, device_ids, attribute_name, new_expiry=None):
+        """갱신 횟수 증가 및 구독 만료일 갱신 (저장소에 일괄 반영)"""
+        self._secure_storage.record_renewals(
+            (self._create_device_hash(device_id), attribute_name, new_expiry)
+            for device_id in device_ids
+        )
+        if new_expiry is not None:
+            for device_id in device_ids:
+                self.expiry_index.set(self._create_device_hash(device_id), new_expiry)
 
-            # 기기 정보 최소한으로 업데이트
-            device_hash = self._create_device_hash(device_id)
-            if device_hash in self._secure_storage:
-                self._secure_storage[device_hash]["subscription_end"] = new_expiry
+    def _renewal_result(self, new_attr, new_expiry):
+        result = {"success": True, "attribute": new_attr}
+        if new_expiry is not None:
+            result["expiry_date"] = new_expiry
+        return result
 
-                # 갱신 횟수 증가
-                if "renewal_count" not in self._secure_storage[device_hash]:
-                    self._secure_storage[device_hash]["renewal_count"] = {}
+    def request_attribute_renewal(self, device_id, attribute_name):
+        """속성 갱신 요청 처리 - 갱신 조건 충족 여부에 따라 허용/거부"""
+        self.logger.info(
+            f"기기 {device_id}로부터 '{attribute_name}' 속성 갱신 요청 수신"
+        )
 
-                if (
-                    attribute_name
-                    not in self._secure_storage[device_hash]["renewal_count"]
-                ):
-                    self._secure_storage[device_hash]["renewal_count"][
-                        attribute_name
-                    ] = 0
+        # 1. 기기 정보 최소한으로 조회 및 갱신 정책 확인
+        device_info = self._get_minimal_device_info(device_id)
+        reason = self._check_renewal(device_id, attribute_name, device_info)
+        if reason is None and attribute_name not in self.cpabe.fading_functions:
+            reason = "not_dynamic_attribute"
+        if reason is None and not self._restore_user_record(device_info):
+            reason = "missing_key_record"
+        if reason is not None:
+            return {"success": False, "reason": reason}
+
+        # 2. 갱신 승인 및 새 속성 발급 (컴포넌트 발급 후 레코드 반영)
+        self.logger.info(f"갱신 승인: 기기 {device_id}의 {attribute_name} 속성")
+        new_attr = self.cpabe.update_attribute(device_info["user_id"], attribute_name)
+        new_expiry = self._renewal_expiry(attribute_name)
+        self._record_renewals([device_id], attribute_name, new_expiry)
 
-                self._secure_storage[device_hash]["renewal_count"][attribute_name] += 1
+        if new_expiry is not None:
+            self.logger.info(f"속성 갱신 완료. 새 만료일: {new_expiry}")
+        return self._renewal_result(new_attr, new_expiry)
+
+    def request_attribute_renewals(self, requests, workers=None, chunk_size=64):
+        """
+        속성 갱신 요청 일괄 처리 (에포크 경계의 갱신 폭주 대응)
+
+        배치 전체의 정책을 먼저 검사한 뒤 승인된 요청을 속성별로 묶어
+        새 에포크 값은 속성의 코호트당 한 번만 계산하고, 컴포넌트 생성은 작업자 프로세스에 분산합니다.
+
+        Args:
+            requests: (device_id, attribute_name) 쌍의 반복 가능 객체
+            workers: 작업자 프로세스 수 (기본값: CPU 수, 1 이하면 현재 프로세스에서 처리)
+            chunk_size: 작업자에 한 번에 넘길 요청 수
+
+        Returns:
+            요청 순서의 결과 리스트 - request_attribute_renewal과 같은 형식
+        """
+        requests = list(requests)
+        results = [None] * len(requests)
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        # 1. 배치 전체 정책 검사 (같은 배치 안의 중복 요청도 횟수 제한에 반영)
+        groups = {}
+        pending = {}
+        rejected = 0
+        for index, (device_id, attribute_name) in enumerate(requests):
+            device_info = self._get_minimal_device_info(device_id)
+            count_key = (device_id, attribute_name)
+            reason = self._check_renewal(
+                device_id, attribute_name, device_info, pending.get(count_key, 0)
+            )
+            if reason is None and attribute_name not in self.cpabe.fading_functions:
+                reason = "not_dynamic_attribute"
+            if reason is None and not self._restore_user_record(device_info):
+                reason = "missing_key_record"
+            if reason is not None:
+                results[index] = {"success": False, "reason": reason}
+                rejected += 1
+                continue
+            pending[count_key] = pending.get(count_key, 0) + 1
+            groups.setdefault(attribute_name, []).append(
+                (index, device_id, device_info["user_id"])
+            )
 
-            # 3.3. 속성 갱신
-            new_attr = self.cpabe.update_attribute(user_id, attribute_name)
+        # 2. 속성별 컴포넌트 생성 (병렬)
+        for attribute_name, entries in groups.items():
+            # 배치 전체가 같은 시각 기준의 에포크 값을 받도록 기준 시각 고정
+            current_time = self.clock.time()
+            user_ids = [user_id for _, _, user_id in entries]
+            updates = self._issue_updates(
+                attribute_name, current_time, user_ids, workers, chunk_size
+            )
 
-            self.logger.info(f"속성 갱신 완료. 새 만료일: {new_expiry}")
-            return {"success": True, "attribute": new_attr, "expiry_date": new_expiry}
-        else:
-            # 구독 외 다른 속성 갱신
-            new_attr = self.cpabe.update_attribute(user_id, attribute_name)
+            # 3. 레코드 일괄 갱신 및 결과 배치
+            new_expiry = self._renewal_expiry(attribute_name)
+            self._record_renewals(
+                [device_id for _, device_id, _ in entries], attribute_name, new_expiry
+            )
+            for (index, _, _), update in zip(entries, updates):
+                results[index] = self._renewal_result(update, new_expiry)
 
-            # 갱신 횟수 증가
-            device_hash = self._create_device_hash(device_id)
-            if device_hash in self._secure_storage:
-                if "renewal_count" not in self._secure_storage[device_hash]:
-                    self._secure_storage[device_hash]["renewal_count"] = {}
+        self.logger.info(
+            f"일괄 갱신 처리 완료: 요청 {len(requests)}건, "
+            f"승인 {len(requests) - rejected}건, 거부 {rejected}건"
+        )
+        return results
 
-                if (
-                    attribute_name
-                    not in self._secure_storage[device_hash]["renewal_count"]
-                ):
-                    self._secure_storage[device_hash]["renewal_count"][
-                        attribute_name
-                    ] = 0
+    def _issue_updates(self, attribute_name, current_time, user_ids, workers, chunk_size):
+        """갱신 컴포넌트 생성 - 작업자 프로세스로 청크 분산"""
+        if workers <= 1 or len(user_ids) <= chunk_size:
+            return self.cpabe.issue_attribute_updates(
+                attribute_name, user_ids, current_time=current_time
+            )
 
-                self._secure_storage[device_hash]["renewal_count"][attribute_name] += 1
+        group = self.cpabe.group
+        pool = self._get_worker_pool(workers)
+        futures = []
+        for start in range(0, len(user_ids), chunk_size):
+            entries = []
+            for user_id in user_ids[start : start + chunk_size]:
+                record = self.cpabe.user_records[user_id]
+                z = record.get("transform_blind")
+                entries.append(
+                    (
+                        user_id,
+                        serialize_header(group, record["random_value"]),
+                        group.serialize(z) if z is not None else None,
+                    )
+                )
+            futures.append(
+                pool.submit(
+                    _renewal_worker_batch, attribute_name, current_time, entries
+                )
+            )
 
-            return {"success": True, "attribute": new_attr}
+        updates = []
+        for future in futures:
+            updates.extend(
+                deserialize_header(group, data) for data in future.result()
+            )
+        return updates
+
+    def _get_worker_pool(self, workers):
+        """
+        일괄 등록/갱신 공용 작업자 풀 - 공개 파라미터/페이딩 설정이 바뀌면 다시 생성
+
+        마스터 키는 풀 생성 시 작업자 초기화로 한 번만 전달되므로
+        배치마다 호출해도 프로세스 시작/마스터 키 전송 비용이 반복되지 않습니다.
+        """
+        pool_key = (
+            self.cpabe.backend.name,
+            id(self.cpabe.pk),
+            workers,
+            _fading_fingerprint(self.cpabe.fading_functions),
+        )
+        if self._worker_pool is None or self._worker_pool_key != pool_key:
+            self.shutdown()
+            group = self.cpabe.group
+            self._worker_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_keygen_worker,
+                initargs=(
+                    serialize_header(group, self.cpabe.pk),
+                    serialize_header(group, self.cpabe.mk),
+                    _detach_fading_functions(self.cpabe.fading_functions),
+                    self.cpabe.precompute,
+                    self.cpabe.backend.name,
+                ),
+            )
+            self._worker_pool_key = pool_key
+        return self._worker_pool
+
+    def shutdown(self):
+        """작업자 프로세스 풀 종료"""
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+            self._worker_pool = None
+            self._worker_pool_key = None
+
+    def issue_transform_key(self, device_id, key):
+        """
+        외주 복호화용 변환 키 발급 - 블라인딩 값 z를 저장소에 보관
+
+        이후 갱신 컴포넌트에도 같은 z가 적용되므로 재시작 후에도 변환 키 갱신이 유지됩니다.
+
+        Returns:
+            (변환 키, 복원 키 z) 튜플
+        """
+        tkey, z = self.cpabe.issue_transform_key(key)
+        self._secure_storage.update(
+            self._create_device_hash(device_id),
+            {"transform_blind": self._serialize_secret(z)},
+        )
+        return tkey, z
+
+    @staticmethod
+    def _public_info(record):
+        """민감 정보(사용자 ID, 키 난수, 블라인딩 값)를 제외한 기기 정보"""
+        info = dict(record)
+        for field in _PRIVATE_FIELDS:
+            info.pop(field, None)
+        return info
 
     def get_device_info(self, device_id):
         """기기 정보 조회 - 최소 필요 정보만 반환"""
-        device_hash = self._create_device_hash(device_id)
-        if device_hash in self._secure_storage:
-            # 민감 정보 제외하고 반환
-            info = dict(self._secure_storage[device_hash])
-            if "user_id" in info:
-                del info["user_id"]  # 사용자 ID는 민감 정보이므로 제외
-            return info
+        record = self._get_minimal_device_info(device_id)
+        if record is not None:
+            return self._public_info(record)
         return None
 
+    def get_expiring_devices(self, days=7):
+        """
+        구독 만료가 임박한 기기 조회 (오늘부터 days일 이내)
+
+        Returns:
+            (device_hash, 기기 정보) 리스트 - 사용자 ID 제외
+        """
+        today = self.clock.now()
+        start_date = today.strftime("%Y-%m-%d")
+        end_date = (today + timedelta(days=days)).strftime("%Y-%m-%d")
+        devices = []
+        for device_hash, record in self._secure_storage.expiring_between(
+            start_date, end_date
+        ):
+            devices.append((device_hash, self._public_info(record)))
+        return devices
+
     def set_device_inactive(self, device_id, reason=None):
         """기기 비활성화 - 취소 대신 상태만 변경"""
         device_hash = self._create_device_hash(device_id)
@@ -209,16 +664,18 @@ class KeyAuthority:
             self.logger.warning(f"오류: 등록되지 않은 기기 {device_id}")
             return False
 
-        # 상태 정보 업데이트
-        self.device_status[device_id] = "inactive"
+        # 상태 정보 업데이트 (비활성 기기는 만료 알림/사전 갱신 대상에서 제외)
+        self.expiry_index.remove(device_hash)
 
         # 최소 정보만 업데이트
-        if device_hash in self._secure_storage:
-            self._secure_storage[device_hash]["status"] = "inactive"
-            self._secure_storage[device_hash]["inactive_reason"] = reason
-            self._secure_storage[device_hash][
-                "inactive_date"
-            ] = datetime.now().isoformat()
+        self._secure_storage.update(
+            device_hash,
+            {
+                "status": "inactive",
+                "inactive_reason": reason,
+                "inactive_date": self.clock.now().isoformat(),
+            },
+        )
 
         self.logger.info(f"기기 {device_id}가 비활성화됨. 사유: {reason}")
         self.logger.info(
@@ -0,0 +1,240 @@
+"""
+온라인/오프라인 암호화용 중간 암호문 풀 (Hohenberger-Waters 방식 응용)
+
+유휴 시간에 백그라운드 작업자가 정책과 무관한 중간 암호문 재료를 미리 계산합니다.
+- 세션 항목: (s, e(g,g)^(alpha*s), h^s)
+- 리프 항목: (lambda', g^lambda', H(attr)^lambda') - 속성별 큐
+
+온라인 단계는 share 계산과 delta = lambda - lambda' 같은 필드 연산만 수행하고,
+delta는 암호문 'Cy_delta'에 담겨 복호화 시 사용된 리프에서만 보정됩니다.
+BSW07의 Cyp = H(attr)^lambda는 속성에 묶여 있으므로 리프 항목은 정책 구조와는
+무관하지만 속성별로 관리하며, 온라인에서 사용된 속성을 자동으로 추적해 채웁니다.
+"""
+
+import time
+import threading
+from collections import OrderedDict, deque
+
+from charm.toolbox.pairinggroup import ZR, G2
+
+
+class OfflinePool:
+    """
+    크기 제한 중간 암호문 풀
+
+    - session_capacity: 세션 항목 최대 개수
+    - leaf_capacity: 속성별 리프 항목 최대 개수
+    - max_attributes: 추적할 속성 최대 개수 (오래 쓰이지 않은 속성부터 제외)
+    """
+
+    def __init__(
+        self,
+        group,
+        pk,
+        session_capacity=32,
+        leaf_capacity=64,
+        max_attributes=64,
+        attributes=None,
+    ):
+        self.group = group
+        self.pk = pk
+        self.session_capacity = session_capacity
+        self.leaf_capacity = leaf_capacity
+        self.max_attributes = max_attributes
+
+        self._sessions = deque()
+        self._leaves = OrderedDict()  # 속성 -> deque
+        self._hashed = {}  # 속성 -> H(attr) (고정 기저 테이블 구축)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._worker = None
+        self._stopping = False
+
+        # 메트릭
+        self.session_hits = 0
+        self.session_misses = 0
+        self.leaf_hits = 0
+        self.leaf_misses = 0
+        self.produced = 0
+        self.produce_time = 0.0
+        self._produced_log = deque(maxlen=256)  # 최근 생산 시각
+
+        for attr in attributes or []:
+            self.track_attribute(attr)
+
+    # ------------------------------------------------------------------
+    # 오프라인 단계
+    # ------------------------------------------------------------------
+
+    def track_attribute(self, attr):
+        """리프 항목을 채울 속성 등록"""
+        with self._lock:
+            self._track_locked(attr)
+
+    def _track_locked(self, attr):
+        if attr in self._leaves:
+            self._leaves.move_to_end(attr)
+            return
+        self._leaves[attr] = deque()
+        if len(self._leaves) > self.max_attributes:
+            dropped, _ = self._leaves.popitem(last=False)
+            self._hashed.pop(dropped, None)
+        self._wakeup.notify()
+
+    def _hashed_attribute(self, attr):
+        base = self._hashed.get(attr)
+        if base is None:
+            base = self.group.hash(attr, G2)
+            try:
+                base.initPP()
+            except ValueError:
+                pass
+            self._hashed[attr] = base
+        return base
+
+    def _make_session(self):
+        s = self.group.random(ZR)
+        return (s, self.pk["e_gg_alpha"] ** s, self.pk["h"] ** s)
+
+    def _make_leaf(self, attr):
+        lam = self.group.random(ZR)
+        return (lam, self.pk["g"] ** lam, self._hashed_attribute(attr) ** lam)
+
+    def _next_target(self):
+        """가장 부족한 큐 선택 (세션 우선) - 모두 가득 차면 None"""
+        if len(self._sessions) < self.session_capacity:
+            return ("session", None)
+        target, lowest = None, self.leaf_capacity
+        for attr, queue in self._leaves.items():
+            if len(queue) < lowest:
+                target, lowest = attr, len(queue)
+        return None if target is None else ("leaf", target)
+
+    def refill_one(self):
+        """
+        항목 하나 생성
+
+        Returns:
+            생성 여부 (모든 큐가 가득 차 있으면 False)
+        """
+        with self._lock:
+            target = self._next_target()
+            if target is not None and target[0] == "leaf":
+                # 해시/테이블 구축은 잠금 안에서 한 번만 수행
+                self._hashed_attribute(target[1])
+        if target is None:
+            return False
+
+        start = time.perf_counter()
+        kind, attr = target
+        item = self._make_session() if kind == "session" else self._make_leaf(attr)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            if kind == "session":
+                self._sessions.append(item)
+            elif attr in self._leaves:
+                self._leaves[attr].append(item)
+            self.produced += 1
+            self.produce_time += elapsed
+            self._produced_log.append(time.monotonic())
+        return True
+
+    def fill(self, max_items=None):
+        """풀을 동기적으로 채움 (유휴 시간 호출용) - 생성한 항목 수 반환"""
+        count = 0
+        while max_items is None or count < max_items:
+            if not self.refill_one():
+                break
+            count += 1
+        return count
+
+    def start(self):
+        """백그라운드 채움 작업자 시작"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopping = False
+            self._worker = threading.Thread(
+                target=self._run, name="cpabe-offline-pool", daemon=True
+            )
+            self._worker.start()
+
+    def stop(self, timeout=5.0):
+        """백그라운드 작업자 중지"""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        self._worker = None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+            if not self.refill_one():
+                with self._lock:
+                    if self._stopping:
+                        return
+                    # 항목이 소비되거나 속성이 추가될 때까지 대기
+                    self._wakeup.wait(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # 온라인 단계
+    # ------------------------------------------------------------------
+
+    def take_session(self):
+        """세션 항목 꺼내기 - 비어 있으면 None"""
+        with self._lock:
+            if self._sessions:
+                self.session_hits += 1
+                self._wakeup.notify()
+                return self._sessions.popleft()
+            self.session_misses += 1
+            return None
+
+    def take_leaf(self, attr):
+        """속성의 리프 항목 꺼내기 - 비어 있으면 None (속성은 추적 대상에 추가)"""
+        with self._lock:
+            queue = self._leaves.get(attr)
+            if queue:
+                self._leaves.move_to_end(attr)
+                self.leaf_hits += 1
+                self._wakeup.notify()
+                return queue.popleft()
+            self.leaf_misses += 1
+            self._track_locked(attr)
+            return None
+
+    # ------------------------------------------------------------------
+    # 메트릭
+    # ------------------------------------------------------------------
+
+    def metrics(self):
+        """풀 깊이, 용량, 채움 속도, 적중/실패 통계"""
+        with self._lock:
+            now = time.monotonic()
+            recent = [t for t in self._produced_log if now - t <= 10.0]
+            leaf_depth = {attr: len(queue) for attr, queue in self._leaves.items()}
+            return {
+                "session_depth": len(self._sessions),
+                "session_capacity": self.session_capacity,
+                "leaf_depth": leaf_depth,
+                "leaf_capacity": self.leaf_capacity,
+                "tracked_attributes": len(self._leaves),
+                "produced": self.produced,
+                # 최근 10초 동안 초당 생성 항목 수
+                "refill_rate": len(recent) / 10.0,
+                # 항목 하나 생성에 드는 평균 시간
+                "avg_produce_time": self.produce_time / self.produced
+                if self.produced
+                else 0.0,
+                "session_hits": self.session_hits,
+                "session_misses": self.session_misses,
+                "leaf_hits": self.leaf_hits,
+                "leaf_misses": self.leaf_misses,
+                "worker_running": self._worker is not None and self._worker.is_alive(),
+            }
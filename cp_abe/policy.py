@@ -0,0 +1,666 @@
+"""
+접근 정책 컴파일러
+
+정책 문자열을 AND/OR/괄호/k-of-n 임계값을 지원하는 AST로 파싱하고,
+정규화한 뒤 charm의 이진 정책 트리(BinNode)와 share 배치로 한 번만 컴파일합니다.
+컴파일 결과는 정책 원문을 키로 하는 LRU 캐시에 보관됩니다.
+
+문법:
+    expr      := and_expr ("or" and_expr)*
+    and_expr  := atom ("and" atom)*
+    atom      := "(" expr ")" | threshold | ATTRIBUTE
+    threshold := INTEGER "of" "(" expr ("," expr)* ")"
+"""
+
+import re
+import hashlib
+
+from charm.toolbox.node import BinNode, OpType
+from charm.toolbox.policytree import PolicyParser
+
+from .cache import LRUCache
+
+_TOKEN_RE = re.compile(r"\s*(?:(?P<punct>[(),])|(?P<word>[^\s(),]+))")
+_KEYWORDS = {"and", "or", "of"}
+
+# k-of-n 전개 후 허용하는 최대 리프 수 (전개 크기는 k, n에 대해 조합적으로 증가)
+MAX_EXPANDED_LEAVES = 1024
+
+
+class AttributeLeaf:
+    """정책 AST 리프 - 단일 속성"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def satisfied_by(self, attributes):
+        return self.name in attributes
+
+    def leaf_names(self):
+        return [self.name]
+
+    def __eq__(self, other):
+        return isinstance(other, AttributeLeaf) and other.name == self.name
+
+    def __hash__(self):
+        return hash(("attr", self.name))
+
+    def __str__(self):
+        return self.name
+
+    __repr__ = __str__
+
+
+class ThresholdGate:
+    """
+    정책 AST 내부 노드 - k-of-n 임계값 게이트
+
+    AND는 n-of-n, OR는 1-of-n으로 표현합니다.
+    """
+
+    __slots__ = ("k", "children")
+
+    def __init__(self, k, children):
+        self.k = k
+        self.children = tuple(children)
+
+    @property
+    def is_and(self):
+        return self.k == len(self.children)
+
+    @property
+    def is_or(self):
+        return self.k == 1
+
+    def satisfied_by(self, attributes):
+        count = 0
+        for child in self.children:
+            if child.satisfied_by(attributes):
+                count += 1
+                if count >= self.k:
+                    return True
+        return False
+
+    def leaf_names(self):
+        names = []
+        for child in self.children:
+            names.extend(child.leaf_names())
+        return names
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ThresholdGate)
+            and other.k == self.k
+            and other.children == self.children
+        )
+
+    def __hash__(self):
+        return hash(("gate", self.k, self.children))
+
+    def __str__(self):
+        inner = [str(child) for child in self.children]
+        if self.is_and:
+            return "(" + " and ".join(inner) + ")"
+        if self.is_or:
+            return "(" + " or ".join(inner) + ")"
+        return f"{self.k} of (" + ", ".join(inner) + ")"
+
+    __repr__ = __str__
+
+
+class PolicySyntaxError(ValueError):
+    """정책 구문 오류"""
+
+
+class _Parser:
+    """재귀 하강 파서"""
+
+    def __init__(self, text, sanitizer):
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+        self.sanitizer = sanitizer
+
+    @staticmethod
+    def _tokenize(text):
+        tokens = []
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            match = _TOKEN_RE.match(text, pos)
+            if not match or match.end() == pos:
+                raise PolicySyntaxError(f"정책 구문 오류: 위치 {pos}의 문자를 해석할 수 없음")
+            tokens.append(match.group("punct") or match.group("word"))
+            pos = match.end()
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise PolicySyntaxError("정책 구문 오류: 정책이 예기치 않게 끝났습니다")
+        self.pos += 1
+        return token
+
+    def _expect(self, expected):
+        token = self._next()
+        if token.lower() != expected:
+            raise PolicySyntaxError(
+                f"정책 구문 오류: '{expected}' 필요, '{token}' 발견"
+            )
+
+    def parse(self):
+        if not self.tokens:
+            raise PolicySyntaxError("정책 구문 오류: 빈 정책")
+        node = self._expr()
+        if self._peek() is not None:
+            raise PolicySyntaxError(f"정책 구문 오류: 예상치 못한 토큰 '{self._peek()}'")
+        return node
+
+    def _expr(self):
+        children = [self._and_expr()]
+        while self._peek() is not None and self._peek().lower() == "or":
+            self._next()
+            children.append(self._and_expr())
+        return children[0] if len(children) == 1 else ThresholdGate(1, children)
+
+    def _and_expr(self):
+        children = [self._atom()]
+        while self._peek() is not None and self._peek().lower() == "and":
+            self._next()
+            children.append(self._atom())
+        if len(children) == 1:
+            return children[0]
+        return ThresholdGate(len(children), children)
+
+    def _atom(self):
+        token = self._next()
+        if token == "(":
+            node = self._expr()
+            self._expect(")")
+            return node
+        if token in (")", ","):
+            raise PolicySyntaxError(f"정책 구문 오류: 예상치 못한 토큰 '{token}'")
+
+        # k of (a, b, c)
+        following = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        if token.isdigit() and following is not None and following.lower() == "of":
+            self._next()
+            return self._threshold(int(token))
+
+        if token.lower() in _KEYWORDS:
+            raise PolicySyntaxError(f"정책 구문 오류: 속성 위치에 연산자 '{token}'")
+
+        name = self.sanitizer(token) if self.sanitizer else token
+        if not name:
+            raise PolicySyntaxError(f"정책 구문 오류: 유효하지 않은 속성 '{token}'")
+        return AttributeLeaf(name)
+
+    def _threshold(self, k):
+        self._expect("(")
+        children = [self._expr()]
+        while self._peek() == ",":
+            self._next()
+            children.append(self._expr())
+        self._expect(")")
+        if not 1 <= k <= len(children):
+            raise PolicySyntaxError(
+                f"정책 구문 오류: 임계값 {k}가 자식 수 {len(children)} 범위를 벗어남"
+            )
+        return ThresholdGate(k, children)
+
+
+def normalize(node):
+    """
+    AST 정규화
+
+    - 같은 종류의 중첩 AND/OR 평탄화
+    - AND/OR 자식의 중복 제거 (멱등)
+    - 자식이 하나인 게이트 제거
+    """
+    if isinstance(node, AttributeLeaf):
+        return node
+
+    children = [normalize(child) for child in node.children]
+    k = node.k
+    n = len(children)
+
+    if k == n or k == 1:
+        kind_is_and = k == n and n > 1
+        flat = []
+        for child in children:
+            if isinstance(child, ThresholdGate) and len(child.children) > 1 and (
+                (kind_is_and and child.is_and) or (not kind_is_and and child.is_or)
+            ):
+                flat.extend(child.children)
+            else:
+                flat.append(child)
+        deduped = []
+        for child in flat:
+            if child not in deduped:
+                deduped.append(child)
+        if len(deduped) == 1:
+            return deduped[0]
+        return ThresholdGate(len(deduped) if kind_is_and else 1, deduped)
+
+    return ThresholdGate(k, children)
+
+
+def _to_binary(node):
+    """
+    AST를 charm이 지원하는 이진 AND/OR 트리로 변환
+
+    k-of-n 게이트는 T(k, [c1..cn]) = (c1 and T(k-1, rest)) or T(k, rest)로 전개합니다.
+    """
+    if isinstance(node, AttributeLeaf):
+        return node
+
+    children = [_to_binary(child) for child in node.children]
+    return _expand(node.k, children)
+
+
+def expanded_leaf_count(node):
+    """
+    이진 트리로 전개했을 때의 리프 수 - 트리를 만들지 않고 계산
+
+    _expand와 같은 점화식 L(k, i) = c_i + L(k-1, i+1) + L(k, i+1)을 메모이제이션으로 평가합니다.
+    """
+    if isinstance(node, AttributeLeaf):
+        return 1
+
+    counts = [expanded_leaf_count(child) for child in node.children]
+    n = len(counts)
+    memo = {}
+
+    def count(k, start):
+        remaining = n - start
+        if remaining == 1:
+            return counts[start]
+        if k == remaining or k == 1:
+            return sum(counts[start:])
+        if (k, start) not in memo:
+            memo[(k, start)] = (
+                counts[start] + count(k - 1, start + 1) + count(k, start + 1)
+            )
+        return memo[(k, start)]
+
+    return count(node.k, 0)
+
+
+def _expand(k, children):
+    n = len(children)
+    if n == 1:
+        return children[0]
+    if k == n:
+        return _chain("and", children)
+    if k == 1:
+        return _chain("or", children)
+    first, rest = children[0], children[1:]
+    with_first = ("and", first, _expand(k - 1, rest))
+    without_first = _expand(k, rest)
+    return ("or", with_first, without_first)
+
+
+def _chain(op, children):
+    """n개 자식을 오른쪽으로 중첩된 이진 게이트로 연결"""
+    node = children[-1]
+    for child in reversed(children[:-1]):
+        node = (op, child, node)
+    return node
+
+
+def _binary_to_string(node):
+    if isinstance(node, AttributeLeaf):
+        return node.name
+    op, left, right = node
+    return f"({_binary_to_string(left)} {op} {_binary_to_string(right)})"
+
+
+def _binary_to_charm(node):
+    if isinstance(node, AttributeLeaf):
+        return BinNode(node.name)
+    op, left, right = node
+    gate = BinNode(OpType.AND if op == "and" else OpType.OR)
+    gate.addSubNode(_binary_to_charm(left), _binary_to_charm(right))
+    return gate
+
+
+def _label_duplicates(tree):
+    """charm SecretUtil.createPolicy와 동일한 중복 속성 색인 부여"""
+    parser = PolicyParser()
+    counts, labels = {}, {}
+    parser.findDuplicates(tree, counts)
+    for attr, count in counts.items():
+        if count > 1:
+            labels[attr] = 0
+    parser.labelDuplicates(tree, labels)
+    return tree
+
+
+def _collect_leaves(tree, leaves):
+    """좌→우 순서로 (share 라벨, 속성) 수집"""
+    if tree is None:
+        return
+    if tree.getNodeType() == OpType.ATTR:
+        leaves.append((tree.getAttributeAndIndex(), tree.getAttribute()))
+        return
+    _collect_leaves(tree.getLeft(), leaves)
+    _collect_leaves(tree.getRight(), leaves)
+
+
+class CompiledPolicy:
+    """
+    컴파일된 정책
+
+    - ast: 정규화된 정책 AST
+    - policy_str: 암호문에 기록되는 charm 정책 문자열
+    - tree: share 계산에 사용하는 charm BinNode 트리
+    - leaves: share 배치 [(라벨, 속성), ...]
+    - attributes: 암호문 'attributes' 필드 (라벨 목록)
+    """
+
+    __slots__ = ("source", "ast", "policy_str", "tree", "leaves", "attributes", "fingerprint")
+
+    def __init__(self, source, ast):
+        self.source = source
+        self.ast = ast
+
+        leaf_count = expanded_leaf_count(ast)
+        if leaf_count > MAX_EXPANDED_LEAVES:
+            raise PolicySyntaxError(
+                f"정책 구문 오류: 임계값 전개 후 리프 {leaf_count}개가 "
+                f"최대 {MAX_EXPANDED_LEAVES}개를 초과"
+            )
+
+        binary = _to_binary(ast)
+        self.policy_str = _binary_to_string(binary)
+        self.tree = _label_duplicates(_binary_to_charm(binary))
+
+        self.leaves = []
+        _collect_leaves(self.tree, self.leaves)
+        self.attributes = [label for label, _ in self.leaves]
+        self.fingerprint = hashlib.sha256(self.policy_str.encode("utf-8")).hexdigest()[:16]
+
+    def satisfied_by(self, attributes):
+        """속성 집합이 정책을 만족하는지 (그룹 연산 없음)"""
+        return self.ast.satisfied_by(set(attributes))
+
+    def __repr__(self):
+        return f"CompiledPolicy({self.policy_str!r})"
+
+
+class PolicyCompiler:
+    """
+    정책 컴파일러 - 정책 원문을 키로 하는 LRU 캐시 포함
+
+    같은 정책으로 반복 암호화하면 파싱/트리 구축을 모두 건너뜁니다.
+    """
+
+    def __init__(self, sanitizer=None, cache_size=64):
+        self.sanitizer = sanitizer
+        self.cache = LRUCache(cache_size)
+
+    def parse(self, text):
+        """정책 문자열을 정규화된 AST로 파싱"""
+        return normalize(_Parser(text, self.sanitizer).parse())
+
+    def compile(self, policy):
+        """
+        정책 컴파일 (캐시 사용)
+
+        Args:
+            policy: 정책 문자열, 또는 AND로 연결할 속성 리스트
+        """
+        cache_key = tuple(policy) if isinstance(policy, list) else policy
+        compiled = self.cache.get(cache_key)
+        if compiled is not None:
+            return compiled
+
+        if isinstance(policy, list):
+            if not policy:
+                raise PolicySyntaxError("정책 구문 오류: 빈 정책")
+            leaves = []
+            for attr in policy:
+                name = self.sanitizer(attr) if self.sanitizer else str(attr)
+                if not name:
+                    raise PolicySyntaxError(f"정책 구문 오류: 유효하지 않은 속성 '{attr}'")
+                leaves.append(AttributeLeaf(name))
+            ast = normalize(ThresholdGate(len(leaves), leaves))
+        else:
+            ast = self.parse(str(policy))
+
+        compiled = CompiledPolicy(policy, ast)
+        self.cache.put(cache_key, compiled)
+        return compiled
+
+
+# ---------------------------------------------------------------------------
+# charm 이진 정책 문자열 / 만족 여부 사전 검사
+# ---------------------------------------------------------------------------
+
+_BINARY_TOKEN_RE = re.compile(r"\s*(?:(?P<punct>[()])|(?P<word>[^\s()]+))")
+
+
+def parse_binary_policy(policy_str):
+    """
+    암호문에 기록된 charm 이진 정책 문자열 "(A and (B or C))"를 이진 트리로 파싱
+
+    정규화하지 않으므로 트리 구조와 리프 순서가 암호문의 share 배치와 그대로 일치합니다.
+    """
+    tokens = [
+        match.group("punct") or match.group("word")
+        for match in _BINARY_TOKEN_RE.finditer(policy_str)
+    ]
+    pos = 0
+
+    def node():
+        nonlocal pos
+        if pos >= len(tokens):
+            raise PolicySyntaxError(f"정책 구문 오류: 이진 정책을 해석할 수 없음: {policy_str}")
+        token = tokens[pos]
+        pos += 1
+        if token != "(":
+            return AttributeLeaf(token)
+        left = node()
+        op = tokens[pos].lower() if pos < len(tokens) else None
+        pos += 1
+        right = node()
+        if op not in ("and", "or") or pos >= len(tokens) or tokens[pos] != ")":
+            raise PolicySyntaxError(f"정책 구문 오류: 이진 정책을 해석할 수 없음: {policy_str}")
+        pos += 1
+        return (op, left, right)
+
+    tree = node()
+    if pos != len(tokens):
+        raise PolicySyntaxError(f"정책 구문 오류: 이진 정책을 해석할 수 없음: {policy_str}")
+    return tree
+
+
+def binary_policy_leaves(binary):
+    """이진 트리의 share 배치 [(라벨, 속성), ...] - 암호문 Cy 키 순서"""
+    leaves = []
+    _collect_leaves(_label_duplicates(_binary_to_charm(binary)), leaves)
+    return leaves
+
+
+class AttributeInterner:
+    """속성 이름 -> 비트 색인 (정책과 키가 같은 색인 공간을 공유)"""
+
+    def __init__(self):
+        self._ids = {}
+
+    def bit(self, name):
+        """속성의 비트 (처음 보는 속성은 새 색인 부여)"""
+        index = self._ids.get(name)
+        if index is None:
+            index = self._ids[name] = len(self._ids)
+        return 1 << index
+
+    def mask(self, attributes):
+        """속성 집합의 비트셋 - 어떤 정책에도 없는 속성은 무시"""
+        ids = self._ids
+        mask = 0
+        for name in attributes:
+            index = ids.get(name)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class SatisfiabilityFilter:
+    """
+    정책 만족 여부 사전 검사 - 그룹 연산 전에 정수 비트셋으로 평가
+
+    이진 정책 트리를 한 번 컴파일하면서 AND만으로 이루어진 부분 트리는
+    (키 & 마스크) == 마스크, OR만으로 이루어진 부분 트리는 (키 & 마스크) != 0
+    비트 연산 한 번으로 접습니다.
+    """
+
+    __slots__ = ("policy_str", "fingerprint", "leaves", "_root")
+
+    # 노드 종류
+    _LEAF, _ALL, _ANY, _AND, _OR = range(5)
+
+    def __init__(self, policy_str, interner):
+        self.policy_str = policy_str
+        self.fingerprint = hashlib.sha256(policy_str.encode("utf-8")).hexdigest()[:16]
+        binary = parse_binary_policy(policy_str)
+        self.leaves = binary_policy_leaves(binary)
+        self._root = self._compile(binary, iter(range(len(self.leaves))), interner)
+
+    def _compile(self, node, positions, interner):
+        """
+        노드 -> (종류, 마스크, 자식/리프 정보)
+
+        _ALL/_ANY 노드는 [(비트, 리프 위치), ...]를 좌→우 순서로 보관합니다.
+        """
+        if isinstance(node, AttributeLeaf):
+            bit = interner.bit(node.name)
+            return (self._LEAF, bit, [(bit, next(positions))])
+
+        op, left, right = node
+        left = self._compile(left, positions, interner)
+        right = self._compile(right, positions, interner)
+        flat = self._ALL if op == "and" else self._ANY
+        if left[0] in (self._LEAF, flat) and right[0] in (self._LEAF, flat):
+            return (flat, left[1] | right[1], left[2] + right[2])
+        return (self._AND if op == "and" else self._OR, 0, (left, right))
+
+    def _satisfied(self, node, mask):
+        kind = node[0]
+        if kind == self._LEAF or kind == self._ALL:
+            return mask & node[1] == node[1]
+        if kind == self._ANY:
+            return mask & node[1] != 0
+        left, right = node[2]
+        if kind == self._AND:
+            return self._satisfied(left, mask) and self._satisfied(right, mask)
+        return self._satisfied(left, mask) or self._satisfied(right, mask)
+
+    def _select(self, node, mask, selected):
+        """만족하는 리프 위치를 selected에 추가 (OR는 왼쪽 우선 - charm prune과 동일)"""
+        kind = node[0]
+        if kind == self._LEAF or kind == self._ALL:
+            selected.extend(position for _, position in node[2])
+        elif kind == self._ANY:
+            for bit, position in node[2]:
+                if mask & bit:
+                    selected.append(position)
+                    return
+        elif kind == self._AND:
+            self._select(node[2][0], mask, selected)
+            self._select(node[2][1], mask, selected)
+        else:
+            left, right = node[2]
+            self._select(left if self._satisfied(left, mask) else right, mask, selected)
+
+    def satisfied_by(self, mask):
+        """속성 비트셋이 정책을 만족하는지"""
+        return self._satisfied(self._root, mask)
+
+    def satisfying_leaves(self, mask):
+        """
+        만족하는 리프 부분집합 [(라벨, 속성), ...] (불만족이면 None)
+        """
+        if not self._satisfied(self._root, mask):
+            return None
+        selected = []
+        self._select(self._root, mask, selected)
+        return [self.leaves[position] for position in selected]
+
+    def _cheapest(self, node, mask):
+        """
+        리프 수가 가장 적은 만족 부분집합의 리프 위치 (불만족이면 None)
+
+        AND는 양쪽 합, OR는 작은 쪽 (같으면 왼쪽)을 고릅니다.
+        """
+        kind = node[0]
+        if kind == self._LEAF or kind == self._ALL:
+            if mask & node[1] != node[1]:
+                return None
+            return [position for _, position in node[2]]
+        if kind == self._ANY:
+            for bit, position in node[2]:
+                if mask & bit:
+                    return [position]
+            return None
+
+        left = self._cheapest(node[2][0], mask)
+        if kind == self._AND:
+            if left is None:
+                return None
+            right = self._cheapest(node[2][1], mask)
+            return None if right is None else left + right
+        right = self._cheapest(node[2][1], mask)
+        if left is None or (right is not None and len(right) < len(left)):
+            return right
+        return left
+
+    def plan(self, mask):
+        """
+        최소 페어링 복호화 계획 (불만족이면 None)
+
+        charm prune 방식(OR 왼쪽 우선) 선택과 비교해 절약한 페어링 수를 함께 기록합니다.
+        """
+        positions = self._cheapest(self._root, mask)
+        if positions is None:
+            return None
+        selected = []
+        self._select(self._root, mask, selected)
+        return DecryptionPlan(
+            self.fingerprint,
+            [self.leaves[position] for position in positions],
+            len(selected),
+        )
+
+
+class DecryptionPlan:
+    """
+    복호화 계획 - 사용할 리프와 페어링 수
+
+    - leaves: 복호화에 사용할 리프 [(라벨, 속성), ...]
+    - pairings: 필요한 페어링 수 (리프당 2회 + e(C, D) 1회)
+    - pairings_saved: charm prune 선택 대비 절약한 페어링 수
+    - path: 첫 복호화 때 채우는 [(라벨, 속성, 라그랑주 계수), ...]
+    """
+
+    __slots__ = ("fingerprint", "leaves", "pairings", "pairings_saved", "path")
+
+    def __init__(self, fingerprint, leaves, pruned_leaf_count):
+        self.fingerprint = fingerprint
+        self.leaves = leaves
+        self.pairings = 2 * len(leaves) + 1
+        self.pairings_saved = 2 * (pruned_leaf_count - len(leaves))
+        self.path = None
+
+    def __repr__(self):
+        return (
+            f"DecryptionPlan({self.fingerprint}, leaves={len(self.leaves)}, "
+            f"pairings={self.pairings}, saved={self.pairings_saved})"
+        )
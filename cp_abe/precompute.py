@@ -0,0 +1,132 @@
+"""
+고정 기저 사전 계산 테이블
+
+BSW07 암호화/키 생성은 같은 기저(g, g2, h, e(g,g)^alpha)와
+반복 등장하는 속성 해시 H(attr)를 매번 거듭제곱합니다.
+charm의 initPP()로 고정 기저 윈도우 테이블을 한 번만 만들어 재사용합니다.
+기기 키 컴포넌트도 같은 방식으로 사전 처리할 수 있습니다 (PreparedKey).
+"""
+
+from charm.toolbox.pairinggroup import G2
+
+from .cache import LRUCache
+
+
+def init_table(element):
+    """고정 기저 테이블 구축 - 새로 구축했으면 True (이미 구축된 요소는 건너뜀)"""
+    if getattr(element, "preproc", 0):
+        return False
+    try:
+        return bool(element.initPP())
+    except ValueError:
+        # charm setup()에서 이미 구축된 기저(g, g2)
+        return False
+
+
+class PrecomputedTables:
+    """
+    공개 파라미터와 해시된 속성 점에 대한 고정 기저 테이블 관리
+
+    - 공개 파라미터 기저는 생성 시 한 번 테이블을 구축
+    - 속성 해시 점은 LRU에 보관하고, pp_threshold회 이상 사용된 점만 테이블 구축
+      (테이블 구축 비용이 거듭제곱 몇 회 분량이므로 일회성 속성에는 만들지 않음)
+    """
+
+    FIXED_BASES = ("g", "g2", "h", "e_gg_alpha")
+
+    def __init__(self, group, pk, hash_cache_size=256, pp_threshold=2, enabled=True):
+        self.group = group
+        self.pk = pk
+        self.enabled = enabled
+        self.pp_threshold = pp_threshold
+        self._hashed = LRUCache(hash_cache_size)
+        self.tables_built = 0
+
+        if enabled:
+            for name in self.FIXED_BASES:
+                if name in pk:
+                    self._init_table(pk[name])
+
+    def _init_table(self, element):
+        """고정 기저 테이블 구축 (이미 구축된 요소는 건너뜀)"""
+        if init_table(element):
+            self.tables_built += 1
+
+    def pow(self, name, exponent):
+        """공개 파라미터 기저 거듭제곱"""
+        return self.pk[name] ** exponent
+
+    def hashed_attribute(self, attr):
+        """H(attr) in G2 - LRU 캐시 사용"""
+        if not self.enabled:
+            return self.group.hash(attr, G2)
+
+        entry = self._hashed.get(attr)
+        if entry is None:
+            entry = [self.group.hash(attr, G2), 0]
+            self._hashed.put(attr, entry)
+
+        entry[1] += 1
+        if entry[1] == self.pp_threshold:
+            self._init_table(entry[0])
+        return entry[0]
+
+    def pow_hashed(self, attr, exponent):
+        """H(attr)^exponent"""
+        return self.hashed_attribute(attr) ** exponent
+
+    def stats(self):
+        """사전 계산 통계"""
+        return {
+            "enabled": self.enabled,
+            "tables_built": self.tables_built,
+            "hashed_attributes": self._hashed.stats(),
+        }
+
+
+class PreparedKey(dict):
+    """
+    사전 처리된 기기/변환 키 - 키 딕셔너리 내용을 그대로 담아 키 대신 사용
+
+    - 속성 컴포넌트 Dj, Dj'에 고정 기저 테이블을 한 번 구축
+    - 곱 페어링 복호화에서 라그랑주 계수 λ를 키 쪽에 접은 (Dj^-λ, Dj'^λ)를
+      정책별로 캐시하여 같은 정책의 반복 복호화는 곱 페어링만 수행
+
+    merge_attribute_to_key로 갱신하면 접힌 컴포넌트 캐시는 무효화되고
+    갱신된 키로 새 PreparedKey가 만들어집니다 (바뀌지 않은 컴포넌트의 테이블은 재사용).
+    """
+
+    def __init__(self, key, folded_cache_size=64):
+        super().__init__(key)
+        self.tables_built = 0
+        for name in ("Dj", "Djp"):
+            for element in self.get(name, {}).values():
+                if init_table(element):
+                    self.tables_built += 1
+        self._folded = LRUCache(folded_cache_size)
+
+    def folded_path(self, fingerprint, path):
+        """
+        복호화 경로의 키 쪽 접힌 컴포넌트 [(라벨, 속성, Dj^-λ, Dj'^λ), ...]
+
+        Args:
+            fingerprint: 정책 지문 (λ는 정책 구조에 따라 달라짐)
+            path: [(라벨, 속성, λ), ...]
+        """
+        cache_key = (fingerprint, tuple(label for label, _, _ in path))
+        folded = self._folded.get(cache_key)
+        if folded is None:
+            folded = [
+                (label, attr, self["Dj"][attr] ** -coefficient, self["Djp"][attr] ** coefficient)
+                for label, attr, coefficient in path
+            ]
+            self._folded.put(cache_key, folded)
+        return folded
+
+    def invalidate(self):
+        """접힌 컴포넌트 캐시 비우기 (키 컴포넌트가 바뀐 경우)"""
+        self._folded.clear()
+
+    def stats(self):
+        """사전 처리 통계"""
+        return {"tables_built": self.tables_built, "folded": self._folded.stats()}
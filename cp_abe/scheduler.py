@@ -0,0 +1,265 @@
+"""
+이벤트 기반 만료 스케줄러
+
+등록된 페이딩 함수의 next_transition()으로 다음 값 전환 시각을 계산해
+가장 이른 시각까지 대기했다가 콜백을 호출합니다.
+check_key_validity를 반복 호출하는 폴링 없이 갱신/재암호화를 트리거할 수 있습니다.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+
+from .clock import SYSTEM_CLOCK
+
+
+# 경계 시각 직후의 값을 계산하기 위한 여유 (부동소수점 반올림 대비)
+_TRANSITION_EPSILON = 1e-6
+
+
+class ExpiryScheduler:
+    """
+    만료/전환 이벤트 스케줄러
+
+    - subscribe(): 속성 값이 바뀔 때마다 호출되는 반복 콜백
+    - watch_key(): 키의 동적 속성이 처음 만료되는 시점에 한 번 호출되는 콜백
+    - schedule_at(): 임의 시각의 1회성 콜백
+
+    start()로 백그라운드 스레드에서 실행하거나, run_pending()으로 직접 처리할 수 있습니다.
+    """
+
+    def __init__(self, fading_functions, clock=None):
+        """
+        Args:
+            fading_functions: {속성 이름: FadingFunction} (예: DynamicCPABE.fading_functions)
+            clock: 대기 기준 시계 (기본값: 시스템 시계)
+                수동 시계는 advance() 알림으로 대기 중인 스레드를 깨웁니다.
+        """
+        self.fading_functions = fading_functions
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self._heap = []  # (시각, seq, 이벤트 ID)
+        self._events = {}  # 이벤트 ID -> 이벤트 정보
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.logger = logging.getLogger("ExpiryScheduler")
+
+    # ------------------------------------------------------------------
+    # 이벤트 등록
+    # ------------------------------------------------------------------
+
+    def _push(self, when, event_id):
+        heapq.heappush(self._heap, (when, next(self._counter), event_id))
+        self._condition.notify_all()
+
+    def schedule_at(self, when, callback, *args):
+        """
+        지정 시각에 callback(*args)를 한 번 호출
+
+        Returns:
+            이벤트 ID (cancel에 사용)
+        """
+        with self._condition:
+            event_id = next(self._counter)
+            self._events[event_id] = {"type": "once", "callback": callback, "args": args}
+            self._push(when, event_id)
+            return event_id
+
+    def subscribe(self, attribute_name, callback, cohort=None):
+        """
+        속성 값 전환 구독 - 전환마다 callback(attribute_name, old_value, new_value, transition_time) 호출
+
+        종료 상태(next_transition이 None)에 도달하면 구독이 자동으로 끝납니다.
+
+        Args:
+            cohort: 코호트 번호 (위상 오프셋이 있는 페이딩 함수)
+
+        Returns:
+            이벤트 ID (cancel에 사용)
+        """
+        if attribute_name not in self.fading_functions:
+            raise ValueError(f"동적 속성이 아닙니다: {attribute_name}")
+
+        fading_func = self.fading_functions[attribute_name]
+        now = self.clock.time()
+        with self._condition:
+            event_id = next(self._counter)
+            self._events[event_id] = {
+                "type": "transition",
+                "callback": callback,
+                "attribute_name": attribute_name,
+                "cohort": cohort,
+                "value": fading_func.compute_cohort_value(cohort, now),
+            }
+            transition = fading_func.next_transition(now, cohort)
+            if transition is None:
+                del self._events[event_id]
+                return None
+            self._push(transition, event_id)
+            return event_id
+
+    def watch_key(self, key, callback):
+        """
+        키의 동적 속성이 처음 만료되는 시각에 callback(key) 호출
+
+        Returns:
+            이벤트 ID (만료 시각을 알 수 없으면 None)
+        """
+        deadline = self.key_deadline(key)
+        if deadline is None:
+            return None
+        return self.schedule_at(deadline, callback, key)
+
+    def key_deadline(self, key):
+        """키의 가장 이른 동적 속성 전환 시각 (없으면 None)"""
+        deadline = key.get("valid_until")
+        if deadline is not None:
+            return None if deadline == float("inf") else deadline
+
+        now = self.clock.time()
+        deadlines = []
+        expiry_info = key.get("expiry_info", {})
+        for attr_name in key.get("dynamic_attributes", {}):
+            fading_func = self.fading_functions.get(attr_name)
+            if fading_func is None:
+                continue
+            info = expiry_info.get(attr_name)
+            cohort = info.get("cohort") if isinstance(info, dict) else None
+            transition = fading_func.next_transition(now, cohort)
+            if transition is not None:
+                deadlines.append(transition)
+        return min(deadlines, default=None)
+
+    def cancel(self, event_id):
+        """이벤트 취소 (힙 항목은 꺼낼 때 무시)"""
+        with self._condition:
+            return self._events.pop(event_id, None) is not None
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def next_event_time(self):
+        """가장 이른 예약 시각 (없으면 None)"""
+        with self._condition:
+            self._discard_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def _discard_cancelled(self):
+        while self._heap and self._heap[0][2] not in self._events:
+            heapq.heappop(self._heap)
+
+    def _pop_next_due(self, now):
+        """now까지 도래한 가장 이른 이벤트를 꺼내 (시각, 이벤트 ID, 이벤트)로 반환 (없으면 None)"""
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                when, _, event_id = heapq.heappop(self._heap)
+                event = self._events.get(event_id)
+                if event is None:
+                    continue
+                if event["type"] == "once":
+                    del self._events[event_id]
+                return when, event_id, event
+        return None
+
+    def run_pending(self, now=None):
+        """
+        도래한 이벤트의 콜백을 시각 순서로 실행
+
+        전환 구독은 다음 전환 시각으로 다시 예약되므로, 시계가 여러 주기를 건너뛰었으면
+        now까지 도래한 전환이 남지 않을 때까지 전환마다 콜백을 호출합니다.
+
+        Returns:
+            실행한 콜백 수
+        """
+        if now is None:
+            now = self.clock.time()
+
+        fired = 0
+        while True:
+            entry = self._pop_next_due(now)
+            if entry is None:
+                return fired
+            when, event_id, event = entry
+            if event["type"] == "once":
+                self._invoke(event["callback"], *event["args"])
+            else:
+                self._fire_transition(when, event_id, event)
+            fired += 1
+
+    def _fire_transition(self, when, event_id, event):
+        fading_func = self.fading_functions[event["attribute_name"]]
+        cohort = event["cohort"]
+
+        # 경계 직후 시각 기준으로 새 값과 다음 전환 시각 계산
+        after = when + _TRANSITION_EPSILON
+        old_value = event["value"]
+        new_value = fading_func.compute_cohort_value(cohort, after)
+        transition = fading_func.next_transition(after, cohort)
+
+        with self._condition:
+            if event_id in self._events:
+                event["value"] = new_value
+                if transition is None:
+                    del self._events[event_id]
+                else:
+                    self._push(transition, event_id)
+
+        self._invoke(event["callback"], event["attribute_name"], old_value, new_value, when)
+
+    def _invoke(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            self.logger.warning(f"스케줄러 콜백 오류: {e}")
+
+    def start(self):
+        """백그라운드 스레드에서 실행 - 가장 이른 예약 시각까지 대기"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self.clock.add_listener(self._wake)
+        self._thread = threading.Thread(
+            target=self._run, name="ExpiryScheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """백그라운드 스레드 종료"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self.clock.remove_listener(self._wake)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _wake(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                self._discard_cancelled()
+                if self._heap:
+                    remaining = self._heap[0][0] - self.clock.time()
+                else:
+                    remaining = None
+                if remaining is None or remaining > 0:
+                    # 새 이벤트 등록/중지/시계 변경 시 notify로 깨어남
+                    timeout = None
+                    if remaining is not None:
+                        timeout = self.clock.real_timeout(remaining)
+                    self._condition.wait(timeout)
+                    continue
+            self.run_pending()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._events)
@@ -0,0 +1,151 @@
+"""
+정책 세션 키
+
+같은 정책으로 작은 메시지(명령/설정)를 대량으로 보낼 때 CP-ABE 비용을 세션당 한 번으로 줄입니다.
+송신 측은 대칭키 하나를 정책으로 캡슐화해 세션 헤더로 알리고,
+이후 메시지는 그 키로 AES-GCM 암호화만 합니다. 기기는 세션 ID별로 캡슐 해제한 키를 캐시합니다.
+
+세션 수명은 설정값과 정책에 포함된 동적 속성의 현재 에포크 종료 시각 중 이른 쪽으로 제한되며,
+만료 시각은 세션 키 유도에 묶여 헤더에서 변조할 수 없습니다.
+"""
+
+import os
+import struct
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from .cache import LRUCache
+from .hybrid import KEY_SIZE, seal, open_sealed
+
+# 세션 메시지/헤더 식별자
+SESSION_MODE = "session"
+SESSION_HEADER_MODE = "session_header"
+
+# 기본 세션 수명 (초)
+DEFAULT_SESSION_LIFETIME = 3600
+
+SESSION_ID_SIZE = 16
+_NONCE_PREFIX_SIZE = 4
+_COUNTER = struct.Struct(">Q")
+_EXPIRY = struct.Struct(">d")
+_KDF_INFO = b"cp-abe policy session v1"
+
+
+def _session_key(encapsulated_key, session_id, expires_at):
+    """캡슐화된 키에서 세션 ID/만료 시각에 묶인 세션 키 유도"""
+    info = _KDF_INFO + bytes.fromhex(session_id) + _EXPIRY.pack(expires_at)
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=KEY_SIZE, salt=None, info=info)
+    return hkdf.derive(encapsulated_key)
+
+
+class PolicySession:
+    """
+    송신 측 정책 세션 - IoTCPABE.open_session()으로 생성
+
+    announcement()를 대상 기기에 먼저 보내고, encrypt()로 메시지를 암호화합니다.
+    논스는 세션별 무작위 접두사 + 메시지 카운터입니다.
+    """
+
+    def __init__(self, cpabe, policy, expires_at):
+        self.clock = cpabe.clock
+        self.session_id = os.urandom(SESSION_ID_SIZE).hex()
+        self.expires_at = expires_at
+
+        encapsulated_key, self.header = cpabe.encapsulate(policy)
+        self.policy = self.header["policy"]
+        self._key = _session_key(encapsulated_key, self.session_id, expires_at)
+        self._aad = self.session_id.encode("ascii")
+        self._nonce_prefix = os.urandom(_NONCE_PREFIX_SIZE)
+        self.messages = 0
+
+    @property
+    def expired(self):
+        return self.clock.time() >= self.expires_at
+
+    def announcement(self):
+        """기기로 보낼 세션 헤더 (CP-ABE 헤더 + 세션 ID + 만료 시각)"""
+        return {
+            "mode": SESSION_HEADER_MODE,
+            "session_id": self.session_id,
+            "header": self.header,
+            "expires_at": self.expires_at,
+        }
+
+    def encrypt(self, message):
+        """세션 키로 메시지 암호화 (그룹 연산 없음)"""
+        if self.expired:
+            raise ValueError(f"세션이 만료되었습니다: {self.session_id}")
+
+        is_string = isinstance(message, str)
+        data = message.encode("utf-8") if is_string else message
+        nonce = self._nonce_prefix + _COUNTER.pack(self.messages)
+        self.messages += 1
+        _, body = seal(self._key, data, self._aad, nonce=nonce)
+        return {
+            "mode": SESSION_MODE,
+            "session_id": self.session_id,
+            "nonce": nonce,
+            "payload": body,
+            "is_string": is_string,
+        }
+
+
+class SessionKeyCache:
+    """
+    기기 측 세션 키 캐시 - 기기 키 하나에 묶임
+
+    accept()로 세션 헤더를 한 번 캡슐 해제해 두면 decrypt()는 AES-GCM 복호화만 합니다.
+    """
+
+    def __init__(self, cpabe, key, maxsize=64):
+        self.cpabe = cpabe
+        self.key = key
+        self.sessions = LRUCache(maxsize)
+
+    def accept(self, announcement):
+        """
+        세션 헤더 수신 - 키가 정책을 만족하면 세션 키를 캐시
+
+        Returns:
+            세션 사용 가능 여부 (정책 불만족/만료 시 False, 페어링 없이 판정)
+        """
+        session_id = announcement["session_id"]
+        if self.sessions.get(session_id) is not None:
+            return True
+
+        expires_at = announcement["expires_at"]
+        if self.cpabe.clock.time() >= expires_at:
+            return False
+        if not self.cpabe.can_decrypt(announcement["header"], self.key):
+            return False
+
+        encapsulated_key = self.cpabe.decapsulate(announcement["header"], self.key)
+        self.sessions.put(
+            session_id, (_session_key(encapsulated_key, session_id, expires_at), expires_at)
+        )
+        return True
+
+    def decrypt(self, message):
+        """세션 메시지 복호화 - 세션 헤더를 먼저 accept()해야 함"""
+        session_id = message["session_id"]
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise ValueError(f"복호화 실패: 알 수 없는 세션 {session_id}")
+
+        session_key, expires_at = entry
+        if self.cpabe.clock.time() >= expires_at:
+            raise ValueError(f"복호화 실패: 만료된 세션 {session_id}")
+
+        data = open_sealed(
+            session_key, message["nonce"], message["payload"], session_id.encode("ascii")
+        )
+        if message.get("is_string", False):
+            return data.decode("utf-8")
+        return data
+
+    def __contains__(self, session_id):
+        return session_id in self.sessions
+
+    def __len__(self):
+        return len(self.sessions)
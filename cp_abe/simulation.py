@@ -0,0 +1,519 @@
+"""
+이산 사건 기반 기기 플릿 시뮬레이터
+
+KeyAuthority, DynamicCPABE, 페이딩 함수를 수동 시계 위에서 실제로 구동하여
+기기 유입, 구독 구매/이탈, 에포크 전환 시 갱신 요청과 재시도, 업데이트 패키지 배포를
+수개월 단위로 시뮬레이션하고 키 관리 기관의 처리량, 대기열 깊이, 지연 백분위를 보고합니다.
+
+키 관리 기관은 요청을 종류별 대기열에 쌓아 배치로 처리하는 단일 서버로 모델링하며,
+각 배치의 서비스 시간은 실제 호출에 걸린 시간(service_time_scale 배)입니다.
+"""
+
+import copy
+import heapq
+import itertools
+import json
+import os
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from .clock import ManualClock
+from .dynamic_cpabe import DynamicCPABE
+from .fading_functions import LinearFadingFunction
+from .key_authority import KeyAuthority
+from .storage import SQLiteDeviceStore
+
+
+DAY = 86400.0
+
+DEFAULT_SCENARIO = {
+    "name": "default",
+    "seed": 0,
+    "start_time": None,  # 시뮬레이션 시작 시각 (기본값: 현재)
+    "duration_days": 90,
+    "fleet": {
+        "initial_devices": 1000,  # 시작 시점에 한꺼번에 유입되는 기기 수
+        "arrival_rate_per_day": 100,  # 이후 포아송 유입률
+        "attributes": ["model", "serialNumber"],
+        "key_sample": 100,  # 복호화 검사를 위해 키를 보관할 기기 수
+    },
+    "subscription": {
+        "purchase_probability": 0.8,  # 등록 시 구독 구매 확률
+        "renewal_probability": 0.9,  # 에포크 전환 시 갱신 확률 (아니면 이탈)
+        "period_days": 30,  # 구독 기간 및 에포크 길이
+        "cohorts": 1,  # 에포크 전환 분산용 코호트 수 (최대 MAX_COHORTS, 코호트당 암호문 리프 증가)
+        "renewal_jitter_hours": 12,  # 전환 후 갱신 요청까지의 최대 지연
+    },
+    "retry": {
+        "failure_probability": 0.02,  # 전송 실패 확률 (재시도 대상)
+        "delay_minutes": 30,
+        "max_retries": 3,
+    },
+    "releases": {
+        "interval_days": 7,
+        "policy": ["model", "subscription"],
+        "decrypt_sample": 20,
+    },
+    "authority": {
+        "batch_size": 256,
+        "batch_window_seconds": 0,  # 배치를 모으기 위해 처리 시작을 늦추는 시간
+        "workers": 1,
+        "parallel_min_batch": 128,  # 작업자 프로세스를 사용할 최소 배치 크기
+        "store": None,  # SQLite 저장소 경로 (기본값: 메모리 저장소)
+        "service_time_scale": 1.0,
+    },
+}
+
+
+def _merge(base, override):
+    """중첩 딕셔너리 병합 (override 우선)"""
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_scenario(path):
+    """
+    시나리오 파일 로드 (.json 또는 .yaml/.yml) - 기본 시나리오와 병합
+
+    YAML 파일은 PyYAML이 설치되어 있어야 합니다.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML 시나리오를 읽으려면 PyYAML이 필요합니다")
+            scenario = yaml.safe_load(f)
+        else:
+            scenario = json.load(f)
+    return _merge(DEFAULT_SCENARIO, scenario)
+
+
+class _OperationStats:
+    """요청 종류별 통계"""
+
+    def __init__(self):
+        self.requests = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self.service_time = 0.0
+        self.latencies = []
+
+    def report(self):
+        latencies = np.asarray(self.latencies, dtype=np.float64)
+        percentiles = {}
+        if len(latencies):
+            for p in (50, 95, 99):
+                percentiles[f"p{p}"] = float(np.percentile(latencies, p))
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "retries": self.retries,
+            "batches": self.batches,
+            "service_time": self.service_time,
+            "throughput_per_sec": (
+                self.completed / self.service_time if self.service_time else 0.0
+            ),
+            "latency_seconds": percentiles,
+        }
+
+
+class FleetSimulator:
+    """
+    이산 사건 기반 플릿 시뮬레이터
+
+    사용 예:
+        simulator = FleetSimulator(load_scenario("scenario.yaml"))
+        report = simulator.run()
+    """
+
+    def __init__(self, scenario=None):
+        self.scenario = _merge(DEFAULT_SCENARIO, scenario)
+        self.rng = random.Random(self.scenario["seed"])
+
+        start = self.scenario["start_time"]
+        self.clock = ManualClock(start)
+        self.start_time = self.clock.time()
+        self.end_time = self.start_time + self.scenario["duration_days"] * DAY
+
+        # 실제 시스템 구성 (수동 시계 주입)
+        subscription = self.scenario["subscription"]
+        self.cpabe = DynamicCPABE(clock=self.clock)
+        self.cpabe.setup()
+        self.subscription_function = LinearFadingFunction(
+            "subscription", subscription["period_days"] * DAY, clock=self.clock
+        )
+        self.subscription_function.set_cohorts(subscription["cohorts"])
+        self.cpabe.register_fading_function("subscription", self.subscription_function)
+
+        store_path = self.scenario["authority"]["store"]
+        store = SQLiteDeviceStore(store_path) if store_path else None
+        self.authority = KeyAuthority(self.cpabe, store=store, clock=self.clock)
+        self.authority.set_renewal_policy(
+            "subscription", renewal_period_days=subscription["period_days"]
+        )
+
+        # 사건 큐와 키 관리 기관 대기열
+        self._events = []
+        self._counter = itertools.count()
+        self._queues = {"register": deque(), "renew": deque()}
+        self._busy = False
+        self._dispatch_pending = False
+
+        # 기기 상태: device_id -> 현재 에포크 종료 시각 (구독 중인 기기만)
+        self.subscribed = {}
+        self._renewing = set()  # 갱신 요청 예정/진행 중인 기기
+        self.sampled_keys = {}
+        self._next_device = 0
+
+        # 통계
+        self.stats = {"register": _OperationStats(), "renew": _OperationStats()}
+        self.lapsed = 0
+        self.releases = []
+        self._depth_area = 0.0
+        self._depth_time = self.start_time
+        self._max_depth = 0
+        self._depth_samples = []
+        self.events_processed = 0
+
+    # ------------------------------------------------------------------
+    # 사건 큐
+    # ------------------------------------------------------------------
+
+    def _schedule(self, when, kind, payload=None):
+        heapq.heappush(self._events, (when, next(self._counter), kind, payload))
+
+    def _queue_depth(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _track_depth(self, now):
+        """시간 가중 평균 대기열 깊이 누적"""
+        depth = self._queue_depth()
+        self._depth_area += depth * (now - self._depth_time)
+        self._depth_time = now
+        self._max_depth = max(self._max_depth, depth)
+        self._depth_samples.append(depth)
+
+    def _enqueue(self, kind, device_id, attempt=0, first_request=None):
+        now = self.clock.time()
+        self._track_depth(now)
+        self._queues[kind].append((device_id, now, attempt, first_request or now))
+        if attempt == 0:
+            self.stats[kind].requests += 1
+        else:
+            self.stats[kind].retries += 1
+        self._request_dispatch()
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """시뮬레이션 실행 후 보고서 반환"""
+        wall_start = time.time()
+        fleet = self.scenario["fleet"]
+
+        for _ in range(fleet["initial_devices"]):
+            self._schedule(self.start_time, "arrival")
+        if fleet["arrival_rate_per_day"] > 0:
+            self._schedule(self._next_arrival_time(self.start_time), "arrival_process")
+        if self.scenario["releases"]["interval_days"] > 0:
+            self._schedule(
+                self.start_time + self.scenario["releases"]["interval_days"] * DAY,
+                "release",
+            )
+
+        handlers = {
+            "arrival": self._on_arrival,
+            "arrival_process": self._on_arrival_process,
+            "renewal_request": self._on_renewal_request,
+            "epoch_end": self._on_epoch_end,
+            "release": self._on_release,
+            "retry": self._on_retry,
+            "dispatch": self._on_dispatch,
+            "service_done": self._on_service_done,
+        }
+        while self._events and self._events[0][0] <= self.end_time:
+            when, _, kind, payload = heapq.heappop(self._events)
+            self.clock.set(max(when, self.clock.time()))
+            handlers[kind](payload)
+            self.events_processed += 1
+
+        self._track_depth(self.end_time)
+        self.authority.shutdown()
+        return self.report(time.time() - wall_start)
+
+    def _next_arrival_time(self, now):
+        rate = self.scenario["fleet"]["arrival_rate_per_day"] / DAY
+        return now + self.rng.expovariate(rate)
+
+    # ------------------------------------------------------------------
+    # 사건 처리
+    # ------------------------------------------------------------------
+
+    def _on_arrival(self, payload):
+        device_id = f"sim-device-{self._next_device:07d}"
+        self._next_device += 1
+        self._enqueue("register", device_id)
+
+    def _on_arrival_process(self, payload):
+        self._on_arrival(None)
+        now = self.clock.time()
+        self._schedule(self._next_arrival_time(now), "arrival_process")
+
+    def _schedule_epoch(self, device_id):
+        """기기 키의 현재 에포크 종료 시각과 그 이후의 갱신/이탈 사건 예약"""
+        now = self.clock.time()
+        function = self.subscription_function
+        epoch_end = function.next_transition(now, function.cohort_of(device_id))
+        self.subscribed[device_id] = epoch_end
+
+        subscription = self.scenario["subscription"]
+        if self.rng.random() < subscription["renewal_probability"]:
+            self._renewing.add(device_id)
+            jitter = self.rng.uniform(0, subscription["renewal_jitter_hours"] * 3600)
+            self._schedule(epoch_end + jitter, "renewal_request", device_id)
+        self._schedule(epoch_end, "epoch_end", (device_id, epoch_end))
+
+    def _on_renewal_request(self, device_id):
+        self._enqueue("renew", device_id)
+
+    def _on_epoch_end(self, payload):
+        device_id, epoch_end = payload
+        # 갱신 예정이 없는 기기는 이탈 (갱신 예정 기기는 요청 처리 결과로 결정)
+        if self.subscribed.get(device_id) == epoch_end and device_id not in self._renewing:
+            del self.subscribed[device_id]
+            self.lapsed += 1
+
+    def _on_retry(self, payload):
+        kind, device_id, attempt, first_request = payload
+        self._enqueue(kind, device_id, attempt, first_request)
+
+    def _on_release(self, payload):
+        """업데이트 패키지 배포 - 암호화 후 표본 기기의 복호화 성공률 측정"""
+        releases = self.scenario["releases"]
+        message = f"update-{len(self.releases)}"
+
+        start = time.time()
+        package = self.cpabe.encrypt_with_dynamic_attributes(message, releases["policy"])
+        encrypt_time = time.time() - start
+
+        # 현재 에포크 키를 가진 표본 기기만 (이탈한 기기는 권한이 없으므로 제외,
+        # 에포크가 끝나 갱신을 기다리는 기기는 따로 집계)
+        now = self.clock.time()
+        sample = []
+        awaiting_renewal = 0
+        for device_id, key in self.sampled_keys.items():
+            epoch_end = self.subscribed.get(device_id)
+            if epoch_end is None:
+                continue
+            if epoch_end > now:
+                sample.append((device_id, key))
+            else:
+                awaiting_renewal += 1
+        if len(sample) > releases["decrypt_sample"]:
+            sample = self.rng.sample(sample, releases["decrypt_sample"])
+        success = 0
+        for _, key in sample:
+            try:
+                if self.cpabe.decrypt(package, key) == message:
+                    success += 1
+            except Exception:
+                pass
+
+        self.releases.append(
+            {
+                "time_days": (now - self.start_time) / DAY,
+                "encrypt_time": encrypt_time,
+                "sampled": len(sample),
+                "decrypted": success,
+                "awaiting_renewal": awaiting_renewal,
+            }
+        )
+        self._schedule(now + releases["interval_days"] * DAY, "release")
+
+    # ------------------------------------------------------------------
+    # 키 관리 기관 서버
+    # ------------------------------------------------------------------
+
+    def _request_dispatch(self):
+        """
+        서버가 비어 있으면 배치 처리 시작 사건 예약
+
+        같은 시각의 사건이 모두 대기열에 들어온 뒤(또는 batch_window_seconds 후) 처리하므로
+        동시에 도착한 요청이 한 배치로 묶입니다.
+        """
+        if self._busy or self._dispatch_pending:
+            return
+        self._dispatch_pending = True
+        window = self.scenario["authority"]["batch_window_seconds"]
+        self._schedule(self.clock.time() + window, "dispatch")
+
+    def _on_dispatch(self, payload):
+        self._dispatch_pending = False
+        self._start_service()
+
+    def _start_service(self):
+        """가장 오래 기다린 대기열에서 배치를 꺼내 처리"""
+        if self._busy:
+            return
+        waiting = [(queue[0][1], kind) for kind, queue in self._queues.items() if queue]
+        if not waiting:
+            return
+        _, kind = min(waiting)
+
+        authority = self.scenario["authority"]
+        queue = self._queues[kind]
+        batch = [queue.popleft() for _ in range(min(authority["batch_size"], len(queue)))]
+        self._track_depth(self.clock.time())
+        self._busy = True
+
+        start = time.time()
+        if kind == "register":
+            outcomes = self._serve_registrations(batch)
+        else:
+            outcomes = self._serve_renewals(batch)
+        service_time = (time.time() - start) * authority["service_time_scale"]
+
+        stats = self.stats[kind]
+        stats.batches += 1
+        stats.service_time += service_time
+        self._schedule(
+            self.clock.time() + service_time, "service_done", (kind, batch, outcomes)
+        )
+
+    def _workers(self, batch_length):
+        """작은 배치는 프로세스 간 전달 비용을 피하기 위해 현재 프로세스에서 처리"""
+        authority = self.scenario["authority"]
+        if batch_length < authority["parallel_min_batch"]:
+            return 1
+        return authority["workers"]
+
+    def _serve_registrations(self, batch):
+        fleet = self.scenario["fleet"]
+        subscription = self.scenario["subscription"]
+        authority = self.scenario["authority"]
+
+        # 구독 구매 여부별로 나누어 일괄 등록 (미구매 기기는 0일 - 비활성)
+        groups = {}
+        for device_id, _, _, _ in batch:
+            purchased = self.rng.random() < subscription["purchase_probability"]
+            days = subscription["period_days"] if purchased else 0
+            groups.setdefault(days, []).append(device_id)
+
+        outcomes = {}
+        for days, device_ids in groups.items():
+            devices = ((device_id, fleet["attributes"]) for device_id in device_ids)
+            for device_id, key in self.authority.register_devices(
+                devices,
+                workers=self._workers(len(batch)),
+                batch_size=authority["batch_size"],
+                subscription_period_days=days,
+            ):
+                # 복호화 표본은 구독을 구매한(권한이 있는) 기기만
+                if days > 0 and len(self.sampled_keys) < fleet["key_sample"]:
+                    self.sampled_keys[device_id] = key
+                outcomes[device_id] = {"success": True, "subscribed": days > 0}
+        return [outcomes[device_id] for device_id, _, _, _ in batch]
+
+    def _serve_renewals(self, batch):
+        authority = self.scenario["authority"]
+        return self.authority.request_attribute_renewals(
+            [(device_id, "subscription") for device_id, _, _, _ in batch],
+            workers=self._workers(len(batch)),
+            chunk_size=authority["batch_size"],
+        )
+
+    def _on_service_done(self, payload):
+        kind, batch, outcomes = payload
+        now = self.clock.time()
+        stats = self.stats[kind]
+        retry = self.scenario["retry"]
+
+        for (device_id, _, attempt, first_request), outcome in zip(batch, outcomes):
+            # 응답 전송 실패 - 기기가 재시도
+            if self.rng.random() < retry["failure_probability"]:
+                stats.failed += 1
+                if attempt < retry["max_retries"]:
+                    self._schedule_retry(kind, device_id, attempt + 1, first_request)
+                elif kind == "renew":
+                    self._renewal_finished(device_id, renewed=False)
+                continue
+
+            if not outcome["success"]:
+                stats.rejected += 1
+                if kind == "renew":
+                    self._renewal_finished(device_id, renewed=False)
+                continue
+
+            stats.completed += 1
+            stats.latencies.append(now - first_request)
+            if kind == "register":
+                if outcome["subscribed"]:
+                    self._schedule_epoch(device_id)
+            else:
+                if device_id in self.sampled_keys:
+                    self.sampled_keys[device_id] = self.cpabe.merge_attribute_to_key(
+                        self.sampled_keys[device_id], outcome["attribute"]
+                    )
+                self._renewal_finished(device_id, renewed=True)
+
+        self._busy = False
+        self._request_dispatch()
+
+    def _schedule_retry(self, kind, device_id, attempt, first_request):
+        delay = self.scenario["retry"]["delay_minutes"] * 60
+        self._schedule(
+            self.clock.time() + delay, "retry", (kind, device_id, attempt, first_request)
+        )
+
+    def _renewal_finished(self, device_id, renewed):
+        self._renewing.discard(device_id)
+        if renewed:
+            self._schedule_epoch(device_id)
+        elif device_id in self.subscribed:
+            del self.subscribed[device_id]
+            self.lapsed += 1
+
+    # ------------------------------------------------------------------
+    # 보고서
+    # ------------------------------------------------------------------
+
+    def report(self, wall_time=None):
+        duration = self.end_time - self.start_time
+        busy_time = sum(stats.service_time for stats in self.stats.values())
+        depth_samples = np.asarray(self._depth_samples or [0])
+        return {
+            "scenario": self.scenario["name"],
+            "simulated_days": duration / DAY,
+            "wall_time": wall_time,
+            "events": self.events_processed,
+            "fleet": {
+                "registered": self._next_device,
+                "subscribed": len(self.subscribed),
+                "lapsed": self.lapsed,
+            },
+            "authority": {
+                "utilization": busy_time / duration if duration else 0.0,
+                "operations": {kind: stats.report() for kind, stats in self.stats.items()},
+            },
+            "queue_depth": {
+                "max": self._max_depth,
+                "mean": self._depth_area / duration if duration else 0.0,
+                "p95": float(np.percentile(depth_samples, 95)),
+            },
+            "releases": self.releases,
+        }
@@ -0,0 +1,343 @@
+"""
+기기 정보 저장소
+
+키 관리 기관이 보관하는 기기 최소 정보(사용자 ID, 구독 만료일, 상태, 속성별 갱신 횟수)를
+저장합니다. 기본값은 프로세스 내 딕셔너리이며, 재시작 후에도 상태를 유지해야 하는 경우
+SQLite 저장소를 사용합니다.
+"""
+
+import json
+import sqlite3
+import threading
+
+from .cache import LRUCache
+
+
+class DeviceStore:
+    """
+    기기 저장소 인터페이스
+
+    레코드는 기기 해시를 키로 하는 딕셔너리이며 다음 필드를 가집니다:
+    user_id, subscription_end ("%Y-%m-%d"), registration_date, status,
+    renewal_count ({속성: 횟수}, 갱신 이력이 있을 때만),
+    random_value/transform_blind (직렬화된 키 난수/블라인딩 값), 기타 부가 필드
+    """
+
+    def get(self, device_hash):
+        """레코드 조회 (없으면 None) - 반환값은 읽기 전용으로 취급"""
+        raise NotImplementedError
+
+    def put_many(self, records):
+        """레코드 일괄 저장 ({device_hash: record})"""
+        raise NotImplementedError
+
+    def update(self, device_hash, fields):
+        """레코드 필드 갱신 - 등록되지 않은 기기면 False"""
+        raise NotImplementedError
+
+    def record_renewals(self, renewals):
+        """
+        갱신 결과 일괄 반영
+
+        Args:
+            renewals: (device_hash, attribute_name, new_expiry 또는 None) 반복 가능 객체
+        """
+        raise NotImplementedError
+
+    def expiring_between(self, start_date, end_date):
+        """구독 만료일이 [start_date, end_date] 범위인 (device_hash, record) 리스트"""
+        raise NotImplementedError
+
+    def find_by_status(self, status):
+        """상태가 일치하는 (device_hash, record) 리스트"""
+        raise NotImplementedError
+
+    def find_by_renewal_count(self, attribute_name, min_count):
+        """속성 갱신 횟수가 min_count 이상인 (device_hash, record) 리스트"""
+        raise NotImplementedError
+
+    def subscription_ends(self, status):
+        """상태가 일치하는 (device_hash, subscription_end) 리스트 - 만료 인덱스 재구성용"""
+        return [
+            (device_hash, record["subscription_end"])
+            for device_hash, record in self.find_by_status(status)
+            if record.get("subscription_end")
+        ]
+
+    def close(self):
+        """저장소 자원 해제"""
+
+    def __contains__(self, device_hash):
+        return self.get(device_hash) is not None
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class InMemoryDeviceStore(DeviceStore):
+    """딕셔너리 기반 기본 저장소 - 조회 질의는 전체 스캔"""
+
+    def __init__(self):
+        self._records = {}
+
+    def get(self, device_hash):
+        return self._records.get(device_hash)
+
+    def put_many(self, records):
+        self._records.update(records)
+
+    def update(self, device_hash, fields):
+        record = self._records.get(device_hash)
+        if record is None:
+            return False
+        record.update(fields)
+        return True
+
+    def record_renewals(self, renewals):
+        for device_hash, attribute_name, new_expiry in renewals:
+            record = self._records.get(device_hash)
+            if record is None:
+                continue
+            if new_expiry is not None:
+                record["subscription_end"] = new_expiry
+            renewal_count = record.setdefault("renewal_count", {})
+            renewal_count[attribute_name] = renewal_count.get(attribute_name, 0) + 1
+
+    def expiring_between(self, start_date, end_date):
+        return [
+            (device_hash, record)
+            for device_hash, record in self._records.items()
+            if start_date <= record.get("subscription_end", "") <= end_date
+        ]
+
+    def find_by_status(self, status):
+        return [
+            (device_hash, record)
+            for device_hash, record in self._records.items()
+            if record.get("status") == status
+        ]
+
+    def find_by_renewal_count(self, attribute_name, min_count):
+        return [
+            (device_hash, record)
+            for device_hash, record in self._records.items()
+            if record.get("renewal_count", {}).get(attribute_name, 0) >= min_count
+        ]
+
+    def __contains__(self, device_hash):
+        return device_hash in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+
+class SQLiteDeviceStore(DeviceStore):
+    """
+    SQLite 기반 영속 저장소
+
+    구독 만료일, 상태, 속성별 갱신 횟수에 인덱스를 두고,
+    쓰기는 배치당 한 트랜잭션으로 처리하며, 조회는 크기 제한 캐시를 거칩니다.
+    """
+
+    # 전용 컬럼으로 저장하는 필드 (나머지는 extra JSON)
+    _COLUMNS = ("user_id", "subscription_end", "registration_date", "status")
+
+    def __init__(self, path=":memory:", cache_size=1024):
+        """
+        Args:
+            path: 데이터베이스 파일 경로 (기본값: 메모리 DB)
+            cache_size: 조회 캐시 크기
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._cache = LRUCache(cache_size)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS devices (
+                    device_hash TEXT PRIMARY KEY,
+                    user_id TEXT,
+                    subscription_end TEXT,
+                    registration_date TEXT,
+                    status TEXT,
+                    extra TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_devices_subscription_end
+                    ON devices (subscription_end);
+                CREATE INDEX IF NOT EXISTS idx_devices_status
+                    ON devices (status);
+                CREATE TABLE IF NOT EXISTS renewal_counts (
+                    device_hash TEXT NOT NULL,
+                    attribute_name TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (device_hash, attribute_name)
+                );
+                CREATE INDEX IF NOT EXISTS idx_renewal_counts_attribute
+                    ON renewal_counts (attribute_name, count);
+                """
+            )
+
+    def _split(self, record):
+        """레코드를 (컬럼 값, extra JSON)으로 분리"""
+        extra = {
+            key: value
+            for key, value in record.items()
+            if key not in self._COLUMNS and key != "renewal_count"
+        }
+        values = tuple(record.get(column) for column in self._COLUMNS)
+        return values, json.dumps(extra) if extra else None
+
+    def _load(self, device_hash):
+        row = self._conn.execute(
+            "SELECT user_id, subscription_end, registration_date, status, extra "
+            "FROM devices WHERE device_hash = ?",
+            (device_hash,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        record = {
+            column: value
+            for column, value in zip(self._COLUMNS, row[:4])
+            if value is not None
+        }
+        if row[4]:
+            record.update(json.loads(row[4]))
+
+        counts = self._conn.execute(
+            "SELECT attribute_name, count FROM renewal_counts WHERE device_hash = ?",
+            (device_hash,),
+        ).fetchall()
+        if counts:
+            record["renewal_count"] = dict(counts)
+        return record
+
+    def get(self, device_hash):
+        with self._lock:
+            record = self._cache.get(device_hash)
+            if record is None:
+                record = self._load(device_hash)
+                if record is not None:
+                    self._cache.put(device_hash, record)
+            return record
+
+    def put_many(self, records):
+        rows = []
+        counts = []
+        for device_hash, record in records.items():
+            values, extra = self._split(record)
+            rows.append((device_hash,) + values + (extra,))
+            for attribute_name, count in record.get("renewal_count", {}).items():
+                counts.append((device_hash, attribute_name, count))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO devices "
+                "(device_hash, user_id, subscription_end, registration_date, status, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "DELETE FROM renewal_counts WHERE device_hash = ?",
+                [(device_hash,) for device_hash in records],
+            )
+            self._conn.executemany(
+                "INSERT INTO renewal_counts (device_hash, attribute_name, count) "
+                "VALUES (?, ?, ?)",
+                counts,
+            )
+            for device_hash in records:
+                self._cache.pop(device_hash)
+
+    def update(self, device_hash, fields):
+        with self._lock:
+            record = self.get(device_hash)
+            if record is None:
+                return False
+            record = dict(record)
+            record.update(fields)
+            values, extra = self._split(record)
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE devices SET user_id = ?, subscription_end = ?, "
+                    "registration_date = ?, status = ?, extra = ? WHERE device_hash = ?",
+                    values + (extra, device_hash),
+                )
+            self._cache.pop(device_hash)
+            return True
+
+    def record_renewals(self, renewals):
+        renewals = list(renewals)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE devices SET subscription_end = ? "
+                "WHERE device_hash = ? AND ? IS NOT NULL",
+                [
+                    (new_expiry, device_hash, new_expiry)
+                    for device_hash, _, new_expiry in renewals
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO renewal_counts (device_hash, attribute_name, count) "
+                "SELECT device_hash, ?, 1 FROM devices WHERE device_hash = ? "
+                "ON CONFLICT (device_hash, attribute_name) DO UPDATE SET count = count + 1",
+                [
+                    (attribute_name, device_hash)
+                    for device_hash, attribute_name, _ in renewals
+                ],
+            )
+            for device_hash, _, _ in renewals:
+                self._cache.pop(device_hash)
+
+    def _query(self, sql, params):
+        with self._lock:
+            hashes = [row[0] for row in self._conn.execute(sql, params)]
+            return [(device_hash, self.get(device_hash)) for device_hash in hashes]
+
+    def expiring_between(self, start_date, end_date):
+        return self._query(
+            "SELECT device_hash FROM devices WHERE subscription_end BETWEEN ? AND ? "
+            "ORDER BY subscription_end",
+            (start_date, end_date),
+        )
+
+    def find_by_status(self, status):
+        return self._query(
+            "SELECT device_hash FROM devices WHERE status = ?", (status,)
+        )
+
+    def find_by_renewal_count(self, attribute_name, min_count):
+        return self._query(
+            "SELECT device_hash FROM renewal_counts "
+            "WHERE attribute_name = ? AND count >= ?",
+            (attribute_name, min_count),
+        )
+
+    def subscription_ends(self, status):
+        # 레코드 전체를 읽지 않고 인덱스 컬럼만 조회
+        with self._lock:
+            return self._conn.execute(
+                "SELECT device_hash, subscription_end FROM devices "
+                "WHERE status = ? AND subscription_end IS NOT NULL",
+                (status,),
+            ).fetchall()
+
+    def cache_stats(self):
+        """조회 캐시 통계"""
+        return self._cache.stats()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+            self._cache.clear()
+
+    def __contains__(self, device_hash):
+        return self.get(device_hash) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
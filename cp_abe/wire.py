@@ -0,0 +1,475 @@
+"""
+바이너리 전송 형식 (와이어 코덱)
+
+암호문, 기기 키, 속성 갱신 컴포넌트를 기기로 전송할 때의 실제 바이트 표현입니다.
+그룹 요소는 점 압축 직렬화의 원시 바이트로, 정책 트리는 속성 문자열 테이블과
+varint 노드 열로 인코딩하며 update_history 같은 파이썬 메타데이터는 싣지 않습니다.
+
+형식: MAGIC(2) | 버전(1) | 종류(1) | 본문
+    varint  - LEB128 부호 없는 정수
+    bytes   - varint 길이 + 원시 바이트
+    element - 요소 종류(1) + bytes (charm 압축 직렬화의 base64를 푼 값)
+    time    - big-endian float64 (없으면 NaN)
+
+wire_size()로 벤치마크가 실제 전송 바이트를 보고할 수 있습니다.
+"""
+
+import base64
+import math
+import struct
+
+from .cache import LRUCache
+from .hybrid import BROADCAST_MODE, HYBRID_MODE
+from .policy import AttributeLeaf, binary_policy_leaves, parse_binary_policy
+
+WIRE_MAGIC = b"\xabW"
+WIRE_VERSION = 1
+
+# 메시지 종류
+KIND_CIPHERTEXT = 1
+KIND_HYBRID = 2
+KIND_KEY = 3
+KIND_UPDATE = 4
+KIND_BROADCAST = 5
+
+# 암호문 플래그
+_CT_STRING = 0x01
+_CT_SERIALIZED = 0x02
+
+# 키/갱신 플래그
+_KEY_TRANSFORM = 0x01
+_UPDATE_TRANSFORM = 0x01
+
+# 정책 노드 코드 (2 이상은 속성 테이블 색인 + 2)
+_NODE_AND = 0
+_NODE_OR = 1
+
+_TIME = struct.Struct(">d")
+
+# 정책 문자열 -> (이진 트리, 리프 라벨 목록)
+_policy_cache = LRUCache(256)
+
+
+class _Writer:
+    def __init__(self, kind):
+        self.buf = bytearray(WIRE_MAGIC)
+        self.buf.append(WIRE_VERSION)
+        self.buf.append(kind)
+
+    def varint(self, value):
+        if value < 0:
+            raise ValueError(f"varint는 음수를 표현할 수 없습니다: {value}")
+        while value >= 0x80:
+            self.buf.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buf.append(value)
+
+    def byte(self, value):
+        self.buf.append(value)
+
+    def raw(self, data):
+        self.varint(len(data))
+        self.buf += data
+
+    def string(self, text):
+        self.raw(str(text).encode("utf-8"))
+
+    def time(self, value):
+        self.buf += _TIME.pack(math.nan if value is None else float(value))
+
+    def element(self, group, element):
+        serialized = group.serialize(element, compression=True)
+        kind, _, encoded = bytes(serialized).partition(b":")
+        self.byte(int(kind))
+        self.raw(base64.b64decode(encoded))
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(bytes(data))
+        self.pos = 0
+        if len(self.data) < 4 or bytes(self.data[:2]) != WIRE_MAGIC:
+            raise ValueError("와이어 형식 오류: 식별자가 올바르지 않습니다")
+        version = self.data[2]
+        if version != WIRE_VERSION:
+            raise ValueError(f"와이어 형식 오류: 지원하지 않는 버전 {version}")
+        self.kind = self.data[3]
+        self.pos = 4
+
+    def _take(self, size):
+        end = self.pos + size
+        if end > len(self.data):
+            raise ValueError("와이어 형식 오류: 데이터가 예기치 않게 끝났습니다")
+        chunk = self.data[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def varint(self):
+        value = shift = 0
+        while True:
+            byte = self._take(1)[0]
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+            if shift > 63:
+                raise ValueError("와이어 형식 오류: varint가 너무 깁니다")
+
+    def byte(self):
+        return self._take(1)[0]
+
+    def raw(self):
+        return bytes(self._take(self.varint()))
+
+    def string(self):
+        return self.raw().decode("utf-8")
+
+    def time(self):
+        value = _TIME.unpack(self._take(_TIME.size))[0]
+        return None if math.isnan(value) else value
+
+    def element(self, group):
+        kind = self.byte()
+        return group.deserialize(b"%d:%s" % (kind, base64.b64encode(self.raw())))
+
+    def finish(self):
+        if self.pos != len(self.data):
+            raise ValueError("와이어 형식 오류: 메시지 뒤에 데이터가 있습니다")
+
+
+# ---------------------------------------------------------------------------
+# 정책 트리
+# ---------------------------------------------------------------------------
+
+
+def _policy_layout(policy_str):
+    """정책 문자열의 이진 트리와 share 리프 라벨(암호문 Cy 키) 순서"""
+    layout = _policy_cache.get(policy_str)
+    if layout is None:
+        binary = parse_binary_policy(policy_str)
+        layout = (binary, [label for label, _ in binary_policy_leaves(binary)])
+        _policy_cache.put(policy_str, layout)
+    return layout
+
+
+def _write_policy(writer, policy_str):
+    binary, labels = _policy_layout(policy_str)
+
+    names, nodes = [], []
+    index = {}
+
+    def walk(node):
+        if isinstance(node, AttributeLeaf):
+            if node.name not in index:
+                index[node.name] = len(names)
+                names.append(node.name)
+            nodes.append(index[node.name] + 2)
+            return
+        op, left, right = node
+        nodes.append(_NODE_AND if op == "and" else _NODE_OR)
+        walk(left)
+        walk(right)
+
+    walk(binary)
+    writer.varint(len(names))
+    for name in names:
+        writer.string(name)
+    for code in nodes:
+        writer.varint(code)
+    return labels
+
+
+def _read_policy(reader):
+    names = [reader.string() for _ in range(reader.varint())]
+
+    def node():
+        code = reader.varint()
+        if code >= 2:
+            if code - 2 >= len(names):
+                raise ValueError("와이어 형식 오류: 정책 속성 색인이 범위를 벗어났습니다")
+            return names[code - 2]
+        op = "and" if code == _NODE_AND else "or"
+        return f"({node()} {op} {node()})"
+
+    policy_str = node()
+    return policy_str, _policy_layout(policy_str)[1]
+
+
+# ---------------------------------------------------------------------------
+# 암호문
+# ---------------------------------------------------------------------------
+
+
+def _write_bsw07(writer, group, ciphertext):
+    labels = _write_policy(writer, ciphertext["policy"])
+    writer.element(group, ciphertext["C_tilde"])
+    writer.element(group, ciphertext["C"])
+    for label in labels:
+        writer.element(group, ciphertext["Cy"][label])
+        writer.element(group, ciphertext["Cyp"][label])
+
+    # 온라인/오프라인 암호화의 share 보정값 (없으면 0개)
+    deltas = ciphertext.get("Cy_delta") or {}
+    writer.varint(len(deltas))
+    for position, label in enumerate(labels):
+        if label in deltas:
+            writer.varint(position)
+            writer.element(group, deltas[label])
+
+
+def _read_bsw07(reader, group):
+    policy_str, labels = _read_policy(reader)
+    ciphertext = {
+        "C_tilde": reader.element(group),
+        "C": reader.element(group),
+        "Cy": {},
+        "Cyp": {},
+        "policy": policy_str,
+        "attributes": list(labels),
+    }
+    for label in labels:
+        ciphertext["Cy"][label] = reader.element(group)
+        ciphertext["Cyp"][label] = reader.element(group)
+
+    deltas = {}
+    for _ in range(reader.varint()):
+        position = reader.varint()
+        if position >= len(labels):
+            raise ValueError("와이어 형식 오류: 리프 색인이 범위를 벗어났습니다")
+        deltas[labels[position]] = reader.element(group)
+    if deltas:
+        ciphertext["Cy_delta"] = deltas
+    return ciphertext
+
+
+def encode_ciphertext(group, ciphertext):
+    """CP-ABE 암호문(일반/하이브리드/브로드캐스트)을 와이어 바이트로 인코딩"""
+    if ciphertext.get("mode") == HYBRID_MODE:
+        writer = _Writer(KIND_HYBRID)
+        writer.byte(_CT_STRING if ciphertext.get("is_string") else 0)
+        _write_bsw07(writer, group, ciphertext["header"])
+        writer.raw(ciphertext["nonce"])
+        writer.raw(ciphertext["payload"])
+        return bytes(writer.buf)
+
+    if ciphertext.get("mode") == BROADCAST_MODE:
+        writer = _Writer(KIND_BROADCAST)
+        writer.byte(_CT_STRING if ciphertext.get("is_string") else 0)
+        writer.varint(len(ciphertext["headers"]))
+        for entry in ciphertext["headers"]:
+            _write_bsw07(writer, group, entry["header"])
+            writer.raw(entry["nonce"])
+            writer.raw(entry["wrapped_key"])
+        writer.raw(ciphertext["nonce"])
+        writer.raw(ciphertext["payload"])
+        return bytes(writer.buf)
+
+    writer = _Writer(KIND_CIPHERTEXT)
+    flags = 0
+    if ciphertext.get("is_string"):
+        flags |= _CT_STRING
+    if ciphertext.get("serialized_data") is not None:
+        flags |= _CT_SERIALIZED
+    writer.byte(flags)
+    _write_bsw07(writer, group, ciphertext)
+    if flags & _CT_SERIALIZED:
+        writer.string(ciphertext["serialized_data"])
+    return bytes(writer.buf)
+
+
+def _decode_ciphertext(reader, group):
+    flags = reader.byte()
+    if reader.kind == KIND_HYBRID:
+        header = _read_bsw07(reader, group)
+        return {
+            "mode": HYBRID_MODE,
+            "header": header,
+            "nonce": reader.raw(),
+            "payload": reader.raw(),
+            "is_string": bool(flags & _CT_STRING),
+        }
+
+    if reader.kind == KIND_BROADCAST:
+        headers = []
+        for _ in range(reader.varint()):
+            header = _read_bsw07(reader, group)
+            headers.append(
+                {"header": header, "nonce": reader.raw(), "wrapped_key": reader.raw()}
+            )
+        return {
+            "mode": BROADCAST_MODE,
+            "headers": headers,
+            "nonce": reader.raw(),
+            "payload": reader.raw(),
+            "is_string": bool(flags & _CT_STRING),
+        }
+
+    ciphertext = _read_bsw07(reader, group)
+    if flags & _CT_SERIALIZED:
+        ciphertext["serialized_data"] = reader.string()
+    if flags & _CT_STRING:
+        ciphertext["is_string"] = True
+    return ciphertext
+
+
+# ---------------------------------------------------------------------------
+# 기기 키 / 갱신 컴포넌트
+# ---------------------------------------------------------------------------
+
+
+def _write_components(writer, group, dj, djp):
+    writer.varint(len(dj))
+    for attr, value in dj.items():
+        writer.string(attr)
+        writer.element(group, value)
+        writer.element(group, djp[attr])
+
+
+def _read_components(reader, group):
+    dj, djp = {}, {}
+    for _ in range(reader.varint()):
+        attr = reader.string()
+        dj[attr] = reader.element(group)
+        djp[attr] = reader.element(group)
+    return dj, djp
+
+
+def encode_key(group, key):
+    """
+    기기 키를 와이어 바이트로 인코딩
+
+    키 컴포넌트(D, Dj, Djp)와 동적 속성별 (이름, 현재 값, 키 속성, valid_until, 코호트)만
+    싣습니다. 발급 이력, 갱신 횟수 등 기관 측 메타데이터는 포함하지 않습니다.
+    """
+    writer = _Writer(KIND_KEY)
+    writer.byte(_KEY_TRANSFORM if key.get("transform_key") else 0)
+    writer.element(group, key["D"])
+    _write_components(writer, group, key["Dj"], key["Djp"])
+
+    attrs = list(key["Dj"])
+    expiry_info = key.get("expiry_info", {})
+    attr_mapping = key.get("attr_mapping", {})
+    dynamic = [
+        name
+        for name in key.get("dynamic_attributes", {})
+        if name in expiry_info and attr_mapping.get(name) in key["Dj"]
+    ]
+    writer.varint(len(dynamic))
+    for name in dynamic:
+        info = expiry_info[name] if isinstance(expiry_info[name], dict) else {}
+        cohort = info.get("cohort")
+        writer.string(name)
+        writer.string(key["dynamic_attributes"][name])
+        writer.varint(attrs.index(attr_mapping[name]))
+        writer.time(info.get("valid_until"))
+        writer.varint(0 if cohort is None else cohort + 1)
+    return bytes(writer.buf)
+
+
+def _decode_key(reader, group):
+    flags = reader.byte()
+    key = {"D": reader.element(group)}
+    key["Dj"], key["Djp"] = _read_components(reader, group)
+    attrs = list(key["Dj"])
+    key["S"] = list(attrs)
+    if flags & _KEY_TRANSFORM:
+        key["transform_key"] = True
+
+    key["dynamic_attributes"] = {}
+    key["expiry_info"] = {}
+    key["attr_mapping"] = {}
+    key["update_history"] = []
+    deadlines = []
+    for _ in range(reader.varint()):
+        name = reader.string()
+        value = reader.string()
+        position = reader.varint()
+        if position >= len(attrs):
+            raise ValueError("와이어 형식 오류: 키 속성 색인이 범위를 벗어났습니다")
+        valid_until = reader.time()
+        cohort = reader.varint()
+
+        key["dynamic_attributes"][name] = value
+        key["attr_mapping"][name] = attrs[position]
+        info = {"valid_until": valid_until}
+        if cohort:
+            info["cohort"] = cohort - 1
+        key["expiry_info"][name] = info
+        deadlines.append(valid_until)
+
+    # 키 전체 유효 기한 (DynamicCPABE._key_valid_until과 같은 규칙)
+    if any(deadline is None for deadline in deadlines):
+        key["valid_until"] = None
+    else:
+        key["valid_until"] = min(deadlines, default=float("inf"))
+    return key
+
+
+def encode_update(group, update):
+    """속성 갱신 컴포넌트(issue_attribute_updates 결과 항목)를 와이어 바이트로 인코딩"""
+    writer = _Writer(KIND_UPDATE)
+    transform = update.get("transform_attribute_key")
+    writer.byte(_UPDATE_TRANSFORM if transform else 0)
+    writer.string(update["attribute_name"])
+    writer.string(update["attribute_value"])
+    writer.time(update.get("issue_time"))
+    writer.time(update.get("valid_until"))
+    components = update["attribute_key"]
+    _write_components(writer, group, components["Dj"], components["Djp"])
+    if transform:
+        _write_components(writer, group, transform["Dj"], transform["Djp"])
+    return bytes(writer.buf)
+
+
+def _decode_update(reader, group):
+    flags = reader.byte()
+    update = {
+        "attribute_name": reader.string(),
+        "attribute_value": reader.string(),
+        "issue_time": reader.time(),
+        "valid_until": reader.time(),
+    }
+    dj, djp = _read_components(reader, group)
+    update["attribute_key"] = {"Dj": dj, "Djp": djp}
+    if flags & _UPDATE_TRANSFORM:
+        dj, djp = _read_components(reader, group)
+        update["transform_attribute_key"] = {"Dj": dj, "Djp": djp}
+    return update
+
+
+# ---------------------------------------------------------------------------
+# 공통 진입점
+# ---------------------------------------------------------------------------
+
+
+def encode(group, obj):
+    """객체 형태에 따라 암호문/키/갱신 컴포넌트로 인코딩"""
+    if not isinstance(obj, dict):
+        raise ValueError(f"와이어 인코딩을 지원하지 않는 형식: {type(obj).__name__}")
+    if "attribute_key" in obj:
+        return encode_update(group, obj)
+    if "D" in obj and "Dj" in obj:
+        return encode_key(group, obj)
+    if obj.get("mode") in (HYBRID_MODE, BROADCAST_MODE) or "C_tilde" in obj:
+        return encode_ciphertext(group, obj)
+    raise ValueError("와이어 인코딩을 지원하지 않는 형식입니다")
+
+
+def decode(group, data):
+    """와이어 바이트를 종류 바이트에 따라 복원"""
+    reader = _Reader(data)
+    if reader.kind in (KIND_CIPHERTEXT, KIND_HYBRID, KIND_BROADCAST):
+        obj = _decode_ciphertext(reader, group)
+    elif reader.kind == KIND_KEY:
+        obj = _decode_key(reader, group)
+    elif reader.kind == KIND_UPDATE:
+        obj = _decode_update(reader, group)
+    else:
+        raise ValueError(f"와이어 형식 오류: 알 수 없는 종류 {reader.kind}")
+    reader.finish()
+    return obj
+
+
+def wire_size(group, obj):
+    """객체의 실제 전송 바이트 수"""
+    return len(encode(group, obj))
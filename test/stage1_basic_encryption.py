@@ -3,6 +3,9 @@
 - 키 생성
 - 정책 기반 암호화
 - 파일 암호화/복호화
+- 최소 페어링 복호화 계획
+- 바이너리 전송 형식 크기/왕복
+- FAME(BN254) 백엔드 암호화/복호화
 """
 
 import os
@@ -17,6 +20,8 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from cp_abe.dynamic_cpabe import DynamicCPABE
+from cp_abe.hybrid import serialize_header
+from cp_abe.policy import PolicySyntaxError
 from cryptography.fernet import Fernet
 
 
@@ -139,6 +144,107 @@ def main():
     except Exception as e:
         print(f"예상대로 복호화 실패: {e}")
 
+    # 6-1. 괄호/임계값 정책 테스트
+    print("\n[6-1] 괄호/임계값 정책 테스트")
+    threshold_policies = [
+        "model and (region or warranty)",
+        "2 of (model, serialNumber, warranty)",
+        "region and 2 of (model, warranty, subscription)",
+    ]
+    for policy in threshold_policies:
+        compiled = cpabe.compile_policy(policy)
+        sym_key, header = cpabe.encapsulate(policy)
+        results = []
+        for label, test_key in [("기기 키", key), ("다른 키", other_key)]:
+            try:
+                results.append(f"{label}={cpabe.decapsulate(header, test_key) == sym_key}")
+            except ValueError:
+                results.append(f"{label}=거부")
+        print(f"{policy} -> {compiled.policy_str}: {', '.join(results)}")
+    oversized = "8 of (" + ", ".join(f"sensor{i}" for i in range(16)) + ")"
+    try:
+        cpabe.compile_policy(oversized)
+        print("과대 임계값 정책 허용 (비정상)")
+    except PolicySyntaxError as e:
+        print(f"과대 임계값 정책 거부 (정상): {e}")
+    print(f"정책 컴파일 캐시: {cpabe.policy_compiler.cache.stats()}")
+
+    # 6-1-1. 최소 페어링 복호화 계획 (여러 방법으로 만족하는 OR/임계값 정책)
+    print("\n[6-1-1] 최소 페어링 복호화 계획")
+    rich_key = cpabe.keygen(["model", "serialNumber", "region", "warranty"])
+    planned_policies = [
+        "(serialNumber and region and warranty) or model",
+        "2 of (serialNumber and region, warranty and region, model)",
+    ]
+    for policy in planned_policies:
+        sym_key, header = cpabe.encapsulate(policy)
+        plan = cpabe.plan_decryption(header, rich_key)
+        matched = cpabe.decapsulate(header, rich_key) == sym_key
+        print(
+            f"{policy}: 리프 {[attr for _, attr in plan.leaves]}, 페어링 {plan.pairings}회 "
+            f"(절약 {plan.pairings_saved}회), 복호화 일치 {matched}"
+        )
+    print(f"복호화 계획 캐시: {cpabe.decryption_plan_stats()}")
+
+    # 곱 페어링 엔진과 리프별 페어링 결과 비교
+    cpabe.multi_pairing = False
+    sequential = cpabe._bsw07_blinded_secret(header, rich_key)
+    cpabe.multi_pairing = True
+    product = cpabe._bsw07_blinded_secret(header, rich_key)
+    print(f"곱 페어링 엔진 결과 일치: {product == sequential}")
+
+    # 6-2. 바이너리 전송 형식 (압축 점 직렬화 + varint 정책 트리)
+    print("\n[6-2] 바이너리 전송 형식 테스트")
+    if encrypted is not None:
+        wire_items = [
+            ("암호문", encrypted),
+            ("기기 키", key),
+            ("하이브리드 암호문", cpabe.encrypt(b"\x00" * 4096, access_policy)),
+        ]
+        for label, obj in wire_items:
+            data = cpabe.to_wire(obj)
+            try:
+                json_size = f"{len(serialize_header(cpabe.group, obj))}B"
+            except (TypeError, AttributeError):
+                json_size = "-"
+            print(f"{label}: 와이어 {len(data)}B (JSON 직렬화 {json_size})")
+
+        wire_ct = cpabe.from_wire(cpabe.to_wire(encrypted))
+        wire_key = cpabe.from_wire(cpabe.to_wire(key))
+        print(f"왕복 후 복호화 일치: {cpabe.decrypt(wire_ct, wire_key) == message}")
+        try:
+            cpabe.from_wire(cpabe.to_wire(encrypted)[:-1])
+            print("잘린 메시지 검출 실패 (비정상)")
+        except ValueError as e:
+            print(f"잘린 메시지 거부 (정상): {e}")
+
+    # 6-3. 비대칭(Type-III) 곡선의 FAME 백엔드
+    print("\n[6-3] FAME(BN254) 백엔드 테스트")
+    fame = DynamicCPABE(backend="fame")
+    fame.setup()
+    fame_key = fame.keygen(["model", "serialNumber", "region"])
+    fame_other_key = fame.keygen(["warranty"])
+    print(f"백엔드: {fame.backend}")
+    for label, plaintext, policy in [
+        ("문자열", message, access_policy),
+        ("하이브리드", b"\x00" * 4096, "model and (region or warranty)"),
+        ("임계값", message, "2 of (serialNumber, region, warranty)"),
+    ]:
+        fame_ct = fame.encrypt(plaintext, policy)
+        matched = fame.decrypt(fame_ct, fame_key) == plaintext
+        rejected = not fame.can_decrypt(fame_ct, fame_other_key)
+        print(f"{label} ({policy}): 복호화 일치 {matched}, 불만족 키 사전 거부 {rejected}")
+    try:
+        fame.decrypt(fame_ct, fame_other_key)
+        print("불만족 키 복호화 성공 (비정상)")
+    except Exception as e:
+        print(f"예상대로 복호화 실패: {e}")
+    try:
+        fame.to_wire(fame_ct)
+        print("BSW07 전용 기능 사용 (비정상)")
+    except ValueError as e:
+        print(f"BSW07 전용 기능 거부 (정상): {e}")
+
     # 7. 파일 암호화/복호화 테스트 - 직렬화 수정
     print("\n[7] 실제 파일 암호화/복호화 테스트 (직렬화 지원)")
 
@@ -4,6 +4,8 @@
 - 만료되는 구독/보증 속성 테스트
 - 부분 키 갱신 테스트
 - 실시간 속성 변경 모니터링
+- 기기 전체 속성 일괄 평가 (NumPy)
+- 코호트 위상 오프셋으로 에포크 전환 분산
 """
 
 import os
@@ -11,13 +13,20 @@ import sys
 import time
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # 상위 디렉토리를 모듈 경로에 추가
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from cp_abe.dynamic_cpabe import DynamicCPABE
-from cp_abe.fading_functions import LinearFadingFunction, HardExpiryFadingFunction
+from cp_abe.fading_functions import (
+    LinearFadingFunction,
+    HardExpiryFadingFunction,
+    INVALID_INTERVAL,
+    MAX_COHORTS,
+)
 
 
 def main():
@@ -202,6 +211,87 @@ def main():
         except Exception as e:
             print(f"'{name}' 복호화 실패: 속성 값 변경으로 인한 불일치")
 
+    # 10. 기기 전체 속성 일괄 평가 (NumPy)
+    print("\n[10] 기기 전체 속성 일괄 평가")
+    fleet_size = 100000
+    fleet_function = LinearFadingFunction("subscription", 3600)
+    now = time.time()
+    rng = np.random.default_rng(0)
+    base_times = now - rng.uniform(3600, 86400, fleet_size)  # 기기별 등록 시각
+
+    # 기기가 보유한 값: 등록 시각 기준 직전 구간 또는 현재 구간
+    held_intervals = fleet_function.compute_intervals(
+        now - rng.choice([0, 3600], fleet_size), base_times
+    )
+
+    start_time = time.time()
+    valid_mask = fleet_function.is_valid_batch(held_intervals, now, base_times)
+    deadlines = fleet_function.valid_until_batch(now, base_times)
+    batch_time = time.time() - start_time
+    print(
+        f"{fleet_size}대 일괄 평가: {batch_time:.4f}초, "
+        f"유효 {int(valid_mask.sum())}대, 만료 {int((~valid_mask).sum())}대"
+    )
+    print(f"10분 내 값이 바뀌는 기기: {int((deadlines <= now + 600).sum())}대")
+
+    # 문자열은 필요한 기기에 대해서만 생성
+    sample_values = fleet_function.format_values(held_intervals[:3])
+    print(f"샘플 속성 값: {sample_values}")
+
+    # 11. 코호트 위상 오프셋 - 기기들의 에포크 전환 시각 분산
+    print("\n[11] 코호트 위상 오프셋 테스트")
+    cohort_cpabe = DynamicCPABE()
+    cohort_cpabe.setup()
+    cohort_function = LinearFadingFunction("subscription", 8)
+    cohort_function.set_cohorts(4)  # 2초 간격으로 4개 코호트
+    cohort_cpabe.register_fading_function("subscription", cohort_function)
+
+    cohort_keys = {}
+    for i in range(8):
+        cohort_user = cohort_cpabe.create_user_record(f"cohort-device-{i}")
+        cohort_keys[cohort_user] = cohort_cpabe.keygen_with_dynamic_attributes(
+            cohort_user, ["model", "subscription"]
+        )
+
+    now = time.time()
+    for cohort_user, cohort_key in cohort_keys.items():
+        info = cohort_key["expiry_info"]["subscription"]
+        print(
+            f"{cohort_user}: 코호트 {info['cohort']}, "
+            f"값 {cohort_key['dynamic_attributes']['subscription']}, "
+            f"{cohort_key['valid_until'] - now:.1f}초 후 전환"
+        )
+
+    cohort_message = cohort_cpabe.encrypt_with_dynamic_attributes(
+        "코호트 공용 메시지", ["model", "subscription"]
+    )
+    print(f"현재 코호트 값 (정책 OR 대상): {cohort_function.current_values()}")
+    success = sum(
+        1
+        for cohort_key in cohort_keys.values()
+        if cohort_cpabe.decrypt(cohort_message, cohort_key) == "코호트 공용 메시지"
+    )
+    print(f"모든 코호트 키 복호화: {success}/{len(cohort_keys)}")
+
+    # 코호트 키를 일괄 평가 API로 검사 (코호트 접미사 해석 + 코호트별 기준 시각)
+    cohort_ids = [key["expiry_info"]["subscription"]["cohort"] for key in cohort_keys.values()]
+    held_values = [key["dynamic_attributes"]["subscription"] for key in cohort_keys.values()]
+    held_intervals = cohort_function.parse_intervals(held_values, cohort_ids)
+    cohort_base_times = cohort_function.cohort_base_times(cohort_ids)
+    valid_mask = cohort_function.is_valid_batch(held_intervals, time.time(), cohort_base_times)
+    print(f"코호트 키 일괄 평가 유효: {int(valid_mask.sum())}/{len(cohort_keys)}")
+    print(
+        f"값 왕복 일치: "
+        f"{cohort_function.format_values(held_intervals, cohort_ids) == held_values}"
+    )
+    other_cohorts = [(cohort + 1) % cohort_function.cohorts for cohort in cohort_ids]
+    mismatched = cohort_function.parse_intervals(held_values, other_cohorts)
+    print(f"다른 코호트 기준 해석 거부: {bool((mismatched == INVALID_INTERVAL).all())}")
+    print(
+        f"암호화 정책 리프 수: {len(cohort_message['attributes'])} "
+        f"(코호트 {cohort_function.cohorts}개, 최대 {MAX_COHORTS}개)"
+    )
+
 
 if __name__ == "__main__":
     main()
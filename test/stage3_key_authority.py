@@ -4,10 +4,16 @@
 - 구독 및 보증 갱신 정책 설정
 - 기기 비활성화
 - 갱신 제한 및 허용 기기 테스트
+- 기기 일괄 등록 (프로세스 풀 키 생성)
+- 일괄 갱신 요청 처리 (갱신 폭주)
+- SQLite 기기 저장소 (새 CP-ABE 시스템으로 재시작 후 상태/만료 인덱스/갱신 유지, 만료 임박 기기 조회)
+- 만료 시각 인덱스 (만료 임박 기기 조회/꺼내기)
+- FAME(BN254) 백엔드 키 인증 기관 (일괄 등록/갱신, 부분 키 갱신 병합)
 """
 
 import os
 import sys
+import tempfile
 import time
 from datetime import datetime, timedelta
 
@@ -19,6 +25,9 @@ if parent_dir not in sys.path:
 from cp_abe.dynamic_cpabe import DynamicCPABE
 from cp_abe.key_authority import KeyAuthority
 from cp_abe.fading_functions import LinearFadingFunction, HardExpiryFadingFunction
+from cp_abe.storage import SQLiteDeviceStore
+from cp_abe.hybrid import serialize_header, deserialize_header
+from cp_abe.clock import ManualClock
 
 
 def main():
@@ -207,6 +216,243 @@ def main():
     else:
         print(f"  갱신 실패 (정상): {renewal_result.get('reason', '알 수 없는 이유')}")
 
+    print(f"\n정적 속성 갱신 시도 (실패 예상, 갱신 횟수 변화 없음):")
+    renewal_result = authority.request_attribute_renewal(device_id, "model")
+    print(f"  결과: {renewal_result}")
+    print(f"  갱신 횟수: {authority.get_device_info(device_id).get('renewal_count')}")
+
+    # 12. 기기 일괄 등록 (프로세스 풀 키 생성)
+    print("\n[12] 기기 일괄 등록 테스트")
+    batch_count = 200
+    devices = (
+        (f"batch-device-{i:05d}", ["model", "serialNumber"]) for i in range(batch_count)
+    )
+    start_time = time.time()
+    registered = 0
+    last_device = None
+    for device_id, key in authority.register_devices(devices, workers=2, batch_size=50):
+        registered += 1
+        last_device = (device_id, key)
+    elapsed = time.time() - start_time
+    print(f"{registered}대 등록 완료: {elapsed:.4f}초 ({registered / elapsed:.1f}대/초)")
+
+    device_id, key = last_device
+    print(f"마지막 기기 정보: {authority.get_device_info(device_id)}")
+    try:
+        # 현재 구독 에포크로 다시 암호화
+        current_update = cpabe.encrypt_with_dynamic_attributes(update_message, policy)
+        decrypted = cpabe.decrypt(current_update, key)
+        print(f"일괄 등록 키로 복호화 성공: {decrypted}")
+    except Exception as e:
+        print(f"일괄 등록 키로 복호화 실패: {str(e)}")
+
+    # 13. 일괄 갱신 요청 처리 (에포크 경계 갱신 폭주)
+    print("\n[13] 일괄 갱신 요청 테스트")
+    renewal_requests = [
+        (f"batch-device-{i:05d}", "subscription") for i in range(batch_count)
+    ]
+    renewal_requests += [
+        (inactive_device_id, "subscription"),  # 비활성 기기
+        ("unknown-device", "subscription"),  # 미등록 기기
+        (device_id, "warranty"),  # 최대 1회 갱신
+        (device_id, "warranty"),  # 같은 배치 안의 두 번째 요청
+    ]
+    start_time = time.time()
+    results = authority.request_attribute_renewals(
+        renewal_requests, workers=2, chunk_size=50
+    )
+    elapsed = time.time() - start_time
+    approved = sum(1 for result in results if result["success"])
+    print(
+        f"{len(results)}건 처리: 승인 {approved}건, 거부 {len(results) - approved}건, "
+        f"{elapsed:.4f}초 ({len(results) / elapsed:.1f}건/초)"
+    )
+    for request, result in zip(renewal_requests[-4:], results[-4:]):
+        print(f"  {request}: {result.get('reason', '승인')}")
+
+    key = cpabe.merge_attribute_to_key(key, results[batch_count - 1]["attribute"])
+    try:
+        current_update = cpabe.encrypt_with_dynamic_attributes(update_message, policy)
+        decrypted = cpabe.decrypt(current_update, key)
+        print(f"일괄 갱신 키로 복호화 성공: {decrypted}")
+    except Exception as e:
+        print(f"일괄 갱신 키로 복호화 실패: {str(e)}")
+    authority.shutdown()
+
+    # 14. SQLite 기기 저장소
+    print("\n[14] SQLite 기기 저장소 테스트")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "devices.db")
+        store = SQLiteDeviceStore(db_path)
+        sqlite_authority = KeyAuthority(cpabe, store=store)
+        sqlite_authority.set_renewal_policy("subscription", renewal_period_days=30)
+
+        sqlite_keys = dict(
+            sqlite_authority.register_devices(
+                ((f"sqlite-device-{i:03d}", ["model"]) for i in range(50)), workers=1
+            )
+        )
+        sqlite_authority.register_device("sqlite-trial-device", ["model"], 3)
+        sqlite_authority.set_device_inactive("sqlite-device-000", reason="returned")
+        sqlite_authority.request_attribute_renewals(
+            [(f"sqlite-device-{i:03d}", "subscription") for i in range(1, 11)],
+            workers=1,
+        )
+        store.close()
+
+        # 재시작: 새 CP-ABE 시스템에 공개 파라미터/마스터 키와 페이딩 함수 설정만 복원하고
+        # 같은 파일로 저장소를 다시 열기 (기기 상태/만료 인덱스/키 난수는 저장소에서 복원)
+        params = {
+            name: serialize_header(cpabe.group, getattr(cpabe, name)) for name in ("pk", "mk")
+        }
+        restarted_cpabe = DynamicCPABE()
+        for name, data in params.items():
+            setattr(restarted_cpabe, name, deserialize_header(restarted_cpabe.group, data))
+        for name, fading_function in cpabe.fading_functions.items():
+            restarted_cpabe.register_fading_function(name, fading_function)
+
+        store = SQLiteDeviceStore(db_path)
+        restarted = KeyAuthority(restarted_cpabe, store=store)
+        restarted.set_renewal_policy("subscription", renewal_period_days=30)
+        print(f"저장된 기기 수: {len(store)}")
+        print(f"재시작 후 기기 정보: {restarted.get_device_info('sqlite-device-001')}")
+        print(f"재구성된 만료 인덱스 크기: {len(restarted.expiry_index)}")
+
+        renewal_result = restarted.request_attribute_renewal(
+            "sqlite-device-005", "subscription"
+        )
+        print(f"재시작 후 갱신: {renewal_result['success']}")
+        renewed_key = restarted_cpabe.merge_attribute_to_key(
+            sqlite_keys["sqlite-device-005"], renewal_result["attribute"]
+        )
+        restarted_update = restarted_cpabe.encrypt_with_dynamic_attributes(
+            update_message, policy
+        )
+        print(
+            f"재시작 후 갱신 키로 복호화: "
+            f"{restarted_cpabe.decrypt(restarted_update, renewed_key)}"
+        )
+        results = restarted.request_attribute_renewals(
+            [("sqlite-device-000", "subscription"), ("sqlite-device-011", "subscription")],
+            workers=1,
+        )
+        print(f"재시작 후 일괄 갱신: {[result.get('reason', '승인') for result in results]}")
+        print(f"7일 이내 구독 만료 기기: {len(restarted.get_expiring_devices(7))}대")
+        print(f"비활성 기기: {len(store.find_by_status('inactive'))}대")
+        print(
+            f"구독 1회 이상 갱신 기기: {len(store.find_by_renewal_count('subscription', 1))}대"
+        )
+        print(f"조회 캐시 통계: {store.cache_stats()}")
+        store.close()
+
+    # 15. 만료 시각 인덱스
+    print("\n[15] 만료 시각 인덱스 테스트")
+    for device_id, days in [("trial-device-001", 2), ("trial-device-002", 5)]:
+        authority.register_device(device_id, ["model"], days)
+    print(f"인덱스 크기: {len(authority.expiry_index)}")
+
+    # 인덱스는 기기 해시 기준 - 출력용으로 기기 ID에 대응
+    trial_names = {
+        authority._create_device_hash(device_id): device_id
+        for device_id in ("trial-device-001", "trial-device-002")
+    }
+
+    upcoming = list(authority.expiry_index.iter_expiring(timedelta(days=7)))
+    print(f"7일 이내 만료 예정: {[trial_names[device_hash] for device_hash, _ in upcoming]}")
+
+    authority.set_device_inactive("trial-device-002", reason="trial_cancelled")
+    upcoming = list(authority.expiry_index.iter_expiring(timedelta(days=7)))
+    print(
+        f"비활성화 후 7일 이내 만료 예정: "
+        f"{[trial_names[device_hash] for device_hash, _ in upcoming]}"
+    )
+
+    expired = authority.expiry_index.pop_expiring(datetime.now() + timedelta(days=3))
+    for device_hash, expiry in expired:
+        print(
+            f"3일 이내 만료 (갱신 알림 대상): {trial_names[device_hash]}, "
+            f"{datetime.fromtimestamp(expiry)}"
+        )
+    print(f"꺼낸 후 인덱스 크기: {len(authority.expiry_index)}")
+
+    # 16. FAME 백엔드 키 인증 기관
+    print("\n[16] FAME(BN254) 백엔드 키 인증 기관 테스트")
+    clock = ManualClock()
+    fame_cpabe = DynamicCPABE(clock=clock, backend="fame")
+    fame_cpabe.setup()
+    fame_cpabe.register_fading_function(
+        "subscription", LinearFadingFunction("subscription", 600, clock=clock)
+    )
+    fame_authority = KeyAuthority(fame_cpabe)
+    fame_authority.set_renewal_policy("subscription", renewal_period_days=30)
+    print(f"백엔드: {fame_cpabe.backend}")
+
+    fame_keys = dict(
+        fame_authority.register_devices(
+            ((f"fame-device-{i:02d}", ["model"]) for i in range(8)),
+            workers=2,
+            batch_size=4,
+        )
+    )
+    fame_policy = ["model", "subscription"]
+    fame_update = fame_cpabe.encrypt_with_dynamic_attributes(update_message, fame_policy)
+    device_id = "fame-device-07"
+    print(f"일괄 등록 키로 복호화: {fame_cpabe.decrypt(fame_update, fame_keys[device_id])}")
+
+    # 다음 에포크에서 구독 속성 컴포넌트만 갱신
+    clock.advance(600)
+    fame_update = fame_cpabe.encrypt_with_dynamic_attributes(update_message, fame_policy)
+    stale_key = fame_keys[device_id]
+    print(f"갱신 전 키로 복호화 가능: {fame_cpabe.can_decrypt(fame_update, stale_key)}")
+    results = fame_authority.request_attribute_renewals(
+        [(f"fame-device-{i:02d}", "subscription") for i in range(8)],
+        workers=2,
+        chunk_size=4,
+    )
+    approved = sum(1 for result in results if result["success"])
+    print(f"일괄 갱신 승인: {approved}/{len(results)}건")
+    renewed_key = fame_cpabe.merge_attribute_to_key(stale_key, results[-1]["attribute"])
+    print(f"병합 후 키 속성: {renewed_key['S']}")
+    print(f"갱신 키로 복호화: {fame_cpabe.decrypt(fame_update, renewed_key)}")
+
+    # 시계가 흐른 뒤 재사용된 작업자 풀에서 발급한 키도 현재 에포크여야 함
+    clock.advance(600)
+    late_keys = dict(
+        fame_authority.register_devices(
+            ((f"fame-late-{i:02d}", ["model"]) for i in range(8)),
+            workers=2,
+            batch_size=4,
+        )
+    )
+    current_value = fame_cpabe.compute_attribute_value("subscription")
+    late_ok = all(
+        key["issue_time"] == clock.time()
+        and key["dynamic_attributes"]["subscription"] == current_value
+        and fame_cpabe.check_key_validity(key)["valid"]
+        for key in late_keys.values()
+    )
+    print(f"시계 진행 후 일괄 등록 키가 현재 에포크로 발급됨: {late_ok}")
+    assert late_ok
+
+    # 코호트 설정이 바뀌면 작업자 풀을 다시 만들어 코호트 값으로 발급해야 함
+    fame_cpabe.fading_functions["subscription"].set_cohorts(4)
+    cohort_keys = dict(
+        fame_authority.register_devices(
+            ((f"fame-cohort-{i:02d}", ["model"]) for i in range(8)),
+            workers=2,
+            batch_size=4,
+        )
+    )
+    cohort_ok = all(
+        key["dynamic_attributes"]["subscription"]
+        == fame_cpabe.compute_attribute_value("subscription", user_id=device_id)
+        and "cohort" in key["expiry_info"]["subscription"]
+        for device_id, key in cohort_keys.items()
+    )
+    print(f"코호트 설정 변경 후 일괄 등록 키가 코호트 값으로 발급됨: {cohort_ok}")
+    assert cohort_ok
+    fame_authority.shutdown()
+
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,7 @@
 - 차량 구독 서비스 시뮬레이션
 - 다수 IoT 기기 확장성 테스트
 - 오프라인 만료 검증
+- 이산 사건 플릿 시뮬레이션
 - 정책 변경 및 속성 추적
 """
 
@@ -22,6 +23,9 @@ if parent_dir not in sys.path:
 from cp_abe.dynamic_cpabe import DynamicCPABE
 from cp_abe.key_authority import KeyAuthority
 from cp_abe.fading_functions import LinearFadingFunction, HardExpiryFadingFunction
+from cp_abe.scheduler import ExpiryScheduler
+from cp_abe.clock import ManualClock
+from cp_abe.simulation import FleetSimulator
 
 
 def car_subscription_scenario():
@@ -124,6 +128,27 @@ def car_subscription_scenario():
         except Exception as e:
             print(f"'{name}' 접근 실패: {str(e)}")
 
+    # 6-1. 다중 정책 브로드캐스트 - 펌웨어 1개를 세 정책으로 배포
+    print("\n[5-1] 다중 정책 브로드캐스트 (페이로드 1개 + 정책별 헤더)")
+    firmware = os.urandom(64 * 1024)
+    broadcast = cpabe.encrypt_broadcast_with_dynamic_attributes(
+        firmware, list(policies.values())
+    )
+    separate_size = sum(
+        cpabe.wire_size(cpabe.encrypt_with_dynamic_attributes(firmware, policy))
+        for policy in policies.values()
+    )
+    print(
+        f"전송 크기: 브로드캐스트 {cpabe.wire_size(broadcast)}B, "
+        f"정책별 개별 암호화 {separate_size}B"
+    )
+    selected = cpabe.select_broadcast_header(broadcast, key)
+    if selected is None:
+        print("만족하는 헤더 없음")
+    else:
+        print(f"선택된 헤더: {broadcast['headers'][selected]['header']['policy']}")
+        print(f"펌웨어 복호화 일치: {cpabe.decrypt(broadcast, key) == firmware}")
+
     # 7. 시간 경과 시뮬레이션
     print("\n[6] 시간 경과 시뮬레이션 (6초 대기)")
     time.sleep(6)
@@ -147,6 +172,16 @@ def car_subscription_scenario():
             else:
                 print(f"'{name}' 접근 실패: {str(e)}")
 
+    # 만료 후에도 만족하는 헤더가 있으면 해당 정책으로 복호화 (구독 헤더는 제외)
+    selected = cpabe.select_broadcast_header(broadcast, key)
+    if selected is None:
+        print("브로드캐스트 펌웨어: 만족하는 헤더 없음")
+    else:
+        print(
+            f"브로드캐스트 펌웨어: {broadcast['headers'][selected]['header']['policy']} "
+            f"헤더로 복호화 {cpabe.decrypt(broadcast, key) == firmware}"
+        )
+
     print("\n차량 구독 시나리오 테스트 완료")
     return "차량 구독 테스트 완료"
 
@@ -296,15 +331,16 @@ def offline_expiry_test():
     """오프라인 상태에서 속성 만료 테스트"""
     print("\n===== 오프라인 만료 테스트 =====")
 
-    # 1. 시스템 초기화
-    cpabe = DynamicCPABE()
+    # 1. 시스템 초기화 (수동 시계 - 실제 대기 없이 시간 경과 시뮬레이션)
+    clock = ManualClock()
+    cpabe = DynamicCPABE(clock=clock)
     cpabe.setup()
 
     # 페이딩 함수 등록 (테스트를 위한 짧은 시간)
-    subscription_function = LinearFadingFunction("subscription", 5)
+    subscription_function = LinearFadingFunction("subscription", 5, clock=clock)
     cpabe.register_fading_function("subscription", subscription_function)
 
-    warranty_function = LinearFadingFunction("warranty", 10)
+    warranty_function = LinearFadingFunction("warranty", 10, clock=clock)
     cpabe.register_fading_function("warranty", warranty_function)
 
     # 2. 사용자 및 키 생성
@@ -342,9 +378,24 @@ def offline_expiry_test():
     print("\n오프라인 모드 전환...")
     print("기기가 서버에 연결할 수 없는 상태로 전환됨")
 
-    # 시간 경과 (구독 만료)
-    print("\n시간 경과 시뮬레이션 (6초)...")
-    time.sleep(6)
+    # 시간 경과 (구독 만료) - 폴링 없이 다음 전환 이벤트 대기
+    scheduler = ExpiryScheduler(cpabe.fading_functions, clock=clock)
+    key_expired = threading.Event()
+    scheduler.subscribe(
+        "subscription",
+        lambda name, old, new, when: print(f"속성 전환 이벤트: {old} -> {new}"),
+    )
+    scheduler.watch_key(key, lambda expired_key: key_expired.set())
+    print(
+        f"\n다음 만료까지 {scheduler.key_deadline(key) - clock.time():.1f}초 - "
+        "시간 경과 시뮬레이션 (수동 시계 6초 진행)..."
+    )
+    scheduler.start()
+    start_time = time.time()
+    clock.advance(6)
+    key_expired.wait(timeout=5)
+    scheduler.stop()
+    print(f"실제 소요 시간: {time.time() - start_time:.4f}초")
 
     # 오프라인 상태에서 만료 검사
     print("\n오프라인 상태에서 유효성 검사:")
@@ -361,10 +412,63 @@ def offline_expiry_test():
     except Exception as e:
         print(f"콘텐츠 접근 실패 (정상): {str(e)}")
 
+    # 여러 주기를 한 번에 건너뛴 뒤에도 도래한 전환을 모두 순서대로 처리
+    transitions = []
+    catch_up = ExpiryScheduler(cpabe.fading_functions, clock=clock)
+    catch_up.subscribe(
+        "subscription", lambda name, old, new, when: transitions.append(f"{old}->{new}")
+    )
+    clock.advance(subscription_function.lifetime_seconds * 3.5)
+    fired = catch_up.run_pending()
+    print(f"\n3.5주기 경과 후 전환 이벤트 {fired}회: {transitions}")
+    print(f"남은 도래 이벤트: {catch_up.run_pending()}회")
+
     print("\n오프라인 만료 테스트 완료 - 서버 연결 없이도 속성이 자동으로 만료됨")
     return "오프라인 만료 테스트 완료"
 
 
+def fleet_simulation_test():
+    """이산 사건 플릿 시뮬레이션 - 수개월 수명 주기를 수동 시계로 실행"""
+    print("\n===== 플릿 시뮬레이션 테스트 =====")
+
+    scenario = {
+        "name": "stage4",
+        "seed": 42,
+        "duration_days": 65,
+        "fleet": {"initial_devices": 200, "arrival_rate_per_day": 10, "key_sample": 10},
+        "subscription": {"period_days": 30, "cohorts": 4},
+        "releases": {"interval_days": 14, "decrypt_sample": 5},
+        "authority": {"batch_size": 64, "batch_window_seconds": 60},
+    }
+    print(f"\n[1] 시나리오: {scenario['duration_days']}일, 초기 기기 {scenario['fleet']['initial_devices']}대")
+    report = FleetSimulator(scenario).run()
+
+    print("\n[2] 시뮬레이션 결과")
+    print(f"실제 소요 시간: {report['wall_time']:.2f}초 (사건 {report['events']}개)")
+    fleet = report["fleet"]
+    print(f"등록 {fleet['registered']}대, 구독 유지 {fleet['subscribed']}대, 이탈 {fleet['lapsed']}대")
+    for kind, stats in report["authority"]["operations"].items():
+        latency = stats["latency_seconds"]
+        print(
+            f"{kind}: 요청 {stats['requests']}, 완료 {stats['completed']}, "
+            f"거부 {stats['rejected']}, 재시도 {stats['retries']}, 배치 {stats['batches']}, "
+            f"처리량 {stats['throughput_per_sec']:.0f}/초, "
+            f"지연 p50 {latency.get('p50', 0):.1f}초 / p99 {latency.get('p99', 0):.1f}초"
+        )
+    print(f"최대 대기열 깊이: {report['queue_depth']['max']}")
+    for release in report["releases"]:
+        print(
+            f"{release['time_days']:.0f}일차 배포: 표본 {release['sampled']}대 중 "
+            f"{release['decrypted']}대 복호화 (갱신 대기 {release['awaiting_renewal']}대)"
+        )
+        # 현재 에포크 키를 가진 표본 기기는 모두 복호화할 수 있어야 함
+        assert release["decrypted"] == release["sampled"]
+
+    renewals = report["authority"]["operations"]["renew"]["completed"]
+    print(f"\n플릿 시뮬레이션 테스트 완료 - 갱신 {renewals}건 처리")
+    return f"{report['simulated_days']:.0f}일 시뮬레이션 완료 (갱신 {renewals}건)"
+
+
 def main():
     print("\n===== 4단계 테스트: 실제 응용 시나리오 테스트 =====")
 
@@ -386,6 +490,12 @@ def main():
     print("=" * 50)
     result3 = offline_expiry_test()
 
+    # 4. 플릿 시뮬레이션
+    print("\n\n" + "=" * 50)
+    print("테스트 4: 플릿 시뮬레이션")
+    print("=" * 50)
+    result4 = fleet_simulation_test()
+
     # 결과 요약
     print("\n\n" + "=" * 50)
     print("테스트 결과 요약")
@@ -393,6 +503,7 @@ def main():
     print(f"1. 차량 구독 서비스 시나리오: {result1}")
     print(f"2. 확장성 테스트: {result2}")
     print(f"3. 오프라인 만료 테스트: {result3}")
+    print(f"4. 플릿 시뮬레이션: {result4}")
 
 
 if __name__ == "__main__":
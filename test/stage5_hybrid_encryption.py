@@ -0,0 +1,255 @@
+"""
+5단계 테스트: 하이브리드 KEM/DEM 암호화 테스트
+- CP-ABE 캡슐화 + AES-GCM 페이로드 암호화
+- 펌웨어 크기 페이로드 암호화/복호화
+- 정책 불만족 키 및 변조 검출
+- 파일/mmap 대상 청크 단위 스트리밍 암호화
+- 온라인/오프라인 암호화 (중간 암호문 풀)
+- 정책 세션 키 (세션당 캡슐화 1회, 에포크 종료 시 세션 만료)
+"""
+
+import os
+import sys
+import time
+import io
+import mmap
+import hashlib
+import tempfile
+
+# 상위 디렉토리를 모듈 경로에 추가
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from cp_abe.dynamic_cpabe import DynamicCPABE
+from cp_abe.fading_functions import LinearFadingFunction
+from cp_abe.session import SessionKeyCache
+from cp_abe.clock import ManualClock
+
+
+def file_digest(path):
+    """파일 SHA-256 (1MB 단위로 읽기)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def main():
+    print("\n===== 5단계 테스트: 하이브리드 KEM/DEM 암호화 =====")
+
+    # 1. CP-ABE 시스템 초기화
+    print("\n[1] CP-ABE 시스템 초기화")
+    cpabe = DynamicCPABE()
+    cpabe.setup()
+
+    # 2. 키 생성
+    print("\n[2] 기기 키 생성")
+    device_key = cpabe.keygen(["model", "serialNumber"])
+    other_key = cpabe.keygen(["region"])
+    print("정책 만족 키: ['model', 'serialNumber'], 불만족 키: ['region']")
+
+    policy = "model and serialNumber"
+
+    # 3. 페이로드 크기별 하이브리드 암호화
+    print("\n[3] 페이로드 크기별 하이브리드 암호화/복호화")
+    for size_mb in [1, 8, 32]:
+        firmware = os.urandom(size_mb * 1024 * 1024)
+
+        start_time = time.time()
+        encrypted = cpabe.encrypt_hybrid(firmware, policy)
+        encrypt_time = time.time() - start_time
+
+        start_time = time.time()
+        decrypted = cpabe.decrypt(encrypted, device_key)
+        decrypt_time = time.time() - start_time
+
+        print(
+            f"{size_mb}MB: 암호화 {encrypt_time:.4f}초, 복호화 {decrypt_time:.4f}초, "
+            f"일치: {decrypted == firmware}"
+        )
+
+    # 4. 문자열 메시지
+    print("\n[4] 문자열 메시지 하이브리드 암호화")
+    message = "하이브리드 모드로 암호화된 업데이트 공지"
+    encrypted = cpabe.encrypt_hybrid(message, policy)
+    decrypted = cpabe.decrypt(encrypted, device_key)
+    print(f"복호화 결과: {decrypted}")
+    print(f"원본 메시지와 일치: {decrypted == message}")
+
+    # 5. 정책 불만족 키
+    print("\n[5] 정책을 만족하지 않는 키로 복호화 시도")
+    print(
+        f"페어링 없는 사전 검사: 만족 키 {cpabe.can_decrypt(encrypted, device_key)}, "
+        f"불만족 키 {cpabe.can_decrypt(encrypted, other_key)}"
+    )
+    try:
+        cpabe.decrypt(encrypted, other_key)
+        print("복호화 성공 (비정상)")
+    except Exception as e:
+        print(f"예상대로 복호화 실패: {e}")
+
+    # 6. 페이로드 변조 검출
+    print("\n[6] 페이로드 변조 검출")
+    tampered = dict(encrypted)
+    tampered["payload"] = bytes([encrypted["payload"][0] ^ 1]) + encrypted[
+        "payload"
+    ][1:]
+    try:
+        cpabe.decrypt(tampered, device_key)
+        print("복호화 성공 (비정상)")
+    except Exception as e:
+        print(f"예상대로 복호화 실패: {e}")
+
+    # 7. 스트리밍 암호화 (파일 -> 파일, mmap 입력)
+    print("\n[7] 청크 단위 스트리밍 암호화/복호화")
+    payload_size = 64 * 1024 * 1024
+    with tempfile.TemporaryDirectory() as work_dir:
+        plain_path = os.path.join(work_dir, "firmware.bin")
+        enc_path = os.path.join(work_dir, "firmware.enc")
+        dec_path = os.path.join(work_dir, "firmware.dec")
+
+        # 테스트 이미지 생성 (1MB 단위로 기록)
+        with open(plain_path, "wb") as f:
+            for _ in range(payload_size // (1024 * 1024)):
+                f.write(os.urandom(1024 * 1024))
+
+        # mmap 입력으로 암호화
+        start_time = time.time()
+        with open(plain_path, "rb") as f, open(enc_path, "wb") as out:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                written = cpabe.encrypt_stream(mapped, out, policy)
+        encrypt_time = time.time() - start_time
+        print(f"암호화: {written}바이트 기록, {encrypt_time:.4f}초")
+
+        # 파일 객체 입력으로 복호화
+        start_time = time.time()
+        with open(enc_path, "rb") as f, open(dec_path, "wb") as out:
+            restored = cpabe.decrypt_stream(f, out, device_key)
+        decrypt_time = time.time() - start_time
+        print(f"복호화: {restored}바이트 복원, {decrypt_time:.4f}초")
+
+        print(f"원본 파일과 일치: {file_digest(plain_path) == file_digest(dec_path)}")
+
+        # 잘린 스트림 검출
+        with open(enc_path, "rb") as f:
+            truncated = f.read(os.path.getsize(enc_path) - 1024)
+        try:
+            cpabe.decrypt_stream(truncated, io.BytesIO(), device_key)
+            print("잘린 스트림 복호화 성공 (비정상)")
+        except Exception as e:
+            print(f"예상대로 잘린 스트림 검출: {e}")
+
+    # 8. 온라인/오프라인 암호화 (에포크 전환 시 다수 패키지 동시 암호화)
+    print("\n[8] 온라인/오프라인 암호화 - 패키지 일괄 암호화 지연 비교")
+    packages = [os.urandom(64 * 1024) for _ in range(50)]
+    batch_policy = "model and (serialNumber or region)"
+
+    def encrypt_batch():
+        latencies = []
+        for package in packages:
+            start_time = time.perf_counter()
+            cpabe.encrypt_hybrid(package, batch_policy)
+            latencies.append(time.perf_counter() - start_time)
+        latencies.sort()
+        return sum(latencies) / len(latencies), latencies[int(len(latencies) * 0.95)]
+
+    avg_direct, p95_direct = encrypt_batch()
+    print(f"직접 암호화: 평균 {avg_direct * 1000:.3f}ms, p95 {p95_direct * 1000:.3f}ms")
+
+    cpabe.enable_online_offline(
+        session_capacity=len(packages),
+        leaf_capacity=len(packages),
+        attributes=["model", "serialNumber", "region"],
+        background=False,
+    )
+    start_time = time.time()
+    produced = cpabe.fill_offline_pool()
+    print(f"오프라인 단계 (유휴 시간): {produced}개 항목, {time.time() - start_time:.4f}초")
+
+    avg_online, p95_online = encrypt_batch()
+    print(f"온라인 암호화: 평균 {avg_online * 1000:.3f}ms, p95 {p95_online * 1000:.3f}ms")
+
+    encrypted = cpabe.encrypt_hybrid(packages[0], batch_policy)
+    print(f"온라인 암호문 복호화 일치: {cpabe.decrypt(encrypted, device_key) == packages[0]}")
+
+    # 백그라운드 작업자로 다시 채움
+    cpabe.offline_pool.start()
+    time.sleep(1)
+    metrics = cpabe.offline_metrics()
+    print(
+        f"풀 메트릭: 세션 깊이 {metrics['session_depth']}/{metrics['session_capacity']}, "
+        f"리프 깊이 {metrics['leaf_depth']}, 채움 속도 {metrics['refill_rate']:.1f}개/초, "
+        f"적중 {metrics['session_hits'] + metrics['leaf_hits']}, "
+        f"실패 {metrics['session_misses'] + metrics['leaf_misses']}"
+    )
+    cpabe.disable_online_offline()
+
+    # 9. 정책 세션 키 (같은 정책의 작은 명령/설정 메시지 다수)
+    print("\n[9] 정책 세션 키 - 작은 메시지 다수 암호화")
+    clock = ManualClock()
+    session_cpabe = DynamicCPABE(clock=clock)
+    session_cpabe.setup()
+    session_cpabe.register_fading_function(
+        "subscription", LinearFadingFunction("subscription", 600, clock=clock)
+    )
+    clock.advance(120)
+    user_id = session_cpabe.create_user_record("session_device")
+    session_key = session_cpabe.keygen_with_dynamic_attributes(
+        user_id, ["model", "subscription"]
+    )
+    other_session_key = session_cpabe.keygen_with_dynamic_attributes(
+        session_cpabe.create_user_record("other_device"), ["region", "subscription"]
+    )
+    commands = [f'{{"cmd": "set", "interval": {i}}}' for i in range(200)]
+    session_policy = ["model", "subscription"]
+
+    start_time = time.perf_counter()
+    session = session_cpabe.open_session_with_dynamic_attributes(session_policy, lifetime=3600)
+    open_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    messages = [session.encrypt(command) for command in commands]
+    per_message_session = (time.perf_counter() - start_time) / len(commands)
+
+    start_time = time.perf_counter()
+    for command in commands:
+        session_cpabe.encrypt_hybrid(command, session.policy)
+    per_message_full = (time.perf_counter() - start_time) / len(commands)
+    print(
+        f"메시지당 암호화: 하이브리드 {per_message_full * 1000:.3f}ms, "
+        f"세션 {per_message_session * 1000:.3f}ms (세션 시작 {open_time * 1000:.3f}ms)"
+    )
+    print(f"세션 만료: 시작 후 {session.expires_at - clock.time():.0f}초 (요청 3600초, 에포크 종료로 제한)")
+
+    device_cache = SessionKeyCache(session_cpabe, session_key)
+    other_cache = SessionKeyCache(session_cpabe, other_session_key)
+    announcement = session.announcement()
+    print(f"세션 헤더 수락: 만족 키 {device_cache.accept(announcement)}, 불만족 키 {other_cache.accept(announcement)}")
+    restored = [device_cache.decrypt(message) for message in messages]
+    print(f"세션 메시지 복호화 일치: {restored == commands}")
+
+    tampered = dict(announcement, expires_at=announcement["expires_at"] + 3600)
+    tampered_cache = SessionKeyCache(session_cpabe, session_key)
+    tampered_cache.accept(tampered)
+    try:
+        tampered_cache.decrypt(messages[0])
+        print("만료 시각 변조 세션 복호화 성공 (비정상)")
+    except Exception as e:
+        print(f"예상대로 만료 시각 변조 검출: {e}")
+
+    clock.set(session.expires_at)
+    try:
+        session.encrypt("after epoch")
+        print("만료 세션 암호화 성공 (비정상)")
+    except Exception as e:
+        print(f"에포크 종료 후 송신 측: {e}")
+    try:
+        device_cache.decrypt(messages[0])
+        print("만료 세션 복호화 성공 (비정상)")
+    except Exception as e:
+        print(f"에포크 종료 후 기기 측: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+6단계 테스트: 외주 복호화 (변환 키) 테스트
+- 기기 키와 함께 블라인딩된 변환 키 발급
+- 게이트웨이 변환(페어링) + 기기 마무리(GT 지수 연산 1회)
+- 반복 변환 시 리프 선택/라그랑주 계수 캐시
+- 사전 처리 변환 키 (부분 키 갱신 시 자동 재준비)
+- 동적 속성 만료/갱신과 변환 키 연동
+"""
+
+import os
+import sys
+import time
+
+# 상위 디렉토리를 모듈 경로에 추가
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from cp_abe.dynamic_cpabe import DynamicCPABE
+from cp_abe.fading_functions import LinearFadingFunction
+from charm.toolbox.pairinggroup import GT
+
+
+def main():
+    print("\n===== 6단계 테스트: 외주 복호화 (변환 키) =====")
+
+    # 1. CP-ABE 시스템 초기화
+    print("\n[1] CP-ABE 시스템 초기화")
+    cpabe = DynamicCPABE()
+    cpabe.setup()
+    cpabe.register_fading_function("subscription", LinearFadingFunction("subscription", 5))
+
+    # 2. 기기 키와 변환 키 발급
+    print("\n[2] 기기 키와 변환 키 발급")
+    user_id = cpabe.create_user_record("vehicle-001")
+    device_key = cpabe.keygen_with_dynamic_attributes(
+        user_id, ["model", "serialNumber", "subscription"]
+    )
+    tkey, retrieval_key = cpabe.issue_transform_key(device_key)
+    print(f"변환 키 속성: {tkey['S']}")
+    print("복원 키(z)는 기기에만 보관")
+
+    # 3. 직접 복호화 vs 외주 복호화 비교
+    print("\n[3] 직접 복호화와 외주 복호화 비교")
+    policy = "model and (region or 2 of (serialNumber, warranty, model))"
+    message = cpabe.group.random(GT)
+    ciphertext = cpabe._bsw07_encrypt(message, policy)
+
+    rounds = 20
+    start_time = time.time()
+    for _ in range(rounds):
+        direct = cpabe.cpabe.decrypt(cpabe.pk, device_key, ciphertext)
+    direct_time = (time.time() - start_time) / rounds
+
+    start_time = time.time()
+    for _ in range(rounds):
+        transformed = cpabe.transform(ciphertext, tkey)
+    transform_time = (time.time() - start_time) / rounds
+
+    start_time = time.time()
+    for _ in range(rounds):
+        recovered = cpabe.decrypt_transformed(transformed, retrieval_key)
+    device_time = (time.time() - start_time) / rounds
+
+    print(f"직접 복호화 (기기): {direct_time * 1000:.3f}ms, 일치: {direct == message}")
+    print(f"변환 (게이트웨이): {transform_time * 1000:.3f}ms")
+    print(f"마무리 (기기): {device_time * 1000:.3f}ms, 일치: {recovered == message}")
+
+    # 같은 정책의 패키지 다수 - 리프 선택/라그랑주 계수는 첫 변환에서만 계산
+    packages = [cpabe._bsw07_encrypt(cpabe.group.random(GT), policy) for _ in range(rounds)]
+    for package in packages:
+        cpabe.transform(package, tkey)
+    stats = cpabe.decryption_plan_stats()
+    print(
+        f"게이트웨이 {len(packages)}개 패키지 변환: 계수 경로 적중 {stats['path_hits']}, "
+        f"실패 {stats['path_misses']}, 계수 계산 {stats['coefficients']['misses']}회"
+    )
+
+    # 사전 처리 변환 키 - 키 컴포넌트 고정 기저 테이블 + 정책별 λ 접힌 컴포넌트
+    prepared_tkey = cpabe.prepare_key(tkey)
+    for label, gateway_key in [("일반 변환 키", tkey), ("사전 처리 변환 키", prepared_tkey)]:
+        start_time = time.time()
+        for package in packages:
+            cpabe.transform(package, gateway_key)
+        elapsed = (time.time() - start_time) / len(packages)
+        print(f"{label}: 패키지당 {elapsed * 1000:.3f}ms")
+    transformed = cpabe.transform(ciphertext, prepared_tkey)
+    recovered = cpabe.decrypt_transformed(transformed, retrieval_key)
+    print(f"사전 처리 키 외주 복호화 일치: {recovered == message}, 통계: {prepared_tkey.stats()}")
+
+    # 4. 문자열/하이브리드 암호문
+    print("\n[4] 문자열 및 하이브리드 암호문 외주 복호화")
+    encrypted = cpabe.encrypt("외주 복호화 테스트 메시지", "model and serialNumber")
+    print(
+        f"문자열: {cpabe.decrypt_transformed(cpabe.transform(encrypted, tkey), retrieval_key)}"
+    )
+    firmware = os.urandom(1024 * 1024)
+    encrypted = cpabe.encrypt_hybrid(firmware, "model and serialNumber")
+    restored = cpabe.decrypt_transformed(cpabe.transform(encrypted, tkey), retrieval_key)
+    print(f"하이브리드 1MB 일치: {restored == firmware}")
+
+    # 5. 정책 불만족
+    print("\n[5] 정책을 만족하지 않는 변환 키")
+    try:
+        cpabe.transform(cpabe._bsw07_encrypt(message, "region"), tkey)
+        print("변환 성공 (비정상)")
+    except ValueError as e:
+        print(f"예상대로 변환 실패: {e}")
+
+    # 6. 동적 속성 만료 후 갱신
+    print("\n[6] 동적 속성 만료 및 갱신")
+    print("구독 속성 만료 대기 (6초)...")
+    time.sleep(6)
+    try:
+        cpabe.transform(ciphertext, tkey)
+        print("만료된 변환 키로 변환 성공 (비정상)")
+    except ValueError as e:
+        print(f"예상대로 만료 검출: {e}")
+
+    update = cpabe.update_attribute(user_id, "subscription")
+    print(f"블라인딩된 갱신 컴포넌트 발급: {'transform_attribute_key' in update}")
+    device_key = cpabe.merge_attribute_to_key(device_key, update)
+    tkey = cpabe.merge_attribute_to_key(tkey, update)
+    prepared_tkey = cpabe.merge_attribute_to_key(prepared_tkey, update)
+    print(f"갱신 후 사전 처리 키 재준비: 접힌 컴포넌트 {prepared_tkey.stats()['folded']['size']}개")
+    print(f"갱신 후 기기 키 유효: {cpabe.check_key_validity(device_key)['valid']}")
+    print(f"갱신 후 변환 키 유효: {cpabe.check_key_validity(tkey)['valid']}")
+
+    transformed = cpabe.transform(ciphertext, tkey)
+    recovered = cpabe.decrypt_transformed(transformed, retrieval_key)
+    print(f"갱신 후 외주 복호화 일치: {recovered == message}")
+    transformed = cpabe.transform(ciphertext, prepared_tkey)
+    recovered = cpabe.decrypt_transformed(transformed, retrieval_key)
+    print(f"갱신 후 사전 처리 키 외주 복호화 일치: {recovered == message}")
+
+
+if __name__ == "__main__":
+    main()
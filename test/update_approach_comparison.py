@@ -163,6 +163,8 @@ def run_scaling_experiment(device_counts):
         "cpabe_setup_time": [],
         "cpabe_encrypt_time": [],
         "cpabe_keygen_time": [],
+        "cpabe_encrypt_time_no_precompute": [],
+        "cpabe_keygen_time_no_precompute": [],
         "trad_setup_time": [],
         "trad_encrypt_time": [],
         "trad_keygen_time": [],
@@ -211,6 +213,35 @@ def run_scaling_experiment(device_counts):
         # 최소한의 로깅만 수행
         print(f"CP-ABE encryption time: {encrypt_time:.6f}s")
 
+        # === CP-ABE 방식 (고정 기저 사전 계산 비활성화) - 사전 계산 효과 측정 ===
+        # 별도 setup() - 공개 파라미터 요소에 구축된 테이블을 공유하지 않도록 함
+        baseline = DynamicCPABE(precompute=False)
+        baseline.setup()
+        baseline.register_fading_function("subscription", subscription_function)
+
+        start_time = time.time()
+        for i in range(device_count):
+            user_id = baseline.create_user_record(f"device_{i}")
+            key = baseline.keygen_with_dynamic_attributes(
+                user_id, ["model", "serialNumber", "subscription"]
+            )
+        baseline_keygen_time = (time.time() - start_time) / device_count
+        results["cpabe_keygen_time_no_precompute"].append(baseline_keygen_time)
+
+        start_time = time.time()
+        encrypted = baseline.encrypt(test_message, "model and subscription_0")
+        baseline_encrypt_time = time.time() - start_time
+        results["cpabe_encrypt_time_no_precompute"].append(baseline_encrypt_time)
+
+        print(
+            f"CP-ABE without precomputation: keygen {baseline_keygen_time:.6f}s/device, "
+            f"encryption {baseline_encrypt_time:.6f}s"
+        )
+        print(
+            f"Precomputation speedup: keygen {baseline_keygen_time / results['cpabe_keygen_time'][-1]:.2f}x, "
+            f"encryption {baseline_encrypt_time / encrypt_time:.2f}x"
+        )
+
         # === 기존 방식 ===
         trad = TraditionalApproach()
 
@@ -248,6 +279,12 @@ def run_scaling_experiment(device_counts):
     # 암호화 시간 그래프
     plt.subplot(1, 3, 1)
     plt.plot(device_counts, results["cpabe_encrypt_time"], "o-", label="CP-ABE")
+    plt.plot(
+        device_counts,
+        results["cpabe_encrypt_time_no_precompute"],
+        "^--",
+        label="CP-ABE (no precomputation)",
+    )
     plt.plot(device_counts, results["trad_encrypt_time"], "s-", label="Traditional")
     plt.xlabel(LABELS["기기 수"])
     plt.ylabel(LABELS["암호화 시간 (초)"])
@@ -258,6 +295,12 @@ def run_scaling_experiment(device_counts):
     # 키 생성 시간 그래프
     plt.subplot(1, 3, 2)
     plt.plot(device_counts, results["cpabe_keygen_time"], "o-", label="CP-ABE")
+    plt.plot(
+        device_counts,
+        results["cpabe_keygen_time_no_precompute"],
+        "^--",
+        label="CP-ABE (no precomputation)",
+    )
     plt.plot(device_counts, results["trad_keygen_time"], "s-", label="Traditional")
     plt.xlabel(LABELS["기기 수"])
     plt.ylabel(LABELS["평균 키 생성 시간 (초/기기)"])
@@ -503,6 +546,8 @@ def run_renewal_experiment():
         "partial_update_time_half": [],  # 절반 속성 갱신
         "partial_update_time_all": [],  # 전체 속성 갱신
         "full_rekey_time": [],  # 전체 키 재발급
+        "partial_update_bytes": [],  # 단일 속성 갱신 전송 크기
+        "full_rekey_bytes": [],  # 전체 키 재발급 전송 크기
     }
 
     for attr_count in attribute_counts:
@@ -571,6 +616,15 @@ def run_renewal_experiment():
         results["full_rekey_time"].append(full_rekey_time)
         print(f"Full key reissue time: {full_rekey_time:.6f}s")
 
+        # 5. 기기로 전송되는 크기 비교 (바이너리 전송 형식 바이트)
+        partial_bytes = cpabe.wire_size(single_attr)
+        full_bytes = cpabe.wire_size(new_key)
+        results["partial_update_bytes"].append(partial_bytes)
+        results["full_rekey_bytes"].append(full_bytes)
+        print(
+            f"Shipped bytes: partial update {partial_bytes}B, full reissue {full_bytes}B"
+        )
+
         # 효율성 비교
         print(
             f"Efficiency ratio (full/single): {full_rekey_time / single_update_time:.2f}x"
@@ -587,10 +641,10 @@ def run_renewal_experiment():
     output_dir = os.path.join(parent_dir, "experiment_results")
     output_path = os.path.join(output_dir, "renewal_comparison.png")
 
-    plt.figure(figsize=(12, 10))
+    plt.figure(figsize=(12, 15))
 
     # 1. 갱신 시간 비교 그래프
-    plt.subplot(2, 1, 1)
+    plt.subplot(3, 1, 1)
     plt.plot(
         attribute_counts,
         results["partial_update_time_single"],
@@ -619,7 +673,7 @@ def run_renewal_experiment():
     plt.grid(True)
 
     # 2. 효율성 개선 비율
-    plt.subplot(2, 1, 2)
+    plt.subplot(3, 1, 2)
     improvement_ratio_single = [
         full / single
         for single, full in zip(
@@ -658,6 +712,23 @@ def run_renewal_experiment():
     plt.legend()
     plt.grid(True)
 
+    # 3. 기기로 전송되는 크기
+    plt.subplot(3, 1, 3)
+    plt.plot(
+        attribute_counts,
+        results["partial_update_bytes"],
+        "o-",
+        label="Single Attribute Update",
+    )
+    plt.plot(
+        attribute_counts, results["full_rekey_bytes"], "d-", label="Full Key Reissue"
+    )
+    plt.xlabel("Total Number of Attributes")
+    plt.ylabel("Shipped Bytes")
+    plt.title("Bytes Shipped to Device per Renewal")
+    plt.legend()
+    plt.grid(True)
+
     plt.tight_layout()
     plt.savefig(output_path)
     print(f"그래프 저장됨: {output_path}")
@@ -836,13 +907,11 @@ def run_bandwidth_experiment(device_counts):
         subscription_function = LinearFadingFunction("subscription", 3600)
         cpabe.register_fading_function("subscription", subscription_function)
 
-        # 암호화
-        encrypted = cpabe.encrypt(test_message, "model and subscription_0")
-
-        # CP-ABE 암호문 크기 측정
-        import sys
+        # 암호화 (바이트 페이로드는 하이브리드 KEM/DEM)
+        encrypted = cpabe.encrypt(test_message.encode("utf-8"), "model and subscription_0")
 
-        cpabe_size = sys.getsizeof(encrypted)
+        # CP-ABE 암호문 크기 측정 (실제 전송 바이트)
+        cpabe_size = cpabe.wire_size(encrypted)
         cpabe_total_size = cpabe_size  # 모든 기기가 동일한 암호문을 받음
 
         results["cpabe_bandwidth"].append(cpabe_total_size)
@@ -862,7 +931,7 @@ def run_bandwidth_experiment(device_counts):
         encrypted_messages = trad.encrypt_for_devices(test_message)
 
         # 기존 방식 암호문 크기 측정
-        trad_size = sum(sys.getsizeof(msg) for msg in encrypted_messages.values())
+        trad_size = sum(len(msg) for msg in encrypted_messages.values())
 
         results["trad_bandwidth"].append(trad_size)
         print(f"Traditional approach total transmission: {trad_size} bytes")
@@ -0,0 +1,126 @@
+"""
+스킴 백엔드 벤치마크 (헤드리스)
+
+정책 리프 수를 늘려가며 백엔드별 설정, 키 생성, 암호화, 복호화 시간과
+키/암호문/부분 갱신 컴포넌트 크기를 비교합니다.
+
+사용 예:
+    python tools/benchmark_backends.py
+    python tools/benchmark_backends.py --backends bsw07 fame --leaves 1 4 16 --rounds 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# 상위 디렉토리를 모듈 경로에 추가
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from charm.toolbox.pairinggroup import GT
+
+from cp_abe.backends import BACKENDS
+from cp_abe.iot_cpabe import IoTCPABE
+
+# 결과 저장 경로 설정
+output_dir = os.path.join(parent_dir, "experiment_results")
+
+
+def element_bytes(group, obj):
+    """dict/list에 포함된 그룹 요소의 직렬화 바이트 합 (문자열/정책 등 메타데이터 제외)"""
+    if isinstance(obj, dict):
+        return sum(element_bytes(group, value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(element_bytes(group, value) for value in obj)
+    if obj is None or isinstance(obj, (str, bytes, int, float, bool)):
+        return 0
+    return len(group.serialize(obj))
+
+
+def timed(func, rounds):
+    """평균 실행 시간 (초)과 마지막 결과"""
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    return (time.perf_counter() - start_time) / rounds, result
+
+
+def run_benchmark(backend_names, leaf_counts, rounds):
+    results = []
+    for name in backend_names:
+        cpabe = IoTCPABE(backend=name)
+        setup_time, _ = timed(cpabe.setup, 1)
+        group = cpabe.group
+        backend = cpabe.backend
+
+        for leaves in leaf_counts:
+            attributes = [f"attr{i}" for i in range(leaves)]
+            policy = cpabe.compile_policy(" and ".join(attributes))
+            sanitized = [attr for _, attr in policy.leaves]
+            element = group.random(GT)
+
+            keygen_time, key = timed(lambda: backend.keygen(cpabe, sanitized), rounds)
+            encrypt_time, ciphertext = timed(
+                lambda: backend.encrypt(cpabe, element, policy), rounds
+            )
+            decrypt_time, result = timed(
+                lambda: backend.decrypt(cpabe, ciphertext, key), rounds
+            )
+            if result != element:
+                raise RuntimeError(f"복호화 결과 불일치: {name}, 리프 {leaves}개")
+
+            update = backend.attribute_components(
+                cpabe, sanitized[:1], backend.key_randomness(cpabe)
+            )
+            row = {
+                "backend": name,
+                "curve": backend.curve,
+                "leaves": leaves,
+                "setup_ms": setup_time * 1000,
+                "keygen_ms": keygen_time * 1000,
+                "encrypt_ms": encrypt_time * 1000,
+                "decrypt_ms": decrypt_time * 1000,
+                "key_bytes": element_bytes(group, key),
+                "ciphertext_bytes": element_bytes(group, ciphertext),
+                "update_bytes": element_bytes(group, update),
+            }
+            results.append(row)
+            print(
+                f"{name:6s} ({backend.curve}) 리프 {leaves:3d}개: "
+                f"키 생성 {row['keygen_ms']:.3f}ms, 암호화 {row['encrypt_ms']:.3f}ms, "
+                f"복호화 {row['decrypt_ms']:.3f}ms, 키 {row['key_bytes']}B, "
+                f"암호문 {row['ciphertext_bytes']}B, 갱신 {row['update_bytes']}B"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스킴 백엔드 벤치마크")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(BACKENDS),
+        choices=list(BACKENDS),
+        help="비교할 백엔드",
+    )
+    parser.add_argument(
+        "--leaves", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="정책 리프 수"
+    )
+    parser.add_argument("--rounds", type=int, default=10, help="측정 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.backends, args.leaves, args.rounds)
+
+    output = args.output or os.path.join(output_dir, "backend_benchmark.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+복호화 엔진 벤치마크 (헤드리스)
+
+정책 리프 수를 늘려가며 리프별 페어링, 곱 페어링, 사전 처리 키 + 곱 페어링 방식의
+복호화 시간을 비교합니다.
+
+사용 예:
+    python tools/benchmark_decryption.py
+    python tools/benchmark_decryption.py --leaves 1 2 4 8 16 32 --rounds 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# 상위 디렉토리를 모듈 경로에 추가
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from charm.toolbox.pairinggroup import GT
+
+from cp_abe.iot_cpabe import IoTCPABE
+
+# 결과 저장 경로 설정
+output_dir = os.path.join(parent_dir, "experiment_results")
+
+
+def measure(cpabe, header, key, rounds):
+    """복호화 평균 시간 (초) - 첫 호출로 계획/계수 캐시를 채운 뒤 측정"""
+    expected = cpabe._bsw07_blinded_secret(header, key)
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        result = cpabe._bsw07_blinded_secret(header, key)
+    elapsed = (time.perf_counter() - start_time) / rounds
+    return elapsed, result == expected
+
+
+def run_benchmark(leaf_counts, rounds):
+    cpabe = IoTCPABE()
+    cpabe.setup()
+
+    results = []
+    for leaves in leaf_counts:
+        attributes = [f"attr{i}" for i in range(leaves)]
+        key = cpabe.keygen(attributes)
+        header = cpabe._bsw07_encrypt(
+            cpabe.group.random(GT), cpabe.compile_policy(" and ".join(attributes))
+        )
+
+        prepared_key = cpabe.prepare_key(key)
+        timings = {}
+        for engine, multi_pairing, engine_key in [
+            ("sequential", False, key),
+            ("product", True, key),
+            ("prepared", True, prepared_key),
+        ]:
+            cpabe.multi_pairing = multi_pairing
+            timings[engine], matched = measure(cpabe, header, engine_key, rounds)
+            if not matched:
+                raise RuntimeError(f"복호화 결과 불일치: {engine}, 리프 {leaves}개")
+
+        row = {
+            "leaves": leaves,
+            "pairings": 2 * leaves + 1,
+            "sequential_ms": timings["sequential"] * 1000,
+            "product_ms": timings["product"] * 1000,
+            "prepared_ms": timings["prepared"] * 1000,
+            "speedup": timings["sequential"] / timings["product"],
+            "prepared_speedup": timings["sequential"] / timings["prepared"],
+        }
+        results.append(row)
+        print(
+            f"리프 {leaves:3d}개 (페어링 {row['pairings']:3d}회): "
+            f"리프별 {row['sequential_ms']:.3f}ms, 곱 페어링 {row['product_ms']:.3f}ms "
+            f"({row['speedup']:.2f}배), 사전 처리 키 {row['prepared_ms']:.3f}ms "
+            f"({row['prepared_speedup']:.2f}배)"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="복호화 엔진 벤치마크")
+    parser.add_argument(
+        "--leaves", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="정책 리프 수"
+    )
+    parser.add_argument("--rounds", type=int, default=20, help="측정 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.leaves, args.rounds)
+
+    output = args.output or os.path.join(output_dir, "decryption_engine_benchmark.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
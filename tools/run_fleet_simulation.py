@@ -0,0 +1,60 @@
+"""
+플릿 시뮬레이션 실행 스크립트 (헤드리스)
+
+사용 예:
+    python tools/run_fleet_simulation.py tools/fleet_scenario.json
+    python tools/run_fleet_simulation.py scenario.yaml --days 30 --devices 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+# 상위 디렉토리를 모듈 경로에 추가
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from cp_abe.simulation import DEFAULT_SCENARIO, FleetSimulator, load_scenario
+
+# 결과 저장 경로 설정
+output_dir = os.path.join(parent_dir, "experiment_results")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이산 사건 플릿 시뮬레이션")
+    parser.add_argument("scenario", nargs="?", help="시나리오 파일 (.json/.yaml)")
+    parser.add_argument("--days", type=float, help="시뮬레이션 기간 (일)")
+    parser.add_argument("--devices", type=int, help="초기 기기 수")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    parser.add_argument("--output", help="보고서 JSON 경로")
+    args = parser.parse_args()
+
+    # 시뮬레이션 중 기기별 로그/출력 억제
+    logging.disable(logging.INFO)
+
+    scenario = load_scenario(args.scenario) if args.scenario else dict(DEFAULT_SCENARIO)
+    if args.days is not None:
+        scenario["duration_days"] = args.days
+    if args.devices is not None:
+        scenario["fleet"] = dict(scenario["fleet"], initial_devices=args.devices)
+    if args.seed is not None:
+        scenario["seed"] = args.seed
+
+    report = FleetSimulator(scenario).run()
+
+    output = args.output or os.path.join(
+        output_dir, f"fleet_simulation_{scenario['name']}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"\n보고서 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()